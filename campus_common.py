@@ -0,0 +1,69 @@
+# Standard-library-only parts of the campus index, shared with quick_query,
+# whose warm path must not import pandas or openpyxl. campus_index
+# re-exports everything here.
+import glob
+import os
+
+WORKBOOK_EXTENSIONS = ('.xlsx', '.xlsm')
+
+
+def format_session(cell, division):
+    """Formats a timetable cell the way the generators display it."""
+    components = cell.strip().split()
+    return "\n".join([
+        " ".join(components[:2]),
+        " ".join(components[2:]),
+        f"({division})"
+    ])
+
+
+def resolve_workbooks(sources):
+    """
+    Expands the given sources into a sorted list of workbook paths.
+
+    Args:
+        sources (str or list): A workbook path, a directory, a glob pattern,
+            or a list mixing any of these
+
+    Returns:
+        list: Sorted, de-duplicated list of .xlsx/.xlsm paths
+    """
+    if isinstance(sources, (str, os.PathLike)):
+        sources = [sources]
+
+    paths = set()
+    for source in sources:
+        source = os.fspath(source)
+        if os.path.isdir(source):
+            candidates = [os.path.join(source, name) for name in os.listdir(source)]
+        elif os.path.exists(source):
+            candidates = [source]
+        else:
+            candidates = glob.glob(source)
+            if not candidates:
+                raise FileNotFoundError(f"Input file not found: {source}")
+
+        for path in candidates:
+            name = os.path.basename(path)
+            # Skip Excel lock files (~$Book.xlsx) left behind by open workbooks
+            if name.startswith('~$') or not name.lower().endswith(WORKBOOK_EXTENSIONS):
+                continue
+            paths.add(os.path.abspath(path))
+
+    return sorted(paths)
+
+
+def source_stamps(sources):
+    """
+    Path, size and modification time of every workbook in the sources.
+
+    An index built from the workbooks stays valid while these are unchanged.
+
+    Returns:
+        list: [path, size, mtime in ns] lists, sorted by path
+    """
+    stamps = []
+    for path in resolve_workbooks(sources):
+        stat = os.stat(path)
+        stamps.append([path, stat.st_size, stat.st_mtime_ns])
+    return stamps
@@ -0,0 +1,433 @@
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+from concurrent.futures import ProcessPoolExecutor
+import os
+import re
+from campus_common import WORKBOOK_EXTENSIONS, format_session, resolve_workbooks, source_stamps
+from cell_grammar import parse_cell, cell_rooms, cell_teachers, get_room_registry, set_room_registry
+from faculty_directory import normalize_initials, cell_faculty_tokens
+from schedule_grid import ScheduleGrid, SessionTable
+
+# Same grid layout as TimetableGenerator: header row 7, days from row 8,
+# 25 timetable rows, day names in column A and one column per time slot
+TIME_SLOTS = [
+    '8:30 to 9:25', '9:25 to 10:20', '10:20 to 10:30', '10:30 to 11:25',
+    '11:25 to 12:20', '12:20 to 13:15', '13:15 to 14:10', '14:10 to 15:05',
+    '15:05 to 15:10', '15:10 to 16:00', '16:00 to 16:50', '16:50 to 16:55',
+    '16:55 to 17:45', '17:45 to 18:25'
+]
+DAYS = ['MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT']
+# Short breaks and lunch, merged into break labels by save_classroom_schedule
+BREAK_SLOTS = ['10:20 to 10:30', '12:20 to 13:15', '15:05 to 15:10', '16:50 to 16:55']
+FIRST_ROW = 8
+LAST_ROW = 32
+
+SESSION_COLUMNS = ['Source', 'Sheet', 'Division', 'Day', 'Time_Slot',
+                   'Slot', 'Span', 'Row', 'Kind', 'Cell', 'Rooms', 'Teachers']
+
+
+def slot_bounds(time_slot):
+    """Returns (start, end) of a time slot in minutes after midnight."""
+    start, end = time_slot.split(' to ')
+    to_minutes = lambda text: int(text.split(':')[0]) * 60 + int(text.split(':')[1])
+    return to_minutes(start), to_minutes(end)
+
+
+SLOT_MINUTES = [end - start for start, end in map(slot_bounds, TIME_SLOTS)]
+
+
+def source_label(path):
+    """Returns the namespace used for divisions of a workbook (its file stem)."""
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def read_sheet_grid(sheet):
+    """
+    Reads the raw timetable grid of one worksheet, without parsing any cell.
+
+    Args:
+        sheet (openpyxl.worksheet.worksheet.Worksheet): A division sheet
+
+    Returns:
+        dict: Sheet title, the N3 division cell, the grid rows as value
+            tuples and the column span of merged cells inside the grid
+    """
+    # Column span of every merged range that starts inside the grid
+    spans = {}
+    for merged in sheet.merged_cells.ranges:
+        if merged.min_row >= FIRST_ROW and merged.min_col >= 2:
+            spans[(merged.min_row, merged.min_col)] = merged.max_col - merged.min_col + 1
+
+    rows = list(sheet.iter_rows(min_row=FIRST_ROW, max_row=LAST_ROW,
+                                max_col=len(TIME_SLOTS) + 1, values_only=True))
+    return {'sheet': sheet.title, 'division': sheet['N3'].value, 'rows': rows, 'spans': spans}
+
+
+def parse_sheet_grid(grid, source):
+    """
+    Turns a raw sheet grid from read_sheet_grid into session records.
+
+    Args:
+        grid (dict): Output of read_sheet_grid
+        source (str): Namespace for the division name
+
+    Returns:
+        list: One dict per non-empty timetable cell
+    """
+    # Get division information from cell N3, fall back to the sheet name
+    division = grid['division'] if grid['division'] else grid['sheet']
+    division = f"{source}/{str(division).strip()}"
+    records = []
+
+    for row_number, row in enumerate(grid['rows'], start=FIRST_ROW):
+        day = row[0] if row else None
+
+        # Skip if day is not valid
+        if not isinstance(day, str) or day.strip() not in DAYS:
+            continue
+        day = day.strip()
+
+        for col_idx, time_slot in enumerate(TIME_SLOTS):
+            current_cell = row[col_idx + 1] if col_idx + 1 < len(row) else None
+            if not isinstance(current_cell, str) or not current_cell.strip():
+                continue
+
+            span = grid['spans'].get((row_number, col_idx + 2), 1)
+            entries = parse_cell(current_cell)
+            is_practical = span > 1 or any(entry.kind == 'Practical' for entry in entries)
+            records.append({
+                'Source': source,
+                'Sheet': grid['sheet'],
+                'Division': division,
+                'Day': day,
+                'Time_Slot': time_slot,
+                'Slot': col_idx,
+                'Span': span,
+                'Row': row_number,
+                'Kind': 'Practical' if is_practical else 'Theory',
+                'Cell': current_cell.strip(),
+                'Rooms': cell_rooms(entries),
+                'Teachers': cell_teachers(entries)
+            })
+
+    return records
+
+
+def read_workbook_sessions(input_file, source=None):
+    """
+    Reads every division sheet of one workbook into session records.
+
+    The workbook is loaded once and every sheet is read from it, instead of
+    reloading the whole file for each sheet. Merged practical cells keep
+    their column span so later consumers know a session covers two slots.
+
+    Args:
+        input_file (str): Path to the "Classwise" workbook
+        source (str): Namespace for division names, defaults to the file stem
+
+    Returns:
+        list: One dict per non-empty timetable cell
+    """
+    source = source or source_label(input_file)
+    workbook = load_workbook(input_file, data_only=True)
+    records = []
+
+    try:
+        for sheet in workbook.worksheets:
+            records.extend(parse_sheet_grid(read_sheet_grid(sheet), source))
+    finally:
+        workbook.close()
+
+    return records
+
+
+def joint_session_key(cell):
+    """
+    What makes two cells the same class: (subjects with their batches,
+    teachers, rooms). Practical batches differ between divisions, so only
+    whole-division lectures are ever joint.
+
+    Returns None for a cell without a room or a teacher (library hours,
+    projects), which is never taken for a joint lecture.
+    """
+    entries = parse_cell(cell)
+    rooms, teachers = cell_rooms(entries), cell_teachers(entries)
+    if not rooms or not teachers:
+        return None
+    return tuple((entry.subject, tuple(entry.batches)) for entry in entries), teachers, rooms
+
+
+def merge_joint_sessions(sessions):
+    """
+    Stores a lecture held jointly for several divisions once.
+
+    Sessions with the same day, slot, span, subjects, teachers and rooms
+    become one row; its Divisions column lists every division in order of
+    first appearance and Division keeps the first. Applying it again to
+    merged sessions changes nothing.
+
+    Args:
+        sessions (pandas.DataFrame): Session records (SESSION_COLUMNS)
+
+    Returns:
+        pandas.DataFrame: Merged sessions with a Divisions column
+    """
+    sessions = sessions.reset_index(drop=True)
+    divisions = (sessions['Divisions'] if 'Divisions' in sessions
+                 else sessions['Division'].map(lambda division: (division,)))
+
+    owners = {}
+    merged = {}
+    for position, (day, slot, span, cell) in enumerate(zip(sessions['Day'], sessions['Slot'],
+                                                           sessions['Span'], sessions['Cell'])):
+        key = joint_session_key(cell)
+        owner = owners.setdefault((day, slot, span) + key, position) if key else position
+        listed = merged.setdefault(owner, [])
+        listed.extend(division for division in divisions[position] if division not in listed)
+
+    result = sessions.iloc[list(merged)].copy()
+    result['Divisions'] = [tuple(listed) for listed in merged.values()]
+    return result.reset_index(drop=True)
+
+
+class CampusIndex:
+    """
+    Merged session index over any number of division workbooks.
+
+    Sessions are stored once in a DataFrame, a joint lecture of several
+    divisions as a single row (see merge_joint_sessions); room, faculty and
+    division lookups go through precomputed key -> row positions maps so a
+    schedule never rescans the workbooks. With a FacultyDirectory, faculty
+    keys are the canonical initials of the meta table and aliases resolve
+    to them.
+    """
+
+    def __init__(self, sessions, directory=None):
+        self.sessions = merge_joint_sessions(sessions)
+        self.directory = directory
+        self.room_index = {}
+        for position, rooms in enumerate(self.sessions['Rooms']):
+            for room in set(rooms):
+                self.room_index.setdefault(room, []).append(position)
+
+        self.faculty_index = {}
+        for position, teachers in enumerate(self.sessions['Teachers']):
+            for initials in self.resolve_teachers(teachers):
+                self.faculty_index.setdefault(initials, []).append(position)
+
+        self.division_index = {}
+        for position, divisions in enumerate(self.sessions['Divisions']):
+            for division in divisions:
+                self.division_index.setdefault(division, []).append(position)
+
+        # Schedules are integer grids of interned (cell, divisions) IDs,
+        # formatted into display text only when rendered
+        self.session_table = SessionTable(format_session)
+        self.session_ids = np.array([self.session_table.intern((cell, ', '.join(divisions))) for cell, divisions in
+                                     zip(self.sessions['Cell'], self.sessions['Divisions'])], dtype=np.int32)
+        self.day_idx = self.sessions['Day'].map(DAYS.index).to_numpy(dtype=np.int64)
+        self.slot_idx = self.sessions['Slot'].to_numpy(dtype=np.int64)
+
+    def resolve_teachers(self, teachers):
+        """Faculty keys for the parsed teacher tokens of one session."""
+        if self.directory is not None:
+            return self.directory.resolve_tokens(teachers)
+        return cell_faculty_tokens(teachers)
+
+    def resolve_faculty(self, faculty_name):
+        """Faculty key for a name typed by the user (initials or an alias)."""
+        if self.directory is not None:
+            return self.directory.resolve(faculty_name) or normalize_initials(faculty_name)
+        return normalize_initials(faculty_name)
+
+    @property
+    def divisions(self):
+        return sorted(self.division_index)
+
+    @property
+    def rooms(self):
+        return sorted(self.room_index)
+
+    @property
+    def faculty(self):
+        return sorted(self.faculty_index)
+
+    def create_timetable_structure(self):
+        df = pd.DataFrame(index=DAYS, columns=TIME_SLOTS)
+        return df.fillna('')
+
+    def _build_grid(self, positions):
+        """Integer days x slots x overlap grid of the sessions at the given positions."""
+        positions = np.asarray(positions, dtype=np.int64)
+        return ScheduleGrid.from_entries(self.day_idx[positions], self.slot_idx[positions],
+                                         self.session_ids[positions], self.session_table,
+                                         (len(DAYS), len(TIME_SLOTS)))
+
+    def room_grid(self, classroom):
+        return self._build_grid(self.room_index.get(classroom.upper(), []))
+
+    def faculty_grid(self, faculty_name):
+        return self._build_grid(self.faculty_index.get(self.resolve_faculty(faculty_name), []))
+
+    def division_grid(self, division):
+        return self._build_grid(self.division_index.get(division, []))
+
+    def room_schedule(self, classroom):
+        """Combined schedule of one room across every division on campus."""
+        return self.room_grid(classroom).render(DAYS, TIME_SLOTS)
+
+    def faculty_schedule(self, faculty_name):
+        """Combined schedule of one faculty member across every division."""
+        return self.faculty_grid(faculty_name).render(DAYS, TIME_SLOTS)
+
+    def division_schedule(self, division):
+        """Schedule of one namespaced division, e.g. 'CSE/A'."""
+        return self.division_grid(division).render(DAYS, TIME_SLOTS)
+
+    def _covered_sessions(self, positions):
+        """Sessions at the given positions, one row per slot they cover (a practical spans two)."""
+        booked = self.sessions.iloc[positions]
+        covered = booked.loc[booked.index.repeat(booked['Span'])]
+        slots = covered['Slot'].to_numpy() + covered.groupby(level=0).cumcount().to_numpy()
+        covered = covered.assign(Slot=slots)[slots < len(TIME_SLOTS)]
+        return covered.assign(Time_Slot=[TIME_SLOTS[slot] for slot in covered['Slot']])
+
+    def find_clashes(self):
+        """
+        Finds rooms booked by more than one division in the same slot.
+
+        Every slot a session covers takes part, so a practical that overlaps
+        another class in its second slot is reported too.
+
+        Returns:
+            pandas.DataFrame: Room, Day, Time_Slot and the clashing Divisions
+        """
+        clashes = []
+        for room, positions in self.room_index.items():
+            booked = self._covered_sessions(positions)
+            for (day, time_slot), group in booked.groupby(['Day', 'Time_Slot'], sort=False):
+                # A joint lecture is one row, so only separate classes clash
+                if len(set(group['Divisions'])) > 1:
+                    clashes.append({
+                        'Room': room,
+                        'Day': day,
+                        'Time_Slot': time_slot,
+                        'Divisions': ', '.join(sorted({d for divisions in group['Divisions'] for d in divisions}))
+                    })
+
+        return _sort_clashes(pd.DataFrame(clashes, columns=['Room', 'Day', 'Time_Slot', 'Divisions']), 'Room')
+
+    def find_faculty_clashes(self):
+        """
+        Finds faculty members placed in two different rooms in the same slot.
+
+        A joint lecture (same teacher, same room, several divisions) is not a clash.
+
+        Returns:
+            pandas.DataFrame: Faculty, Day, Time_Slot, Rooms and Divisions
+        """
+        clashes = []
+        for initials, positions in self.faculty_index.items():
+            booked = self._covered_sessions(positions)
+            for (day, time_slot), group in booked.groupby(['Day', 'Time_Slot'], sort=False):
+                # Sessions without a room are told apart by their cell text
+                places = {rooms if rooms else cell for rooms, cell in zip(group['Rooms'], group['Cell'])}
+                if len(places) > 1:
+                    clashes.append({
+                        'Faculty': initials,
+                        'Day': day,
+                        'Time_Slot': time_slot,
+                        'Rooms': ', '.join(sorted({room for rooms in group['Rooms'] for room in rooms})),
+                        'Divisions': ', '.join(sorted({d for divisions in group['Divisions'] for d in divisions}))
+                    })
+
+        columns = ['Faculty', 'Day', 'Time_Slot', 'Rooms', 'Divisions']
+        return _sort_clashes(pd.DataFrame(clashes, columns=columns), 'Faculty')
+
+
+def _sort_clashes(clashes_df, key):
+    """Orders clashes by resource, then by day and slot in timetable order."""
+    if clashes_df.empty:
+        return clashes_df
+    day_order = clashes_df['Day'].map(DAYS.index)
+    slot_order = clashes_df['Time_Slot'].map(TIME_SLOTS.index)
+    return (clashes_df.assign(_day=day_order, _slot=slot_order)
+            .sort_values([key, '_day', '_slot'])
+            .drop(columns=['_day', '_slot'])
+            .reset_index(drop=True))
+
+
+def build_campus_index(sources, max_workers=None, directory=None, verbose=True):
+    """
+    Ingests many workbooks concurrently into one merged CampusIndex.
+
+    Each workbook is parsed in its own worker process, so department files
+    are read in parallel. Results are merged in sorted path order, so the
+    index is the same regardless of which worker finishes first.
+
+    Args:
+        sources (str or list): Workbook paths, directories or glob patterns
+        max_workers (int): Number of worker processes (default: CPU count)
+        directory (FacultyDirectory): Alias table for exact faculty matching
+        verbose (bool): Print progress, off for library use
+
+    Returns:
+        CampusIndex: Index over all sessions of all workbooks
+    """
+    paths = resolve_workbooks(sources)
+    if not paths:
+        raise FileNotFoundError(f"No workbooks found in: {sources}")
+
+    labels = [source_label(path) for path in paths]
+    duplicates = {label for label in labels if labels.count(label) > 1}
+    if duplicates:
+        raise ValueError(f"Workbooks must have unique file names, duplicated: {', '.join(sorted(duplicates))}")
+
+    if verbose:
+        print(f"Ingesting {len(paths)} workbooks")
+    try:
+        if len(paths) == 1 or max_workers == 1:
+            results = [read_workbook_sessions(path) for path in paths]
+        else:
+            # Workers parse with the same room registry as this process
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=set_room_registry,
+                                     initargs=(get_room_registry(),)) as executor:
+                results = list(executor.map(read_workbook_sessions, paths))
+    except Exception as e:
+        raise Exception(f"Error ingesting workbooks: {str(e)}")
+
+    records = [record for result in results for record in result]
+    sessions = pd.DataFrame(records, columns=SESSION_COLUMNS)
+    if verbose:
+        print(f"Indexed {len(sessions)} sessions from {sessions['Division'].nunique()} divisions")
+    return CampusIndex(sessions, directory)
+
+
+def main():
+    # Directory (or glob) holding every department's Classwise workbook
+    input_sources = "D:\\Timetables\\*.xlsm"
+    output_file = "C:\\Users\\omkar\\Downloads\\timetable\\Campus_Schedule.xlsx"
+    classroom = "H203"
+    faculty_name = "PVS"
+
+    try:
+        index = build_campus_index(input_sources)
+
+        clashes = index.find_clashes()
+        faculty_clashes = index.find_faculty_clashes()
+        print(f"Found {len(clashes)} room clashes and {len(faculty_clashes)} faculty clashes across campus")
+
+        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+            index.room_schedule(classroom).to_excel(writer, sheet_name=f'Classroom_{classroom}')
+            index.faculty_schedule(faculty_name).to_excel(writer, sheet_name=f'Faculty_{faculty_name}')
+            clashes.to_excel(writer, sheet_name='Clashes', index=False)
+            faculty_clashes.to_excel(writer, sheet_name='Faculty_Clashes', index=False)
+
+        print(f"Campus schedules saved to {output_file}")
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import pandas as pd
+from openpyxl import load_workbook
+from concurrent.futures import ProcessPoolExecutor
+import gzip
+import json
+import os
+import sys
+from campus_index import (CampusIndex, SESSION_COLUMNS, resolve_workbooks, source_label,
+                          read_sheet_grid, parse_sheet_grid)
+from cell_grammar import get_room_registry, set_room_registry
+from faculty_directory import FacultyDirectory
+from meta import read_sheet_meta
+
+PARTIAL_VERSION = 1
+META_COLUMNS = ['Division', 'Teacher_Initials', 'Course_Initials', 'Course_Code',
+                'Course_Name', 'Teacher_Name', 'Classroom']
+
+
+def plan_shards(sources, shard_count):
+    """
+    Splits every division sheet of the sources into shard_count shards.
+
+    The plan only depends on the sorted workbook paths and their sheet
+    order, so every machine computes the same plan from the same files.
+
+    Args:
+        sources (str or list): Workbook paths, directories or glob patterns
+        shard_count (int): Number of shards
+
+    Returns:
+        list: Per shard, a list of (workbook path, [sheet names]) pairs
+    """
+    if shard_count < 1:
+        raise ValueError("shard_count must be at least 1")
+    paths = resolve_workbooks(sources)
+    if not paths:
+        raise FileNotFoundError(f"No workbooks found in: {sources}")
+
+    sheets = []
+    for path in paths:
+        workbook = load_workbook(path, read_only=True)
+        try:
+            sheets.extend((path, name) for name in workbook.sheetnames)
+        finally:
+            workbook.close()
+
+    # Contiguous runs of sheets, so a shard opens as few workbooks as possible
+    shards = []
+    for shard in range(shard_count):
+        chunk = sheets[len(sheets) * shard // shard_count:len(sheets) * (shard + 1) // shard_count]
+        grouped = {}
+        for path, name in chunk:
+            grouped.setdefault(path, []).append(name)
+        shards.append(list(grouped.items()))
+    return shards
+
+
+def map_shard(assignments, shard_id=0):
+    """
+    Map step: parses a subset of sheets into a partial index.
+
+    Each workbook is loaded once; its selected sheets give session records
+    and metadata records. Sessions carry the sheet's position in its
+    workbook so the reduce step can restore the original order.
+
+    Args:
+        assignments (list): (workbook path, [sheet names] or None for all)
+        shard_id (int): Identifier recorded in the partial
+
+    Returns:
+        dict: JSON-serializable partial index
+    """
+    sessions, meta_records, parsed = [], [], []
+    for path, sheet_names in assignments:
+        source = source_label(path)
+        workbook = load_workbook(path, data_only=True)
+        try:
+            wanted = workbook.sheetnames if sheet_names is None else sheet_names
+            for name in wanted:
+                if name not in workbook.sheetnames:
+                    raise ValueError(f"Sheet '{name}' not found in {path}")
+                sheet = workbook[name]
+                order = workbook.sheetnames.index(name)
+                for record in parse_sheet_grid(read_sheet_grid(sheet), source):
+                    record['Rooms'], record['Teachers'] = list(record['Rooms']), list(record['Teachers'])
+                    sessions.append(dict(record, Sheet_Order=order))
+                meta_records.extend(dict(record, Source=source, Sheet_Order=order)
+                                    for record in read_sheet_meta(sheet))
+                parsed.append([source, name, order])
+        finally:
+            workbook.close()
+
+    return {'version': PARTIAL_VERSION, 'shard': shard_id, 'sheets': parsed,
+            'sessions': sessions, 'meta': meta_records}
+
+
+def write_partial(partial, output_file):
+    """Serializes a partial index as gzipped JSON (portable across machines)."""
+    temp_file = f"{output_file}.tmp"
+    with gzip.open(temp_file, 'wt', encoding='utf-8') as handle:
+        json.dump(partial, handle, separators=(',', ':'))
+    os.replace(temp_file, output_file)
+    return output_file
+
+
+def read_partial(partial_file):
+    if not os.path.exists(partial_file):
+        raise FileNotFoundError(f"Partial index not found: {partial_file}")
+    with gzip.open(partial_file, 'rt', encoding='utf-8') as handle:
+        partial = json.load(handle)
+    if partial.get('version') != PARTIAL_VERSION:
+        raise ValueError(f"Unsupported partial index version in {partial_file}")
+    return partial
+
+
+def reduce_partials(partials):
+    """
+    Reduce step: merges partial indices into one session table and meta table.
+
+    The result does not depend on the order partials arrive in or on how the
+    sheets were sharded: rows are sorted by source, sheet position, grid row
+    and slot. A sheet present in two partials is an error.
+
+    Args:
+        partials (list): Partial dicts or paths of partial files
+
+    Returns:
+        tuple: (sessions DataFrame, meta DataFrame)
+    """
+    partials = [read_partial(p) if isinstance(p, (str, os.PathLike)) else p for p in partials]
+
+    seen = {}
+    for partial in partials:
+        for source, sheet, _ in partial['sheets']:
+            if (source, sheet) in seen:
+                raise ValueError(f"Sheet {source}/{sheet} is in shards {seen[(source, sheet)]} and {partial['shard']}")
+            seen[(source, sheet)] = partial['shard']
+
+    sessions = pd.DataFrame([record for partial in partials for record in partial['sessions']],
+                            columns=SESSION_COLUMNS + ['Sheet_Order'])
+    sessions = sessions.sort_values(['Source', 'Sheet_Order', 'Row', 'Slot'], kind='stable')
+    sessions['Rooms'] = sessions['Rooms'].map(tuple)
+    sessions['Teachers'] = sessions['Teachers'].map(tuple)
+    sessions = sessions[SESSION_COLUMNS].reset_index(drop=True)
+
+    meta_df = pd.DataFrame([record for partial in partials for record in partial['meta']],
+                           columns=META_COLUMNS + ['Source', 'Sheet_Order'])
+    meta_df = (meta_df.sort_values(['Source', 'Sheet_Order'], kind='stable')[META_COLUMNS]
+               .reset_index(drop=True))
+    return sessions, meta_df
+
+
+def merge_shards(partials, directory=None):
+    """
+    Builds the CampusIndex that drives the report outputs from partial indices.
+
+    Args:
+        partials (list): Partial dicts or paths of partial files
+        directory (FacultyDirectory): Alias table; built from the merged
+            metadata when None and metadata is present
+
+    Returns:
+        tuple: (CampusIndex, merged meta DataFrame)
+    """
+    sessions, meta_df = reduce_partials(partials)
+    if directory is None and not meta_df.empty:
+        directory = FacultyDirectory.from_meta(meta_df)
+    return CampusIndex(sessions, directory), meta_df
+
+
+def _map_to_file(args):
+    assignments, shard_id, output_file = args
+    return write_partial(map_shard(assignments, shard_id), output_file)
+
+
+def run_local(sources, work_dir, shard_count=4, max_workers=None):
+    """
+    Runs the map step in local worker processes, then the reduce step.
+
+    The same partial files could come from separate machines; this runner
+    is for single-host use and testing.
+
+    Returns:
+        tuple: (CampusIndex, merged meta DataFrame)
+    """
+    os.makedirs(work_dir, exist_ok=True)
+    jobs = [(assignments, shard_id, os.path.join(work_dir, f"shard_{shard_id:03d}.json.gz"))
+            for shard_id, assignments in enumerate(plan_shards(sources, shard_count)) if assignments]
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=set_room_registry,
+                                 initargs=(get_room_registry(),)) as executor:
+            partial_files = list(executor.map(_map_to_file, jobs))
+    except Exception as e:
+        raise Exception(f"Error in map step: {str(e)}")
+
+    print(f"Mapped {len(partial_files)} shards into {work_dir}")
+    return merge_shards(partial_files)
+
+
+def main():
+    # Map on one machine:    python campus_shards.py map SHARD_ID SHARD_COUNT OUTPUT SOURCES...
+    # Reduce anywhere:       python campus_shards.py reduce OUTPUT_DIR PARTIAL_FILES...
+    # Without arguments, map and reduce run locally
+    input_sources = "D:\\Timetables\\*.xlsm"
+    output_dir = "C:\\Users\\omkar\\Downloads\\timetable\\reports"
+    work_dir = "C:\\Users\\omkar\\Downloads\\timetable\\shards"
+
+    try:
+        args = sys.argv[1:]
+        if args and args[0] == 'map':
+            shard_id, shard_count, output_file = int(args[1]), int(args[2]), args[3]
+            assignments = plan_shards(args[4:], shard_count)[shard_id]
+            write_partial(map_shard(assignments, shard_id), output_file)
+            print(f"Shard {shard_id}/{shard_count}: {sum(len(names) for _, names in assignments)} sheets -> {output_file}")
+            return
+
+        if args and args[0] == 'reduce':
+            output_dir = args[1]
+            index, meta_df = merge_shards(args[2:])
+        else:
+            index, meta_df = run_local(input_sources, work_dir)
+        print(f"Merged {len(index.sessions)} sessions from {len(index.divisions)} divisions")
+
+        from report_pipeline import save_schedule_report, report_file_name
+        os.makedirs(output_dir, exist_ok=True)
+        meta_df.to_csv(os.path.join(output_dir, "meta_info.csv"), index=False)
+        file_names = {}
+        for kind, names, schedule in (('Classroom', index.rooms, index.room_schedule),
+                                      ('Faculty', index.faculty, index.faculty_schedule),
+                                      ('Division', index.divisions, index.division_schedule)):
+            for name in names:
+                output_file = os.path.join(output_dir, report_file_name(kind, name, file_names))
+                save_schedule_report(schedule(name), output_file, kind, name)
+        print(f"Reports saved to {output_dir}")
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+from collections import namedtuple
+from functools import lru_cache
+import re
+import sys
+import time
+from room_registry import DEFAULT_REGISTRY
+
+# One class held in a timetable cell; practical cells hold one entry per batch group
+CellEntry = namedtuple('CellEntry', ['kind', 'batches', 'subject', 'teachers', 'rooms', 'lab'])
+
+# The cell grammar as one tokenizer; a cell is scanned once, left to right.
+# A batch list ("A1", "B1,B2") only counts as one when a "-" or a
+# "SUBJ (" follows and it does not start with a room code, so "H202" in
+# "...-H202 - A2-..." or "...-H202-CLIII" stays a room.
+# Room codes come from the room registry source the grammar is built for.
+@lru_cache(maxsize=None)
+def _grammar(source):
+    """Tokenizer and room matcher for one room registry source, compiled once."""
+    # The lookahead repeats the room codes without their group names
+    unnamed = re.sub(r'\(\?P<\w+>', '(?:', source)
+    tokens = re.compile(r'''
+    (?P<batches>(?!(?-x:''' + unnamed + r'''))[A-Z]+\d+(?:\s*,\s*[A-Z]+\d+)*)(?=\s*-|\s+[A-Z][A-Z0-9&./]*\s*\()
+  | (?P<room>(?-x:''' + source + r'''))
+  | \((?P<paren>[^()]*)\)
+  | (?P<word>[A-Z][A-Z0-9&./]*)
+''', re.VERBOSE)
+    return tokens, re.compile(source)
+
+
+ROOM_REGISTRY = DEFAULT_REGISTRY
+
+
+def set_room_registry(registry):
+    """
+    Makes a RoomRegistry the one used by every cell parser.
+
+    Also used as ProcessPoolExecutor initializer, so worker processes parse
+    with the same registry as the parent. Parsed cells are cached per
+    registry source, so neither a swap nor rooms added to the active
+    registry can return a result parsed with the old codes.
+    """
+    global ROOM_REGISTRY
+    ROOM_REGISTRY = registry
+
+
+def get_room_registry():
+    return ROOM_REGISTRY
+
+
+def find_rooms(text):
+    """All registered room codes in a text, in order, without duplicates."""
+    return ROOM_REGISTRY.find_rooms(text)
+
+
+def parse_cell(cell):
+    """
+    Parses a timetable cell into structured class entries.
+
+    Theory cells ("DS MNV H303", one token per line or space separated) give
+    one entry: first word is the subject, room codes are rooms, the rest
+    are faculty initials. A cell without a subject ("MNV H303") cannot be
+    told apart from one without a teacher, so MNV is read as the subject.
+    Practical cells ("A1-COA(SDP)-CNLII(H204B)", "B1,B2-UHV(SS)-AK-H202",
+    "B1-PS(VPM)-H202-CLIII", the " - " separated "A1\\nCOA (SDP)\\n(H204B)"
+    form, entries broken over lines) give one entry per batch group; the
+    lab name is the word just before a bracketed room or just after a room.
+    Only batch entries have a lab, so "DS MNV (H303)" keeps MNV as teacher.
+    Results are cached, since the same cell text repeats across divisions;
+    the cache is keyed by the active registry's source as well.
+
+    Args:
+        cell (str): Raw cell text
+
+    Returns:
+        tuple: CellEntry tuples (empty for blank cells)
+    """
+    return _parse_cell(cell, ROOM_REGISTRY.source)
+
+
+@lru_cache(maxsize=65536)
+def _parse_cell(cell, source):
+    token_pattern, room_pattern = _grammar(source)
+    entries = []
+    batches, subject, teachers, rooms, lab = (), '', [], [], ''
+    previous = None
+
+    for token in token_pattern.finditer(cell.upper()):
+        kind, value = token.lastgroup, token.group(token.lastgroup)
+
+        if kind == 'batches':
+            if batches or subject:
+                entries.append(CellEntry('Practical' if batches else 'Theory', batches, subject,
+                                         tuple(teachers), tuple(rooms), lab))
+            batches = tuple(batch.strip() for batch in value.split(','))
+            subject, teachers, rooms, lab = '', [], [], ''
+        elif kind == 'room':
+            rooms.append(value)
+        elif kind == 'word':
+            if batches and previous == 'room' and not lab:
+                # "H202-CLIII": the word just after the room is the lab name
+                lab = value
+            elif subject:
+                teachers.append(value)
+            else:
+                subject = value
+        else:
+            inner_rooms = tuple(dict.fromkeys(match.group(0) for match in room_pattern.finditer(value)))
+            if inner_rooms:
+                rooms.extend(inner_rooms)
+                # "CNLII(H204B)": in a batch entry the word just before the
+                # room is the lab name; in "DS MNV (H303)" it stays a teacher
+                if batches and previous == 'word' and teachers:
+                    lab = teachers.pop()
+            elif value.strip():
+                teachers.append(value.strip())
+        previous = kind
+
+    if batches or subject or rooms:
+        entries.append(CellEntry('Practical' if batches else 'Theory', batches, subject,
+                                 tuple(teachers), tuple(rooms), lab))
+    return tuple(entries)
+
+
+def cell_rooms(entries):
+    """All room codes of a parsed cell, in order, without duplicates."""
+    return tuple(dict.fromkeys(room for entry in entries for room in entry.rooms))
+
+
+def cell_teachers(entries):
+    """All faculty initials of a parsed cell, in order, without duplicates."""
+    return tuple(dict.fromkeys(teacher for entry in entries for teacher in entry.teachers))
+
+
+def _legacy_parse(cell):
+    # What the scripts did before: split on " - ", lines and two regex searches
+    entries = []
+    if '-' in cell:
+        for entry in cell.split(' - '):
+            lines = entry.split('\n')
+            if len(lines) >= 3:
+                subject_info = re.search(r'(\w+)\s*\((.*?)\)', lines[1])
+                classroom_info = re.search(r'\((.*?)\)', lines[2])
+                if subject_info and classroom_info:
+                    entries.append((lines[0].strip(), subject_info.group(1), classroom_info.group(1)))
+    else:
+        components = cell.strip().split()
+        entries.append((" ".join(components[:2]), " ".join(components[2:])))
+    return entries
+
+
+def benchmark(cells, repeat=5):
+    """
+    Measures parser throughput in cells per second.
+
+    Args:
+        cells (list): Cell texts, e.g. every non-empty cell of a workbook
+        repeat (int): Passes over the cells, best pass is reported
+
+    Returns:
+        dict: Cells/second for the legacy split, the grammar without its
+            cache and the grammar with a warm cache
+    """
+    def best_rate(parse):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for cell in cells:
+                parse(cell)
+            best = min(best, time.perf_counter() - start)
+        return len(cells) / best if best else float('inf')
+
+    return {
+        'legacy': best_rate(_legacy_parse),
+        'grammar_uncached': best_rate(lambda cell: _parse_cell.__wrapped__(cell, ROOM_REGISTRY.source)),
+        'grammar_warm': best_rate(parse_cell),
+    }
+
+
+SAMPLE_CELLS = [
+    "DS MNV H303",
+    "AM\nMPP\nH303",
+    "B1,B2-UHV(SS)-AK-H202\nB3,B4-UHV(APT)-TP-H203",
+    "A1-COA(SDP)-CNLII(H204B)\nA2-ES(AM)-H202",
+    "B1-PS(VPM)-\nCLIII(H306C)",
+    "A1\nCOA (SDP)\n(H204B) - A2\nES (AM)\n(H202)",
+    "PROJECT COMMON",
+    "DS2 MNV H303",
+]
+
+
+def main():
+    # Benchmark on every non-empty cell of a workbook, or on the sample cells
+    if len(sys.argv) > 1:
+        from campus_index import build_campus_index
+        cells = build_campus_index(sys.argv[1:]).sessions['Cell'].tolist()
+    else:
+        cells = SAMPLE_CELLS * 2000
+
+    for cell in SAMPLE_CELLS:
+        print(repr(cell))
+        for entry in parse_cell(cell):
+            print(f"    {entry}")
+
+    rates = benchmark(cells)
+    print(f"\nParsed {len(cells)} cells")
+    for name, rate in rates.items():
+        print(f"{name:>16}: {rate:,.0f} cells/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+from collections import namedtuple
+import pandas as pd
+import os
+import re
+from cell_grammar import parse_cell, cell_teachers
+
+# One faculty member: full name and every spelling that refers to them
+FacultyEntry = namedtuple('FacultyEntry', ['initials', 'name', 'aliases'])
+
+SEPARATORS = re.compile(r'[\s.]+')
+ALTERNATIVES = re.compile(r'[/,&]')
+
+
+def normalize_initials(text):
+    """Canonical form of a faculty token: upper case, no dots or spaces ("p. v. s" -> "PVS")."""
+    return SEPARATORS.sub('', str(text)).upper()
+
+
+def name_initials(name):
+    """Initials derived from a full name ("S D Pawar" -> "SDP")."""
+    return ''.join(part[0] for part in re.findall(r'[A-Za-z]+', str(name))).upper()
+
+
+class FacultyDirectory:
+    """
+    Initials -> (teacher name, aliases) table built from the meta data.
+
+    Every alias maps to exactly one faculty member, so matching a cell is a
+    tokenization plus one dictionary probe per token. Aliases derived from
+    names that would point to two people are dropped rather than guessed.
+    """
+
+    def __init__(self, entries):
+        self.table = {entry.initials: entry for entry in entries}
+        self.lookup = {}
+        for entry in entries:
+            for alias in entry.aliases:
+                self.lookup[alias] = entry.initials
+
+    @classmethod
+    def from_meta(cls, meta_df, extra_aliases=None):
+        """
+        Builds the directory from the Teacher_Initials/Teacher_Name columns.
+
+        Args:
+            meta_df (pandas.DataFrame or str): Output of
+                meta.extract_course_teacher_data, or a CSV of it
+            extra_aliases (dict): Optional alias -> initials overrides
+
+        Returns:
+            FacultyDirectory: The alias table
+        """
+        if isinstance(meta_df, str):
+            if not os.path.exists(meta_df):
+                raise FileNotFoundError(f"Meta file not found: {meta_df}")
+            meta_df = pd.read_csv(meta_df)
+
+        names = {}
+        for initials, name in zip(meta_df['Teacher_Initials'], meta_df['Teacher_Name']):
+            if pd.isna(initials) or not normalize_initials(initials):
+                continue
+            names.setdefault(normalize_initials(initials), str(name).strip())
+
+        aliases = {initials: {initials} for initials in names}
+
+        # Name-derived initials are only kept when they identify one person
+        derived = {}
+        for initials, name in names.items():
+            derived.setdefault(name_initials(name), set()).add(initials)
+        for alias, owners in derived.items():
+            if alias and len(owners) == 1 and alias not in names:
+                aliases[next(iter(owners))].add(alias)
+
+        for alias, initials in (extra_aliases or {}).items():
+            initials = normalize_initials(initials)
+            if initials not in names:
+                raise ValueError(f"Alias '{alias}' points to unknown faculty '{initials}'")
+            aliases[initials].add(normalize_initials(alias))
+
+        return cls([FacultyEntry(initials, names[initials], frozenset(aliases[initials]))
+                    for initials in sorted(names)])
+
+    def __contains__(self, initials):
+        return initials in self.table
+
+    def __len__(self):
+        return len(self.table)
+
+    def resolve(self, token):
+        """Canonical initials for a token or alias, or None when unknown."""
+        return self.lookup.get(normalize_initials(token))
+
+    def name_of(self, initials):
+        entry = self.table.get(initials)
+        return entry.name if entry else ''
+
+    def cell_faculty(self, cell):
+        """
+        Canonical initials of every faculty member named in a cell.
+
+        Args:
+            cell (str): Raw timetable cell
+
+        Returns:
+            tuple: Initials in order of appearance, without duplicates
+        """
+        return self.resolve_tokens(cell_teachers(parse_cell(cell)))
+
+    def resolve_tokens(self, tokens):
+        """Resolves parsed teacher tokens ("PV/PVS" counts as two) to canonical initials."""
+        return tuple(dict.fromkeys(self.lookup[token] for token in cell_faculty_tokens(tokens)
+                                   if token in self.lookup))
+
+
+def cell_faculty_tokens(tokens):
+    """Splits parsed teacher tokens into normalized faculty tokens ("PV/PVS" -> ("PV", "PVS"))."""
+    found = []
+    for token in tokens:
+        for part in ALTERNATIVES.split(token):
+            part = normalize_initials(part)
+            if part and part not in found:
+                found.append(part)
+    return tuple(found)
@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.utils import get_column_letter
+from campus_index import build_campus_index, DAYS, TIME_SLOTS, BREAK_SLOTS, SLOT_MINUTES
+from faculty_directory import FacultyDirectory
+import meta
+
+# Position of every teaching slot once breaks are removed, so slots either
+# side of a short break count as back-to-back
+TEACHING_POSITION = {slot_idx: position for position, slot_idx in enumerate(
+    idx for idx, slot in enumerate(TIME_SLOTS) if slot not in BREAK_SLOTS)}
+
+
+def compute_faculty_workload(sessions, meta_df):
+    """
+    Computes the workload of every faculty member in one grouped pass.
+
+    Args:
+        sessions (pandas.DataFrame): Session table of a CampusIndex
+        meta_df (pandas.DataFrame): Output of meta.extract_course_teacher_data
+
+    Returns:
+        pandas.DataFrame: One row per teacher with weekly and per-day hours,
+            theory/practical split, back-to-back sessions and gap hours
+    """
+    directory = FacultyDirectory.from_meta(meta_df)
+
+    taught = sessions[['Day', 'Slot', 'Span', 'Kind']].assign(
+        Teacher=sessions['Teachers'].map(directory.resolve_tokens)).explode('Teacher').dropna(subset=['Teacher'])
+    taught = taught.reset_index(drop=True).rename_axis('Session')
+
+    # One row per occupied slot; a combined lecture for several divisions counts once
+    offsets = taught.loc[taught.index.repeat(taught['Span'])]
+    offsets = offsets.assign(Slot=offsets['Slot'] + offsets.groupby(level=0).cumcount().to_numpy())
+    occupied = (offsets[offsets['Slot'] < len(TIME_SLOTS)]
+                .sort_values('Kind', ascending=False)
+                .drop_duplicates(['Teacher', 'Day', 'Slot'])
+                .reset_index())
+    occupied = occupied[occupied['Slot'].isin(TEACHING_POSITION.keys())]
+
+    occupied['Minutes'] = np.take(SLOT_MINUTES, occupied['Slot'])
+    occupied['Position'] = occupied['Slot'].map(TEACHING_POSITION)
+    occupied['Day_Order'] = occupied['Day'].map(DAYS.index)
+    occupied = occupied.sort_values(['Teacher', 'Day_Order', 'Position'])
+
+    # Minutes of teaching time elapsed before each teaching position
+    teaching_minutes = [SLOT_MINUTES[slot] for slot in TEACHING_POSITION]
+    elapsed = np.concatenate([[0], np.cumsum(teaching_minutes)])
+
+    # Back-to-back is between distinct sessions: one starting where the
+    # teacher's previous session that day ends (the second slot of a
+    # practical is not a new session)
+    bounds = occupied.groupby(['Teacher', 'Day', 'Session'], sort=False).agg(
+        Start=('Position', 'min'), End=('Position', 'max'), Day_Order=('Day_Order', 'first')).reset_index()
+    bounds = bounds.sort_values(['Teacher', 'Day_Order', 'Start'])
+    same_day = (bounds['Teacher'].eq(bounds['Teacher'].shift())
+                & bounds['Day'].eq(bounds['Day'].shift()))
+    bounds['Back_To_Back'] = same_day & bounds['Start'].eq(bounds['End'].shift() + 1)
+    occupied['Practical_Minutes'] = occupied['Minutes'].where(occupied['Kind'] == 'Practical', 0)
+
+    per_day = occupied.groupby(['Teacher', 'Day'], sort=False).agg(
+        Minutes=('Minutes', 'sum'),
+        Practical_Minutes=('Practical_Minutes', 'sum'),
+        First=('Position', 'min'),
+        Last=('Position', 'max'))
+    per_day['Back_To_Back'] = bounds.groupby(['Teacher', 'Day'])['Back_To_Back'].sum().reindex(per_day.index)
+    span_minutes = elapsed[per_day['Last'].to_numpy() + 1] - elapsed[per_day['First'].to_numpy()]
+    per_day['Gap_Minutes'] = span_minutes - per_day['Minutes']
+
+    weekly = per_day.groupby(level='Teacher').agg(
+        Minutes=('Minutes', 'sum'),
+        Practical_Minutes=('Practical_Minutes', 'sum'),
+        Back_To_Back=('Back_To_Back', 'sum'),
+        Gap_Minutes=('Gap_Minutes', 'sum'),
+        Days=('Minutes', 'size'),
+        Max_Day_Minutes=('Minutes', 'max'))
+    day_hours = (per_day['Minutes'].unstack('Day').reindex(columns=DAYS).fillna(0) / 60).round(2)
+
+    report = pd.DataFrame({
+        'Teacher_Initials': weekly.index,
+        'Teacher_Name': [directory.name_of(initials) for initials in weekly.index],
+        'Weekly_Hours': (weekly['Minutes'] / 60).round(2).to_numpy(),
+        'Theory_Hours': ((weekly['Minutes'] - weekly['Practical_Minutes']) / 60).round(2).to_numpy(),
+        'Practical_Hours': (weekly['Practical_Minutes'] / 60).round(2).to_numpy(),
+        'Back_To_Back': weekly['Back_To_Back'].astype(int).to_numpy(),
+        'Gap_Hours': (weekly['Gap_Minutes'] / 60).round(2).to_numpy(),
+        'Days_Taught': weekly['Days'].to_numpy(),
+        'Max_Day_Hours': (weekly['Max_Day_Minutes'] / 60).round(2).to_numpy(),
+    })
+    for day in DAYS:
+        report[f'{day}_Hours'] = day_hours[day].reindex(weekly.index).to_numpy()
+
+    return report.sort_values(['Weekly_Hours', 'Teacher_Initials'], ascending=[False, True]).reset_index(drop=True)
+
+
+def save_workload_report(report, output_file):
+    """
+    Saves the workload report as one sheet with filters on every column.
+    """
+    try:
+        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+            report.to_excel(writer, sheet_name='Faculty_Workload', index=False)
+            worksheet = writer.sheets['Faculty_Workload']
+
+            # Highlight headers and make every column sortable
+            for cell in worksheet[1]:
+                cell.font = Font(bold=True)
+                cell.fill = PatternFill(start_color="E0E0E0", end_color="E0E0E0", fill_type="solid")
+                cell.alignment = Alignment(wrap_text=True, horizontal='center', vertical='center')
+            worksheet.auto_filter.ref = worksheet.dimensions
+            worksheet.freeze_panes = 'C2'
+
+            for col_idx, column in enumerate(worksheet.columns, start=1):
+                max_length = max(len(str(cell.value)) for cell in column if cell.value is not None)
+                worksheet.column_dimensions[get_column_letter(col_idx)].width = min(max_length + 2, 30)
+
+    except Exception as e:
+        raise Exception(f"Error saving workload report: {str(e)}")
+
+
+def main():
+    input_file = "D:\\Classwise 24 25 Sem I.xlsm"
+    output_file = "C:\\Users\\omkar\\Downloads\\timetable\\Faculty_Workload.xlsx"
+
+    try:
+        index = build_campus_index(input_file)
+        meta_df = meta.extract_course_teacher_data(input_file)
+        report = compute_faculty_workload(index.sessions, meta_df)
+        save_workload_report(report, output_file)
+        print(f"Workload for {len(report)} faculty saved to {output_file}")
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,82 @@
 import pandas as pd
+from collections import OrderedDict
+from collections.abc import Mapping
 
-def read_excel_sheets(file_path):
+
+class LazySheetMapping(Mapping):
+    """
+    Read-only, dict-like view of the sheets of an Excel file.
+
+    A sheet is parsed only when it is first accessed, and at most
+    `max_cached` parsed sheets are kept (least recently used are evicted),
+    so iterating over a huge workbook uses bounded memory.
+
+    Parameters:
+    file_path (str): Path to the Excel file
+    max_cached (int): Number of parsed DataFrames to keep in memory
+    **read_kwargs: Passed to pandas when parsing a sheet (skiprows, nrows, ...)
+    """
+
+    def __init__(self, file_path, max_cached=4, **read_kwargs):
+        if max_cached < 1:
+            raise ValueError("max_cached must be at least 1")
+        self._excel_file = pd.ExcelFile(file_path)
+        self._read_kwargs = read_kwargs
+        self._cache = OrderedDict()
+        self.max_cached = max_cached
+
+    @property
+    def sheet_names(self):
+        return self._excel_file.sheet_names
+
+    def __getitem__(self, sheet_name):
+        if sheet_name in self._cache:
+            self._cache.move_to_end(sheet_name)
+            return self._cache[sheet_name]
+        if sheet_name not in self.sheet_names:
+            raise KeyError(sheet_name)
+
+        df = self._excel_file.parse(sheet_name, **self._read_kwargs)
+        self._cache[sheet_name] = df
+        while len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+        return df
+
+    def __iter__(self):
+        return iter(self.sheet_names)
+
+    def __len__(self):
+        return len(self.sheet_names)
+
+    def __contains__(self, sheet_name):
+        return sheet_name in self.sheet_names
+
+    def close(self):
+        self._cache.clear()
+        self._excel_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_excel_sheets(file_path, lazy=False, max_cached=4):
     """
     Read all sheets from an Excel file and return them as a dictionary of DataFrames.
     
     Parameters:
     file_path (str): Path to the Excel file
+    lazy (bool): Return a LazySheetMapping that parses sheets on first access
+    max_cached (int): Parsed sheets kept in memory when lazy
     
     Returns:
     dict: Dictionary with sheet names as keys and pandas DataFrames as values
     """
+    if lazy:
+        return LazySheetMapping(file_path, max_cached=max_cached, skiprows=8, nrows=23)
+
     # Create Excel file object
     excel_file = pd.ExcelFile(file_path)
     
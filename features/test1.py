@@ -1,9 +1,13 @@
-# works okish for theoretical classes but need to work on the practical classes data
+# theory and practical cells are both parsed by the shared cell grammar
 
 
 
+import os
+import sys
 import pandas as pd
-import re
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cell_grammar import parse_cell
 
 def read_timetable(file_path):
     # Read the timetable from an Excel file, skipping initial rows
@@ -21,49 +25,19 @@ def extract_classroom_info(timetable_df):
             cell_content = row[col]
             if pd.notna(cell_content) and isinstance(cell_content, str):  # Check if cell is not empty
                 time_slot = col  # Corresponding time slot
-                # Split by new lines for theoretical classes or hyphen for practical classes
-                if '-' in cell_content:
-                    entries = cell_content.split(' - ')
-                    for entry in entries:
-                        lines = entry.split('\n')
-                        if len(lines) >= 3:  # Ensure we have enough lines
-                            sub_division = lines[0].strip()
-                            subject_info = re.search(r'(\w+)\s*\((.*?)\)', lines[1])  # Subject and Teacher
-                            classroom_info = re.search(r'\((.*?)\)', lines[2])  # Classroom number
-
-                            if subject_info and classroom_info:
-                                subject_short_form = subject_info.group(1).strip()
-                                teacher_short_name = subject_info.group(2).strip()
-                                classroom_number = classroom_info.group(1).strip()
-
-                                # Store data in dictionary
-                                if classroom_number not in classroom_data:
-                                    classroom_data[classroom_number] = []
-                                
-                                classroom_data[classroom_number].append({
-                                    'Day': day,
-                                    'Time': time_slot,
-                                    'Sub-Division': sub_division,
-                                    'Subject': subject_short_form,
-                                    'Teacher': teacher_short_name
-                                })
-                else:
-                    lines = cell_content.split('\n')
-                    if len(lines) >= 3:  # Ensure we have enough lines
-                        subject_short_form = lines[0].strip()
-                        teacher_short_name = lines[1].strip()
-                        classroom_number = lines[2].strip()
-
+                # One entry per theory class or per practical batch group
+                for entry in parse_cell(cell_content):
+                    for classroom_number in entry.rooms:
                         # Store data in dictionary
                         if classroom_number not in classroom_data:
                             classroom_data[classroom_number] = []
-                        
+
                         classroom_data[classroom_number].append({
                             'Day': day,
                             'Time': time_slot,
-                            'Sub-Division': '',
-                            'Subject': subject_short_form,
-                            'Teacher': teacher_short_name
+                            'Sub-Division': ','.join(entry.batches),
+                            'Subject': entry.subject,
+                            'Teacher': ', '.join(entry.teachers)
                         })
 
     return classroom_data
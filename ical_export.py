@@ -0,0 +1,194 @@
+from datetime import date, datetime, timedelta, timezone
+import hashlib
+import os
+import re
+from campus_index import build_campus_index, DAYS, TIME_SLOTS, slot_bounds
+from cell_grammar import parse_cell
+
+WHITESPACE = re.compile(r'\s+')
+
+
+def to_date(value):
+    """Accepts a date or an ISO 'YYYY-MM-DD' string."""
+    return value if isinstance(value, date) else datetime.strptime(str(value), '%Y-%m-%d').date()
+
+
+def escape_text(text):
+    """Escapes a TEXT value as required by RFC 5545."""
+    return (str(text).replace('\\', '\\\\').replace(';', '\\;')
+            .replace(',', '\\,').replace('\n', '\\n'))
+
+
+def fold_line(line):
+    """Folds a content line into 75-octet chunks (RFC 5545 section 3.1)."""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    chunks, start, limit = [], 0, 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Never split a multi-byte character
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        chunks.append(encoded[start:end].decode('utf-8'))
+        start, limit = end, 74
+    return '\r\n '.join(chunks) + '\r\n'
+
+
+class CalendarWriter:
+    """
+    Streams one .ics file: events are written as they are produced, so
+    exporting every room and faculty member never holds a calendar in memory.
+    """
+
+    def __init__(self, output_file, name, tzid, utc_offset):
+        self.handle = open(output_file, 'w', encoding='utf-8', newline='')
+        self.tzid = tzid
+        self.write('BEGIN:VCALENDAR')
+        self.write('VERSION:2.0')
+        self.write('PRODID:-//Timetable Generator//Timetable Export//EN')
+        self.write('CALSCALE:GREGORIAN')
+        self.write(f'X-WR-CALNAME:{escape_text(name)}')
+        # Fixed-offset zone, timetables follow local wall-clock time
+        self.write('BEGIN:VTIMEZONE')
+        self.write(f'TZID:{tzid}')
+        self.write('BEGIN:STANDARD')
+        self.write('DTSTART:19700101T000000')
+        self.write(f'TZOFFSETFROM:{utc_offset}')
+        self.write(f'TZOFFSETTO:{utc_offset}')
+        self.write('END:STANDARD')
+        self.write('END:VTIMEZONE')
+
+    def write(self, line):
+        self.handle.write(fold_line(line))
+
+    def add_event(self, uid, start, end, until, summary, location, description, exdates, stamp):
+        self.write('BEGIN:VEVENT')
+        self.write(f'UID:{uid}')
+        self.write(f'DTSTAMP:{stamp}')
+        self.write(f'DTSTART;TZID={self.tzid}:{start:%Y%m%dT%H%M%S}')
+        self.write(f'DTEND;TZID={self.tzid}:{end:%Y%m%dT%H%M%S}')
+        self.write(f'RRULE:FREQ=WEEKLY;UNTIL={until:%Y%m%dT%H%M%S}Z')
+        if exdates:
+            self.write(f'EXDATE;TZID={self.tzid}:' + ','.join(f'{value:%Y%m%dT%H%M%S}' for value in exdates))
+        self.write(f'SUMMARY:{escape_text(summary)}')
+        if location:
+            self.write(f'LOCATION:{escape_text(location)}')
+        self.write(f'DESCRIPTION:{escape_text(description)}')
+        self.write('END:VEVENT')
+
+    def close(self):
+        self.write('END:VCALENDAR')
+        self.handle.close()
+
+
+def weekly_sessions(sessions):
+    """
+    Collapses sessions into weekly events: identical cells in the same slot
+    (a joint lecture for several divisions) become one event.
+    """
+    events = {}
+    for session in sessions.itertuples(index=False):
+        key = (session.Day, session.Slot, session.Span, WHITESPACE.sub(' ', session.Cell).strip())
+        event = events.setdefault(key, {'rooms': [], 'divisions': []})
+        event['divisions'].extend(session.Divisions)
+        event['rooms'].extend(room for room in session.Rooms if room not in event['rooms'])
+    return events
+
+
+def write_entity_calendar(output_file, name, sessions, start_date, end_date, holidays, tzid, utc_offset):
+    """Writes the weekly sessions of one room or faculty member as recurring events."""
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    offset_hours, offset_minutes = int(utc_offset[:3]), int(utc_offset[0] + utc_offset[3:])
+    utc_shift = timedelta(hours=offset_hours, minutes=offset_minutes)
+    writer = CalendarWriter(output_file, name, tzid, utc_offset)
+    count = 0
+
+    try:
+        for (day, slot, span, cell), event in sorted(weekly_sessions(sessions).items(),
+                                                     key=lambda item: (DAYS.index(item[0][0]), item[0][1])):
+            # First occurrence: first date on or after the semester start on that weekday
+            first = start_date + timedelta(days=(DAYS.index(day) - start_date.weekday()) % 7)
+            if first > end_date:
+                continue
+            start_minute = slot_bounds(TIME_SLOTS[slot])[0]
+            end_minute = slot_bounds(TIME_SLOTS[min(slot + span, len(TIME_SLOTS)) - 1])[1]
+            start = datetime.combine(first, datetime.min.time()) + timedelta(minutes=start_minute)
+            end = datetime.combine(first, datetime.min.time()) + timedelta(minutes=end_minute)
+            until = datetime.combine(end_date, datetime.min.time()) + timedelta(minutes=end_minute) - utc_shift
+            exdates = [datetime.combine(holiday, datetime.min.time()) + timedelta(minutes=start_minute)
+                       for holiday in holidays if holiday.weekday() == DAYS.index(day) and first <= holiday <= end_date]
+
+            uid_source = f"{name}|{day}|{slot}|{span}|{cell}".encode('utf-8')
+            uid = f"{hashlib.sha1(uid_source).hexdigest()}@timetable"
+            subjects = list(dict.fromkeys(entry.subject for entry in parse_cell(cell) if entry.subject))
+            summary = ' / '.join(subjects) if subjects else cell
+            description = f"{cell}\nDivisions: {', '.join(sorted(set(event['divisions'])))}"
+            writer.add_event(uid, start, end, until, summary, ', '.join(event['rooms']),
+                             description, exdates, stamp)
+            count += 1
+    finally:
+        writer.close()
+    return count
+
+
+def export_calendars(index, output_dir, semester_start, semester_end, holidays=(),
+                     rooms=None, faculty=None, tzid='Asia/Kolkata', utc_offset='+0530'):
+    """
+    Exports an .ics file per room and per faculty member in one batch.
+
+    Args:
+        index (CampusIndex): Parsed index backing the schedule generators
+        output_dir (str): Directory for the .ics files
+        semester_start (str or date): First teaching day, 'YYYY-MM-DD'
+        semester_end (str or date): Last teaching day, 'YYYY-MM-DD'
+        holidays (list): Dates without classes, excluded from every series
+        rooms (list): Rooms to export, None for all rooms in the index
+        faculty (list): Faculty to export, None for all faculty in the index
+        tzid (str): Time zone name written into the calendars
+        utc_offset (str): Fixed UTC offset of that zone, e.g. '+0530'
+
+    Returns:
+        list: Paths of the written .ics files
+    """
+    start_date, end_date = to_date(semester_start), to_date(semester_end)
+    if end_date < start_date:
+        raise ValueError("Semester end must not be before semester start")
+    holidays = sorted(to_date(holiday) for holiday in holidays)
+    os.makedirs(output_dir, exist_ok=True)
+
+    targets = []
+    for room in (index.rooms if rooms is None else rooms):
+        targets.append((f"Classroom_{room}", index.room_index.get(room.upper(), [])))
+    for name in (index.faculty if faculty is None else faculty):
+        targets.append((f"Faculty_{name}", index.faculty_index.get(index.resolve_faculty(name), [])))
+
+    written = []
+    try:
+        for name, positions in targets:
+            output_file = os.path.join(output_dir, f"{re.sub(r'[^A-Za-z0-9_-]+', '_', name)}.ics")
+            count = write_entity_calendar(output_file, name, index.sessions.iloc[positions],
+                                          start_date, end_date, holidays, tzid, utc_offset)
+            written.append(output_file)
+            print(f"Wrote {count} weekly events to {output_file}")
+    except Exception as e:
+        raise Exception(f"Error exporting calendars: {str(e)}")
+
+    return written
+
+
+def main():
+    input_file = "D:\\Classwise 24 25 Sem I.xlsm"
+    output_dir = "C:\\Users\\omkar\\Downloads\\timetable\\calendars"
+    holidays = ['2024-08-15', '2024-09-07', '2024-10-02']
+
+    try:
+        index = build_campus_index(input_file)
+        written = export_calendars(index, output_dir, '2024-07-22', '2024-11-15', holidays)
+        print(f"Exported {len(written)} calendars to {output_dir}")
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+
+if __name__ == "__main__":
+    main()
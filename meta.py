@@ -66,6 +66,67 @@ def extract_course_teacher_data(excel_path):
     result_df = pd.DataFrame(all_data)
     return result_df
 
+def read_sheet_meta(sheet, division=None):
+    """
+    Same records as extract_course_teacher_data, from one already loaded
+    openpyxl worksheet, so callers that load the workbook anyway (sharded
+    ingestion, validation) do not read the file a second time.
+
+    Args:
+        sheet (openpyxl.worksheet.worksheet.Worksheet): A division sheet
+        division (str): Division name, defaults to the sheet title
+
+    Returns:
+        list: One dict per (course, teacher)
+    """
+    records = []
+    # Columns A, B, D and F from row 34 on; rows with an empty column are dropped,
+    # then the first remaining row is the header
+    rows = [(row[0], row[1], row[3], row[5])
+            for row in sheet.iter_rows(min_row=34, max_col=6, values_only=True)
+            if len(row) >= 6 and all(value is not None and value != '' for value in (row[0], row[1], row[3], row[5]))]
+
+    for code, course, teachers_text, classroom in rows[1:]:
+        course_full = str(course).strip()
+        course_short_match = re.search(r'\(([^)]+)\)', course_full)
+        course_short = course_short_match.group(1) if course_short_match else ""
+        course_full = re.sub(r'\s*\([^)]*\)', '', course_full).strip()
+
+        teachers = [t.strip() for t in re.split(r',|\n', str(teachers_text)) if t.strip()]
+        for teacher in teachers:
+            teacher_short_match = re.search(r'\(([^)]+)\)', teacher)
+            records.append({
+                'Division': division or sheet.title,
+                'Teacher_Initials': teacher_short_match.group(1) if teacher_short_match else "",
+                'Course_Initials': course_short,
+                'Course_Code': str(code).strip(),
+                'Course_Name': course_full,
+                'Teacher_Name': re.sub(r'\s*\([^)]*\)', '', teacher).strip(),
+                'Classroom': str(classroom).strip()
+            })
+    return records
+
+def combine_divisions(meta_df, keys=None):
+    """
+    Merges records that differ only in their division, i.e. a course taught
+    jointly by the same teacher in the same classroom, into one row whose
+    Division lists every division ("A, B").
+
+    Args:
+        meta_df (pandas.DataFrame): Records of extract_course_teacher_data
+        keys (list): Columns identifying one row, default every column but
+            Division; leave out Classroom to merge across rooms
+
+    Returns:
+        pandas.DataFrame: The key columns and the combined Division
+    """
+    keys = keys or [column for column in meta_df.columns if column != 'Division']
+    if meta_df.empty:
+        return meta_df[keys + ['Division']]
+    return (meta_df.fillna('').groupby(keys, sort=False)['Division']
+            .agg(lambda divisions: ', '.join(sorted(set(map(str, divisions)))))
+            .reset_index())
+
 def main():
     # Path to your Excel file
     excel_path = "D:\\Classwise 24 25 Sem I.xlsm"
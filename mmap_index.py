@@ -0,0 +1,366 @@
+from bisect import bisect_left
+import mmap
+import numpy as np
+import glob
+import os
+import struct
+import time
+from campus_index import DAYS, TIME_SLOTS, build_campus_index, format_session
+from faculty_directory import normalize_initials
+from schedule_grid import ScheduleGrid
+
+MAGIC = b'TTIX'
+FORMAT_VERSION = 2
+KINDS = ['Theory', 'Practical']
+
+# Fixed-width session record; strings are IDs into the string pool
+SESSION_DTYPE = np.dtype([('source', '<u4'), ('sheet', '<u4'), ('division', '<u4'), ('cell', '<u4'),
+                          ('row', '<u2'), ('day', 'u1'), ('slot', 'u1'), ('span', 'u1'), ('kind', 'u1'),
+                          ('pad', '<u2')])
+
+# Section order in the file; each is a little-endian array aligned to 8 bytes
+SECTIONS = ['string_offsets', 'string_data', 'sessions',
+            'room_keys', 'room_offsets', 'room_positions',
+            'faculty_keys', 'faculty_offsets', 'faculty_positions',
+            'division_keys', 'division_offsets', 'division_positions',
+            'session_room_offsets', 'session_rooms',
+            'session_teacher_offsets', 'session_teachers',
+            'session_division_offsets', 'session_divisions',
+            'alias_keys', 'alias_targets']
+SECTION_DTYPES = {'string_data': np.dtype('u1'), 'sessions': SESSION_DTYPE}
+HEADER = struct.Struct('<4sII')
+SECTION_ENTRY = struct.Struct('<QQ')
+# Windows refuses to replace a file another process has open; the pointer
+# file is only open for a moment, so replacing it is retried
+REPLACE_RETRIES = 20
+REPLACE_WAIT_SECONDS = 0.05
+
+
+class _StringPool:
+    def __init__(self):
+        self.ids = {}
+        self.strings = []
+
+    def intern(self, text):
+        text = str(text)
+        string_id = self.ids.get(text)
+        if string_id is None:
+            string_id = self.ids[text] = len(self.strings)
+            self.strings.append(text)
+        return string_id
+
+
+def _csr(mapping, pool):
+    """Sorted keys (string IDs), offsets and concatenated positions of a key -> positions map."""
+    keys = sorted(mapping)
+    offsets = np.zeros(len(keys) + 1, dtype='<u4')
+    offsets[1:] = np.cumsum([len(mapping[key]) for key in keys])
+    positions = np.array([p for key in keys for p in mapping[key]], dtype='<u4')
+    return np.array([pool.intern(key) for key in keys], dtype='<u4'), offsets, positions
+
+
+def _versioned_file(output_file, version):
+    stem, extension = os.path.splitext(output_file)
+    return f"{stem}.{version}{extension}"
+
+
+def _replace(source, target):
+    for attempt in range(REPLACE_RETRIES):
+        try:
+            return os.replace(source, target)
+        except PermissionError:
+            if attempt == REPLACE_RETRIES - 1:
+                raise
+            time.sleep(REPLACE_WAIT_SECONDS)
+
+
+def resolve_index_file(index_file):
+    """Data file an index path stands for: itself, or the one its pointer file names."""
+    with open(index_file, 'rb') as handle:
+        head = handle.read(len(MAGIC))
+        if head == MAGIC:
+            return index_file
+        name = (head + handle.read()).decode('utf-8').strip()
+    return os.path.join(os.path.dirname(index_file), name)
+
+
+def write_mapped_index(index, output_file):
+    """
+    Serializes a CampusIndex into a flat file that processes can mmap.
+
+    Layout: a header, a table of (offset, length) per section, then the
+    sections: a UTF-8 string pool with its offsets, the fixed-width session
+    records, and for rooms, faculty and divisions a sorted key array with
+    CSR offsets into a positions array. Nothing needs decoding at open time.
+
+    The data goes to a new versioned file ("timetable.<version>.ttix") and
+    output_file becomes a small pointer to it, so a rewrite never touches a
+    file that workers have mapped (Windows cannot replace those). Older
+    versions are removed right after the pointer moves; on Windows a version
+    a worker still has mapped cannot be removed and is left for a later
+    write. On POSIX the removal can fall between a reader resolving the
+    pointer and opening the file, so MappedIndex then resolves it again.
+
+    Args:
+        index (CampusIndex): Parsed index
+        output_file (str): Path of the pointer file workers open
+
+    Returns:
+        str: Path of the new data file
+    """
+    pool = _StringPool()
+    sessions = index.sessions
+    records = np.zeros(len(sessions), dtype=SESSION_DTYPE)
+    records['source'] = [pool.intern(value) for value in sessions['Source']]
+    records['sheet'] = [pool.intern(value) for value in sessions['Sheet']]
+    # Display label of the session; a joint lecture lists all its divisions
+    records['division'] = [pool.intern(', '.join(value)) for value in sessions['Divisions']]
+    records['cell'] = [pool.intern(value) for value in sessions['Cell']]
+    records['row'] = sessions['Row'].to_numpy()
+    records['day'] = sessions['Day'].map(DAYS.index).to_numpy()
+    records['slot'] = sessions['Slot'].to_numpy()
+    records['span'] = sessions['Span'].to_numpy()
+    records['kind'] = sessions['Kind'].map(KINDS.index).to_numpy()
+
+    arrays = {'sessions': records}
+    for name, mapping in (('room', index.room_index), ('faculty', index.faculty_index),
+                          ('division', index.division_index)):
+        arrays[f'{name}_keys'], arrays[f'{name}_offsets'], arrays[f'{name}_positions'] = _csr(mapping, pool)
+
+    for name, column in (('room', 'Rooms'), ('teacher', 'Teachers'), ('division', 'Divisions')):
+        values = list(sessions[column])
+        offsets = np.zeros(len(values) + 1, dtype='<u4')
+        offsets[1:] = np.cumsum([len(items) for items in values])
+        arrays[f'session_{name}_offsets'] = offsets
+        arrays[f'session_{name}s'] = np.array([pool.intern(item) for items in values for item in items], dtype='<u4')
+
+    aliases = dict(index.directory.lookup) if index.directory is not None else {}
+    alias_keys = sorted(aliases)
+    arrays['alias_keys'] = np.array([pool.intern(alias) for alias in alias_keys], dtype='<u4')
+    arrays['alias_targets'] = np.array([pool.intern(aliases[alias]) for alias in alias_keys], dtype='<u4')
+
+    # The string pool is complete only after every other section interned its strings
+    encoded = [text.encode('utf-8') for text in pool.strings]
+    string_offsets = np.zeros(len(encoded) + 1, dtype='<u8')
+    string_offsets[1:] = np.cumsum([len(data) for data in encoded])
+    arrays['string_offsets'] = string_offsets
+    arrays['string_data'] = np.frombuffer(b''.join(encoded), dtype='u1')
+
+    table_size = HEADER.size + SECTION_ENTRY.size * len(SECTIONS)
+    offset = (table_size + 7) // 8 * 8
+    entries = []
+    for name in SECTIONS:
+        entries.append((offset, arrays[name].nbytes))
+        offset = (offset + arrays[name].nbytes + 7) // 8 * 8
+
+    data_file = _versioned_file(output_file, time.time_ns())
+    temp_file = f"{data_file}.tmp"
+    with open(temp_file, 'wb') as handle:
+        handle.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(SECTIONS)))
+        for entry in entries:
+            handle.write(SECTION_ENTRY.pack(*entry))
+        for name, (start, _) in zip(SECTIONS, entries):
+            handle.write(b'\0' * (start - handle.tell()))
+            handle.write(arrays[name].tobytes())
+    # A fresh name: no process can have it mapped yet
+    os.replace(temp_file, data_file)
+
+    # Readers that resolve the pointer from now on get the new version
+    pointer_temp = f"{output_file}.tmp"
+    with open(pointer_temp, 'w', encoding='utf-8') as handle:
+        handle.write(os.path.basename(data_file))
+    _replace(pointer_temp, output_file)
+
+    stem, extension = os.path.splitext(output_file)
+    for stale in glob.glob(f"{glob.escape(stem)}.*{glob.escape(extension)}"):
+        version = stale[len(stem) + 1:len(stale) - len(extension)]
+        if not version.isdigit() or os.path.abspath(stale) == os.path.abspath(data_file):
+            continue
+        try:
+            os.remove(stale)
+        except OSError:
+            # Still mapped by a worker (Windows); removed by a later write
+            pass
+    return data_file
+
+
+class _MappedSessionText:
+    """Session-position -> display text, for ScheduleGrid.render."""
+
+    def __init__(self, mapped):
+        self.mapped = mapped
+
+    def text(self, position):
+        record = self.mapped.sessions[position]
+        return format_session(self.mapped.string(record['cell']), self.mapped.string(record['division']))
+
+
+class MappedIndex:
+    """
+    Read-only view of a mapped index file.
+
+    Every array is a numpy view straight into the shared mapping, so any
+    number of processes opening the same file share its physical pages;
+    opening costs one mmap and no parsing.
+    """
+
+    def __init__(self, index_file):
+        self.index_file = index_file
+        self.data_file = resolve_index_file(index_file)
+        for attempt in range(REPLACE_RETRIES):
+            try:
+                with open(self.data_file, 'rb') as handle:
+                    self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+                break
+            except FileNotFoundError:
+                # A rewrite removed the version the pointer named a moment ago;
+                # the pointer already names its replacement
+                previous, self.data_file = self.data_file, resolve_index_file(index_file)
+                if self.data_file == previous or attempt == REPLACE_RETRIES - 1:
+                    raise
+
+        magic, version, count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION or count != len(SECTIONS):
+            self._map.close()
+            raise ValueError(f"Not a timetable index file (or unsupported version): {index_file}")
+
+        for number, name in enumerate(SECTIONS):
+            offset, length = SECTION_ENTRY.unpack_from(self._map, HEADER.size + SECTION_ENTRY.size * number)
+            dtype = SECTION_DTYPES.get(name, np.dtype('<u8') if name == 'string_offsets' else np.dtype('<u4'))
+            if length == 0:
+                setattr(self, name, np.zeros(0, dtype=dtype))
+                continue
+            setattr(self, name, np.frombuffer(self._map, dtype=dtype, count=length // dtype.itemsize, offset=offset))
+
+    def close(self):
+        # Views must go before the mapping can be closed
+        for name in SECTIONS:
+            setattr(self, name, None)
+        try:
+            self._map.close()
+        except BufferError:
+            # A caller still holds a view; the mapping is released with it
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def string(self, string_id):
+        start, end = self.string_offsets[string_id], self.string_offsets[string_id + 1]
+        return self.string_data[start:end].tobytes().decode('utf-8')
+
+    def _keys(self, kind):
+        keys = getattr(self, f'{kind}_keys')
+        return [self.string(string_id) for string_id in keys]
+
+    def _find(self, keys, key):
+        # Keys are stored sorted, so a lookup is a binary search over the pool
+        position = bisect_left(range(len(keys)), key, key=lambda i: self.string(keys[i]))
+        return position if position < len(keys) and self.string(keys[position]) == key else None
+
+    def positions(self, kind, key):
+        """Session positions of a 'room', 'faculty' or 'division' key (a view, no copy)."""
+        keys = getattr(self, f'{kind}_keys')
+        offsets = getattr(self, f'{kind}_offsets')
+        found = self._find(keys, key)
+        if found is None:
+            return getattr(self, f'{kind}_positions')[:0]
+        return getattr(self, f'{kind}_positions')[offsets[found]:offsets[found + 1]]
+
+    @property
+    def rooms(self):
+        return self._keys('room')
+
+    @property
+    def faculty(self):
+        return self._keys('faculty')
+
+    @property
+    def divisions(self):
+        return self._keys('division')
+
+    def resolve_faculty(self, faculty_name):
+        token = normalize_initials(faculty_name)
+        found = self._find(self.alias_keys, token)
+        return self.string(self.alias_targets[found]) if found is not None else token
+
+    def session(self, position):
+        """One session as a dict with the CampusIndex column names."""
+        record = self.sessions[position]
+        rooms = self.session_rooms[self.session_room_offsets[position]:self.session_room_offsets[position + 1]]
+        teachers = self.session_teachers[self.session_teacher_offsets[position]:self.session_teacher_offsets[position + 1]]
+        divisions = self.session_divisions[self.session_division_offsets[position]:self.session_division_offsets[position + 1]]
+        return {
+            'Source': self.string(record['source']),
+            'Sheet': self.string(record['sheet']),
+            'Division': self.string(divisions[0]),
+            'Day': DAYS[record['day']],
+            'Time_Slot': TIME_SLOTS[record['slot']],
+            'Slot': int(record['slot']),
+            'Span': int(record['span']),
+            'Row': int(record['row']),
+            'Kind': KINDS[record['kind']],
+            'Cell': self.string(record['cell']),
+            'Rooms': tuple(self.string(room) for room in rooms),
+            'Teachers': tuple(self.string(teacher) for teacher in teachers),
+            'Divisions': tuple(self.string(division) for division in divisions)
+        }
+
+    def _schedule(self, positions):
+        records = self.sessions[positions]
+        grid = ScheduleGrid.from_entries(records['day'], records['slot'], positions.astype(np.int32),
+                                         _MappedSessionText(self), (len(DAYS), len(TIME_SLOTS)))
+        return grid.render(DAYS, TIME_SLOTS)
+
+    def room_schedule(self, classroom):
+        return self._schedule(self.positions('room', classroom.strip().upper()))
+
+    def faculty_schedule(self, faculty_name):
+        return self._schedule(self.positions('faculty', self.resolve_faculty(faculty_name)))
+
+    def division_schedule(self, division):
+        return self._schedule(self.positions('division', division))
+
+
+def _render_room_reports(index_file, jobs, output_dir):
+    # Worker: maps the shared file instead of re-parsing the workbook
+    from report_pipeline import save_schedule_report
+
+    with MappedIndex(index_file) as mapped:
+        for room, file_name in jobs:
+            save_schedule_report(mapped.room_schedule(room), os.path.join(output_dir, file_name), 'Classroom', room)
+    return len(jobs)
+
+
+def main():
+    from concurrent.futures import ProcessPoolExecutor
+    from report_pipeline import report_file_name
+
+    input_file = "D:\\Classwise 24 25 Sem I.xlsm"
+    index_file = "C:\\Users\\omkar\\Downloads\\timetable\\timetable.ttix"
+    output_dir = "C:\\Users\\omkar\\Downloads\\timetable\\reports"
+    workers = 4
+
+    try:
+        data_file = write_mapped_index(build_campus_index(input_file), index_file)
+        print(f"Mapped index written to {data_file} ({os.path.getsize(data_file)} bytes)")
+
+        with MappedIndex(index_file) as mapped:
+            rooms = mapped.rooms
+        os.makedirs(output_dir, exist_ok=True)
+        # File names are picked up front, so no two workers write the same file
+        file_names = {}
+        jobs = [(room, report_file_name('Classroom', room, file_names)) for room in rooms]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            done = sum(executor.map(_render_room_reports, [index_file] * workers,
+                                    [jobs[worker::workers] for worker in range(workers)], [output_dir] * workers))
+        print(f"{workers} workers rendered {done} room reports from the shared index")
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+
+if __name__ == "__main__":
+    main()
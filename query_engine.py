@@ -0,0 +1,203 @@
+from collections import namedtuple
+from threading import Lock
+from types import MappingProxyType
+import time
+from campus_index import DAYS, TIME_SLOTS, build_campus_index, format_session
+from faculty_directory import normalize_initials
+
+# One parsed session; every field is immutable
+Session = namedtuple('Session', ['source', 'sheet', 'divisions', 'day', 'time_slot', 'slot',
+                                 'span', 'kind', 'cell', 'rooms', 'faculty'])
+
+
+class UnknownEntityError(KeyError):
+    """A room, faculty member or division that is not in the snapshot."""
+
+
+class SnapshotLoadError(Exception):
+    """Workbooks could not be read into a snapshot."""
+
+
+def _freeze_index(index):
+    return MappingProxyType({key: tuple(positions) for key, positions in index.items()})
+
+
+class Snapshot:
+    """
+    Immutable parsed state of the timetables.
+
+    Sessions are a tuple of namedtuples and every lookup table is a
+    read-only mapping to tuples of positions, so a snapshot can be shared
+    by any number of threads without locking. A new timetable means a new
+    snapshot, never an update of this one.
+    """
+
+    __slots__ = ('sessions', 'rooms', 'faculty', 'divisions', 'directory', 'created')
+
+    def __init__(self, sessions, rooms, faculty, divisions, directory=None):
+        object.__setattr__(self, 'sessions', tuple(sessions))
+        object.__setattr__(self, 'rooms', _freeze_index(rooms))
+        object.__setattr__(self, 'faculty', _freeze_index(faculty))
+        object.__setattr__(self, 'divisions', _freeze_index(divisions))
+        object.__setattr__(self, 'directory', directory)
+        object.__setattr__(self, 'created', time.time())
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Snapshot is immutable")
+
+    @classmethod
+    def from_index(cls, index):
+        """Builds a snapshot from a CampusIndex; the index is not kept."""
+        sessions = []
+        faculty_keys = {}
+        for position, row in enumerate(index.sessions.itertuples(index=False)):
+            faculty = tuple(index.resolve_teachers(row.Teachers))
+            sessions.append(Session(row.Source, row.Sheet, tuple(row.Divisions), row.Day, row.Time_Slot,
+                                    int(row.Slot), int(row.Span), row.Kind, row.Cell,
+                                    tuple(row.Rooms), faculty))
+            for initials in faculty:
+                faculty_keys.setdefault(initials, []).append(position)
+
+        return cls(sessions, index.room_index, faculty_keys, index.division_index, index.directory)
+
+    @classmethod
+    def from_workbooks(cls, sources, directory=None, max_workers=1):
+        """
+        Reads workbooks into a snapshot without printing anything.
+
+        Raises:
+            FileNotFoundError: No workbook matches the sources
+            SnapshotLoadError: A workbook could not be parsed
+        """
+        try:
+            index = build_campus_index(sources, max_workers=max_workers, directory=directory, verbose=False)
+        except (FileNotFoundError, ValueError):
+            raise
+        except Exception as e:
+            raise SnapshotLoadError(str(e)) from e
+        return cls.from_index(index)
+
+
+class QueryEngine:
+    """
+    Concurrent room, faculty and division queries over a Snapshot.
+
+    A query reads the current snapshot reference once and works only on
+    that snapshot, so the read path takes no lock and a query never sees
+    half of an old and half of a new timetable. Loading a new snapshot
+    happens off to the side; swapping it in is a single reference
+    assignment. Queries never print or write files, and return new plain
+    Python objects the caller may modify freely.
+    """
+
+    def __init__(self, snapshot=None):
+        self._snapshot = snapshot
+        # Serializes writers only; readers never touch it
+        self._load_lock = Lock()
+
+    @property
+    def snapshot(self):
+        snapshot = self._snapshot
+        if snapshot is None:
+            raise LookupError("No timetable snapshot loaded")
+        return snapshot
+
+    def swap(self, snapshot):
+        """Atomically replaces the snapshot and returns the previous one."""
+        if not isinstance(snapshot, Snapshot):
+            raise TypeError("swap expects a Snapshot")
+        with self._load_lock:
+            previous, self._snapshot = self._snapshot, snapshot
+        return previous
+
+    def reload(self, sources, directory=None, max_workers=1):
+        """Parses the workbooks into a new snapshot and swaps it in."""
+        return self.swap(Snapshot.from_workbooks(sources, directory, max_workers))
+
+    def rooms(self):
+        return sorted(self.snapshot.rooms)
+
+    def faculty(self):
+        return sorted(self.snapshot.faculty)
+
+    def divisions(self):
+        return sorted(self.snapshot.divisions)
+
+    def _sessions(self, snapshot, table, key, kind):
+        positions = table.get(key)
+        if positions is None:
+            raise UnknownEntityError(f"Unknown {kind}: {key}")
+        return [snapshot.sessions[position] for position in positions]
+
+    def _faculty_key(self, snapshot, faculty_name):
+        if snapshot.directory is not None:
+            return snapshot.directory.resolve(faculty_name) or normalize_initials(faculty_name)
+        return normalize_initials(faculty_name)
+
+    def room_sessions(self, classroom, day=None):
+        snapshot = self.snapshot
+        sessions = self._sessions(snapshot, snapshot.rooms, str(classroom).strip().upper(), 'room')
+        return _filter_day(sessions, day)
+
+    def faculty_sessions(self, faculty_name, day=None):
+        snapshot = self.snapshot
+        key = self._faculty_key(snapshot, faculty_name)
+        return _filter_day(self._sessions(snapshot, snapshot.faculty, key, 'faculty'), day)
+
+    def division_sessions(self, division, day=None):
+        snapshot = self.snapshot
+        return _filter_day(self._sessions(snapshot, snapshot.divisions, division, 'division'), day)
+
+    def room_schedule(self, classroom):
+        """Days x time slots grid of one room, as nested dicts of formatted cells."""
+        return schedule_grid(self.room_sessions(classroom))
+
+    def faculty_schedule(self, faculty_name):
+        """Days x time slots grid of one faculty member."""
+        return schedule_grid(self.faculty_sessions(faculty_name))
+
+    def division_schedule(self, division):
+        """Days x time slots grid of one namespaced division, e.g. 'CSE/A'."""
+        return schedule_grid(self.division_sessions(division))
+
+
+def _filter_day(sessions, day):
+    if day is None:
+        return sessions
+    day = str(day).strip().upper()
+    if day not in DAYS:
+        raise ValueError(f"Unknown day: {day}")
+    return [session for session in sessions if session.day == day]
+
+
+def schedule_grid(sessions):
+    """
+    Stacks sessions into {day: {time slot: [formatted cells]}}.
+
+    Every day and time slot is present, so the grid renders the same way
+    as the DataFrame schedules.
+    """
+    grid = {day: {time_slot: [] for time_slot in TIME_SLOTS} for day in DAYS}
+    for session in sessions:
+        grid[session.day][session.time_slot].append(format_session(session.cell, ', '.join(session.divisions)))
+    return grid
+
+
+def main():
+    from concurrent.futures import ThreadPoolExecutor
+
+    input_file = "D:\\Classwise 24 25 Sem I.xlsm"
+
+    try:
+        engine = QueryEngine(Snapshot.from_workbooks(input_file))
+
+        # Many threads query the same snapshot, no locks on the read path
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            schedules = list(executor.map(engine.room_schedule, engine.rooms()))
+        print(f"Queried {len(schedules)} room schedules from {len(engine.divisions())} divisions")
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# Fast-start room, faculty and division lookups:
+#     python quick_query.py room H203 today
+#     python quick_query.py faculty PVS MON
+#     python quick_query.py division CSE/A --xlsx CSE_A.xlsx
+# Only the standard library is imported up front; pandas and openpyxl are
+# imported when the workbooks changed and must be re-parsed, or for .xlsx output.
+import datetime
+import json
+import os
+import re
+import sys
+from campus_common import format_session, source_stamps
+
+INDEX_VERSION = 2
+DEFAULT_INDEX = 'timetable_index.json'
+SEPARATORS = re.compile(r'[\s.]+')
+
+
+def write_compact_index(index, sources, index_file):
+    """
+    Writes a CampusIndex as a compact JSON index file.
+
+    Sessions are stored once as [divisions, day, slot, span, cell] rows,
+    a joint lecture with its divisions joined ("CSE/A, CSE/B"); rooms,
+    faculty and divisions map to lists of row positions.
+
+    Args:
+        index (CampusIndex): Parsed index
+        sources (str or list): The workbook sources it was built from
+        index_file (str): Path of the index file
+    """
+    from campus_index import DAYS, TIME_SLOTS
+
+    sessions = index.sessions
+    rows = [[', '.join(divisions), day, int(slot), int(span), cell] for divisions, day, slot, span, cell
+            in zip(sessions['Divisions'], sessions['Day'], sessions['Slot'], sessions['Span'], sessions['Cell'])]
+
+    aliases = dict(index.directory.lookup) if index.directory is not None else {}
+
+    payload = {
+        'version': INDEX_VERSION,
+        'sources': source_stamps(sources),
+        'days': DAYS,
+        'time_slots': TIME_SLOTS,
+        'sessions': rows,
+        'rooms': index.room_index,
+        'faculty': index.faculty_index,
+        'divisions': index.division_index,
+        'aliases': aliases
+    }
+    # Written next to the final file and renamed, so readers never see half an index
+    temp_file = f"{index_file}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as handle:
+        json.dump(payload, handle, separators=(',', ':'))
+    os.replace(temp_file, index_file)
+
+
+def load_compact_index(index_file, sources=None):
+    """
+    Reads an index file, or returns None when it is missing or stale.
+
+    Args:
+        index_file (str): Path of the index file
+        sources (str or list): When given, the index is only used if it was
+            built from exactly these workbooks, unchanged since
+
+    Returns:
+        dict: The index, or None
+    """
+    try:
+        with open(index_file, encoding='utf-8') as handle:
+            index = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    if index.get('version') != INDEX_VERSION:
+        return None
+    if sources is not None:
+        try:
+            if source_stamps(sources) != index['sources']:
+                return None
+        except OSError:
+            # A workbook is gone, rebuilding reports it
+            return None
+    return index
+
+
+def build_index_file(sources, index_file):
+    """Re-parses the workbooks (imports the Excel stack) and rewrites the index file."""
+    from campus_index import build_campus_index
+
+    campus = build_campus_index(sources, verbose=False)
+    write_compact_index(campus, sources, index_file)
+    return load_compact_index(index_file)
+
+
+def open_index(sources, index_file=DEFAULT_INDEX):
+    """Index from the file when it is current, otherwise rebuilt from the workbooks."""
+    index = load_compact_index(index_file, sources)
+    if index is None:
+        index = build_index_file(sources, index_file)
+    return index
+
+
+def lookup_key(index, kind, name):
+    """Index key for a typed room code, faculty name/alias or division."""
+    if kind == 'room':
+        return name.strip().upper()
+    if kind == 'faculty':
+        token = SEPARATORS.sub('', name).upper()
+        return index['aliases'].get(token, token)
+    return name.strip()
+
+
+def query(index, kind, name, day=None):
+    """
+    Sessions of one room, faculty member or division.
+
+    Args:
+        index (dict): Output of open_index
+        kind (str): 'room', 'faculty' or 'division'
+        name (str): Room code, faculty initials/alias or division name
+        day (str): Optional day ('MON'...), or 'today'
+
+    Returns:
+        list: (day, time slot, span, division, cell) tuples in time order
+    """
+    tables = {'room': 'rooms', 'faculty': 'faculty', 'division': 'divisions'}
+    if kind not in tables:
+        raise ValueError(f"Unknown query kind: {kind}")
+    if day is not None:
+        day = day.strip().upper()
+        if day == 'TODAY':
+            weekday = datetime.date.today().weekday()
+            # Sunday has no timetable
+            day = index['days'][weekday] if weekday < len(index['days']) else ''
+        elif day not in index['days']:
+            raise ValueError(f"Unknown day: {day}")
+
+    positions = index[tables[kind]].get(lookup_key(index, kind, name), [])
+    found = []
+    for position in positions:
+        division, session_day, slot, span, cell = index['sessions'][position]
+        if day is None or session_day == day:
+            found.append((session_day, index['time_slots'][slot], span, division, cell))
+    found.sort(key=lambda item: (index['days'].index(item[0]), index['time_slots'].index(item[1])))
+    return found
+
+
+def render_xlsx(index, kind, name, output_file):
+    """Saves the full weekly schedule as a formatted workbook (imports pandas/openpyxl)."""
+    import pandas as pd
+    from report_pipeline import save_schedule_report
+
+    schedule = pd.DataFrame('', index=index['days'], columns=index['time_slots'])
+    for day, time_slot, _, division, cell in query(index, kind, name):
+        content = format_session(cell, division)
+        existing = schedule.at[day, time_slot]
+        schedule.at[day, time_slot] = f"{existing}\n---\n{content}" if existing else content
+    report_kind = {'room': 'Classroom', 'faculty': 'Faculty', 'division': 'Division'}[kind]
+    return save_schedule_report(schedule, output_file, report_kind, name)
+
+
+def main():
+    input_sources = os.environ.get('TIMETABLE_SOURCES', "D:\\Classwise 24 25 Sem I.xlsm")
+    index_file = os.environ.get('TIMETABLE_INDEX', DEFAULT_INDEX)
+
+    args = sys.argv[1:]
+    output_file = None
+    if '--xlsx' in args:
+        position = args.index('--xlsx')
+        output_file = args[position + 1] if position + 1 < len(args) else None
+        del args[position:position + 2]
+    if len(args) < 2:
+        print("Usage: quick_query.py room|faculty|division NAME [DAY|today] [--xlsx FILE]")
+        return
+
+    try:
+        index = open_index(input_sources, index_file)
+        kind, name, day = args[0], args[1], args[2] if len(args) > 2 else None
+
+        sessions = query(index, kind, name, day)
+        if not sessions:
+            print(f"No sessions for {kind} {name}")
+        for session_day, time_slot, span, division, cell in sessions:
+            print(f"{session_day} {time_slot:<15} {division:<12} {' '.join(cell.split())}")
+
+        if output_file:
+            render_xlsx(index, kind, name, output_file)
+            print(f"Schedule saved to {output_file}")
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+
+if __name__ == "__main__":
+    main()
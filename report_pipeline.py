@@ -0,0 +1,199 @@
+import asyncio
+import pandas as pd
+from openpyxl import load_workbook
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+import os
+import re
+from campus_index import (CampusIndex, SESSION_COLUMNS, resolve_workbooks,
+                          source_label, read_sheet_grid, parse_sheet_grid)
+from cell_grammar import get_room_registry, set_room_registry
+from time2 import TimetableGenerator
+from workbook_lint import validate_workbooks
+
+
+# One generator per process, so its meta tables are read once for every report
+REPORT_GENERATOR = TimetableGenerator()
+
+
+def save_schedule_report(schedule_df, output_file, kind, name):
+    """
+    Saves one schedule with the same formatting and metadata section as
+    time2's reports (TimetableGenerator.save_classroom_schedule).
+
+    Args:
+        schedule_df (pandas.DataFrame): Days x time slots schedule
+        output_file (str): Path of the report
+        kind (str): 'Classroom', 'Faculty' or 'Division'
+        name (str): Room code, faculty initials or division
+
+    Returns:
+        str: The output file
+    """
+    REPORT_GENERATOR.save_classroom_schedule(schedule_df, output_file, name, kind=kind)
+    return output_file
+
+
+def report_file_name(kind, name, taken=None):
+    """
+    File name of one report, e.g. Classroom_H203.xlsx or Division_CSE_A.xlsx.
+
+    Args:
+        kind (str): Report kind, the file name prefix
+        name (str): Report name
+        taken (dict): File names already used in this run; a different
+            report whose name maps to a used file (or one differing only in
+            case, as on Windows) gets a numbered suffix instead of
+            overwriting it ("Division_CSE_A_2.xlsx")
+
+    Returns:
+        str: File name
+    """
+    stem = f"{kind}_{re.sub(r'[^A-Za-z0-9_-]+', '_', str(name)).strip('_')}"
+    file_name = f"{stem}.xlsx"
+    if taken is not None:
+        number = 1
+        while taken.setdefault(file_name.lower(), (kind, name)) != (kind, name):
+            number += 1
+            file_name = f"{stem}_{number}.xlsx"
+    return file_name
+
+
+async def run_report_pipeline(sources, output_dir, rooms=None, faculty=None, divisions=True,
+                              directory=None, parse_workers=2, render_workers=2,
+                              queue_size=8, use_processes=True):
+    """
+    Generates schedule reports with reading, parsing and rendering overlapped.
+
+    A reader thread loads workbooks and hands raw sheet grids to parser
+    workers through a bounded queue; parsed sessions go to render workers
+    that save a report as soon as its data is complete. A division report
+    is complete once its own sheet is parsed, so the first files land while
+    later sheets are still being read. Room and faculty reports need every
+    sheet and are queued once parsing finishes.
+
+    Args:
+        sources (str or list): Workbook paths, directories or glob patterns
+        output_dir (str): Directory for the report files
+        rooms (list): Rooms to report, None for every room found
+        faculty (list): Faculty initials to report, None for all found
+        divisions (bool): Also write one report per division
+        directory (FacultyDirectory): Alias table for faculty matching
+        parse_workers (int): Parallel parser workers
+        render_workers (int): Parallel render workers
+        queue_size (int): Bound of both queues, limits memory held in flight
+        use_processes (bool): Parse and render in processes instead of threads
+
+    Returns:
+        list: Paths of the saved reports, in the order they were saved
+    """
+    paths = resolve_workbooks(sources)
+    os.makedirs(output_dir, exist_ok=True)
+    loop = asyncio.get_running_loop()
+    if use_processes:
+        # Parser processes use the same room registry as this process
+        parse_pool_class = partial(ProcessPoolExecutor, initializer=set_room_registry,
+                                   initargs=(get_room_registry(),))
+        render_pool_class = ProcessPoolExecutor
+    else:
+        parse_pool_class = render_pool_class = ThreadPoolExecutor
+
+    grids = asyncio.Queue(maxsize=queue_size)
+    renders = asyncio.Queue(maxsize=queue_size)
+    parsed = {}
+    saved = []
+    file_names = {}
+
+    with ThreadPoolExecutor(max_workers=1) as read_pool, \
+            parse_pool_class(max_workers=parse_workers) as parse_pool, \
+            render_pool_class(max_workers=render_workers) as render_pool:
+
+        async def read_sheets():
+            sequence = 0
+            for path in paths:
+                # openpyxl objects stay on the single reader thread
+                workbook = await loop.run_in_executor(read_pool, partial(load_workbook, path, data_only=True))
+                try:
+                    for sheet in workbook.worksheets:
+                        grid = await loop.run_in_executor(read_pool, read_sheet_grid, sheet)
+                        await grids.put((sequence, source_label(path), grid))
+                        sequence += 1
+                finally:
+                    workbook.close()
+            for _ in range(parse_workers):
+                await grids.put(None)
+
+        async def parse_sheets():
+            while (item := await grids.get()) is not None:
+                sequence, source, grid = item
+                records = await loop.run_in_executor(parse_pool, parse_sheet_grid, grid, source)
+                parsed[sequence] = records
+                if divisions and records:
+                    division = records[0]['Division']
+                    sheet_index = CampusIndex(pd.DataFrame(records, columns=SESSION_COLUMNS), directory)
+                    await renders.put(('Division', division, sheet_index.division_schedule(division)))
+
+        async def queue_campus_reports(parsers):
+            await asyncio.gather(*parsers)
+            records = [record for sequence in sorted(parsed) for record in parsed[sequence]]
+            index = CampusIndex(pd.DataFrame(records, columns=SESSION_COLUMNS), directory)
+            for room in (index.rooms if rooms is None else rooms):
+                await renders.put(('Classroom', room, index.room_schedule(room)))
+            for initials in (index.faculty if faculty is None else faculty):
+                await renders.put(('Faculty', initials, index.faculty_schedule(initials)))
+            for _ in range(render_workers):
+                await renders.put(None)
+
+        async def render_reports():
+            while (job := await renders.get()) is not None:
+                kind, name, schedule = job
+                output_file = os.path.join(output_dir, report_file_name(kind, name, file_names))
+                await loop.run_in_executor(render_pool, save_schedule_report, schedule, output_file, kind, name)
+                saved.append(output_file)
+                print(f"Saved {output_file}")
+
+        parsers = [asyncio.ensure_future(parse_sheets()) for _ in range(parse_workers)]
+        tasks = [asyncio.ensure_future(read_sheets()),
+                 asyncio.ensure_future(queue_campus_reports(parsers)),
+                 *[asyncio.ensure_future(render_reports()) for _ in range(render_workers)]]
+        try:
+            await asyncio.gather(*tasks)
+        except Exception as e:
+            # A failed stage would leave the others waiting on their queues
+            for task in tasks + parsers:
+                task.cancel()
+            raise Exception(f"Error generating reports: {str(e)}")
+
+    return saved
+
+
+def generate_reports(sources, output_dir, validate=False, **options):
+    """
+    Synchronous entry point for run_report_pipeline.
+
+    With validate=True the workbooks are linted first and no report is
+    written while any Error-level issue remains.
+    """
+    if validate:
+        issues = validate_workbooks(sources, options.get('directory'))
+        errors = issues[issues['Severity'] == 'Error']
+        if not errors.empty:
+            first = errors.iloc[0]
+            raise ValueError(f"{len(errors)} validation errors, first: "
+                             f"{first['Sheet']}!{first['Cell']} {first['Reason']}")
+    return asyncio.run(run_report_pipeline(sources, output_dir, **options))
+
+
+def main():
+    input_sources = "D:\\Classwise 24 25 Sem I.xlsm"
+    output_dir = "C:\\Users\\omkar\\Downloads\\timetable\\reports"
+
+    try:
+        saved = generate_reports(input_sources, output_dir, validate=True, rooms=None, faculty=None)
+        print(f"Generated {len(saved)} reports in {output_dir}")
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+
+if __name__ == "__main__":
+    main()
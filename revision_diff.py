@@ -0,0 +1,169 @@
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+import re
+from campus_index import TIME_SLOTS, SESSION_COLUMNS, resolve_workbooks, read_workbook_sessions
+from cell_grammar import get_room_registry, set_room_registry
+from faculty_directory import cell_faculty_tokens
+
+WHITESPACE = re.compile(r'\s+')
+CHANGE_COLUMNS = ['Entity_Type', 'Entity', 'Change', 'Division', 'Session', 'Old_Slot', 'New_Slot']
+
+
+def load_revision_sessions(old_sources, new_sources, max_workers=None):
+    """
+    Reads the sessions of both revisions, every workbook in parallel.
+
+    When each revision is a single workbook the file-name namespace is
+    dropped from division names, so "Sem I v3/A" and "Sem I v4/A" compare
+    as the same division.
+
+    Returns:
+        tuple: (old sessions DataFrame, new sessions DataFrame)
+    """
+    old_paths, new_paths = resolve_workbooks(old_sources), resolve_workbooks(new_sources)
+    if not old_paths or not new_paths:
+        raise FileNotFoundError("Both revisions need at least one workbook")
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=set_room_registry,
+                             initargs=(get_room_registry(),)) as executor:
+        results = list(executor.map(read_workbook_sessions, old_paths + new_paths))
+
+    old = pd.DataFrame([r for result in results[:len(old_paths)] for r in result], columns=SESSION_COLUMNS)
+    new = pd.DataFrame([r for result in results[len(old_paths):] for r in result], columns=SESSION_COLUMNS)
+    if len(old_paths) == 1 and len(new_paths) == 1:
+        for sessions in (old, new):
+            sessions['Division'] = sessions['Division'].str.split('/', n=1).str[-1]
+    return old, new
+
+
+def normalize_sessions(sessions, directory=None):
+    """
+    Reduces sessions to the fields that matter for a schedule comparison.
+
+    Cell text is upper-cased with whitespace collapsed, so re-typed or
+    re-wrapped cells do not show up as changes.
+    """
+    normalized = sessions[['Division', 'Day', 'Slot', 'Span', 'Rooms']].copy()
+    normalized['Session'] = sessions['Cell'].map(lambda cell: WHITESPACE.sub(' ', cell.upper()).strip())
+    resolve = directory.resolve_tokens if directory is not None else cell_faculty_tokens
+    normalized['Faculty'] = sessions['Teachers'].map(resolve)
+    # Tuples, so no division, room or cell text can break the key apart
+    normalized['Key'] = list(zip(normalized['Division'], normalized['Day'], normalized['Slot'].astype(int),
+                                 normalized['Span'].astype(int), normalized['Session']))
+    return normalized
+
+
+def entity_keys(normalized):
+    """Session keys grouped by entity: {(entity type, entity): set of keys}."""
+    keys = {}
+    for entity_type, column in (('Room', 'Rooms'), ('Faculty', 'Faculty'), ('Division', 'Division')):
+        exploded = normalized[[column, 'Key']].explode(column).dropna(subset=[column])
+        for entity, group in exploded.groupby(column, sort=False):
+            keys[(entity_type, entity)] = set(group['Key'])
+    return keys
+
+
+def _slot_label(day, slot):
+    return f"{day} {TIME_SLOTS[int(slot)]}"
+
+
+def diff_entity(entity_type, entity, old_keys, new_keys):
+    """
+    Slot-level changes of one entity.
+
+    A session that disappears from one slot and appears in another for the
+    same division is reported once as a move.
+    """
+    removed = sorted(old_keys - new_keys)
+    added = sorted(new_keys - old_keys)
+
+    # Pair removals and additions of the same division and session as moves
+    waiting = {}
+    for division, day, slot, span, session in added:
+        waiting.setdefault((division, session), []).append((day, slot))
+
+    changes = []
+    for division, day, slot, span, session in removed:
+        targets = waiting.get((division, session))
+        if targets:
+            new_day, new_slot = targets.pop(0)
+            changes.append([entity_type, entity, 'Moved', division, session,
+                            _slot_label(day, slot), _slot_label(new_day, new_slot)])
+        else:
+            changes.append([entity_type, entity, 'Removed', division, session, _slot_label(day, slot), ''])
+
+    for (division, session), targets in waiting.items():
+        for day, slot in targets:
+            changes.append([entity_type, entity, 'Added', division, session, '', _slot_label(day, slot)])
+    return changes
+
+
+def diff_revisions(old_sessions, new_sessions, directory=None):
+    """
+    Compares two revisions and reports only the entities that changed.
+
+    Each room, faculty member and division gets the set of its normalized
+    sessions; only entities whose sets differ are diffed slot by slot.
+
+    Args:
+        old_sessions (pandas.DataFrame): Sessions of the previous workbook
+        new_sessions (pandas.DataFrame): Sessions of the revised workbook
+        directory (FacultyDirectory): Alias table for faculty matching
+
+    Returns:
+        pandas.DataFrame: One row per added, removed or moved session
+    """
+    old_keys = entity_keys(normalize_sessions(old_sessions, directory))
+    new_keys = entity_keys(normalize_sessions(new_sessions, directory))
+
+    changes = []
+    for entity in sorted(set(old_keys) | set(new_keys)):
+        before, after = old_keys.get(entity, set()), new_keys.get(entity, set())
+        if before == after:
+            continue
+        changes.extend(diff_entity(*entity, before, after))
+
+    return pd.DataFrame(changes, columns=CHANGE_COLUMNS)
+
+
+def save_revision_diff(changes, output_file):
+    """Saves the affected entities summary and the slot-level changes."""
+    try:
+        affected = (changes.groupby(['Entity_Type', 'Entity', 'Change']).size()
+                    .unstack(fill_value=0).reset_index())
+        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+            affected.to_excel(writer, sheet_name='Affected', index=False)
+            changes.to_excel(writer, sheet_name='Changes', index=False)
+            for worksheet in writer.sheets.values():
+                worksheet.auto_filter.ref = worksheet.dimensions
+                for column in worksheet.columns:
+                    worksheet.column_dimensions[column[0].column_letter].width = 20
+
+    except Exception as e:
+        raise Exception(f"Error saving revision diff: {str(e)}")
+
+
+def main():
+    old_file = "D:\\Classwise 24 25 Sem I.xlsm"
+    new_file = "D:\\Classwise 24 25 Sem I rev2.xlsm"
+    output_file = "C:\\Users\\omkar\\Downloads\\timetable\\Revision_Diff.xlsx"
+
+    try:
+        old_sessions, new_sessions = load_revision_sessions(old_file, new_file)
+        changes = diff_revisions(old_sessions, new_sessions)
+        if changes.empty:
+            print("No schedule changes between the two revisions")
+            return
+
+        for entity_type in ('Room', 'Faculty', 'Division'):
+            affected = changes.loc[changes['Entity_Type'] == entity_type, 'Entity'].unique()
+            print(f"{entity_type} schedules changed: {', '.join(map(str, affected)) or 'none'}")
+
+        save_revision_diff(changes, output_file)
+        print(f"Revision diff saved to {output_file}")
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import numpy as np
+import pandas as pd
+from openpyxl.formatting.rule import ColorScaleRule
+from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.utils import get_column_letter
+from campus_index import build_campus_index, DAYS, TIME_SLOTS, BREAK_SLOTS
+from cell_grammar import get_room_registry
+
+# Break columns are never bookable, so they are left out of every ratio
+TEACHING_SLOTS = [slot for slot in TIME_SLOTS if slot not in BREAK_SLOTS]
+TEACHING_MASK = np.array([slot not in BREAK_SLOTS for slot in TIME_SLOTS])
+
+
+def build_occupancy_tensor(sessions, extra_rooms=()):
+    """
+    Builds a rooms x days x slots occupancy tensor from the session table.
+
+    Sessions that span merged columns (practicals) mark every slot they cover.
+
+    Args:
+        sessions (pandas.DataFrame): Session table of a CampusIndex
+        extra_rooms (list): Rooms that exist but are not used in the workbook,
+            they get an all-free row
+
+    Returns:
+        tuple: (list of room codes, bool array of shape rooms x days x slots)
+    """
+    booked = sessions[['Day', 'Slot', 'Span', 'Rooms']].explode('Rooms').dropna(subset=['Rooms'])
+    rooms = sorted(set(booked['Rooms']) | {str(room).strip().upper() for room in extra_rooms})
+    occupancy = np.zeros((len(rooms), len(DAYS), len(TIME_SLOTS)), dtype=bool)
+    if booked.empty:
+        return rooms, occupancy
+
+    room_idx = pd.Categorical(booked['Rooms'], categories=rooms).codes
+    day_idx = pd.Categorical(booked['Day'], categories=DAYS).codes
+    slot_idx = booked['Slot'].to_numpy()
+    span = booked['Span'].to_numpy()
+
+    # One scatter per covered column offset instead of one per session
+    for offset in range(int(span.max())):
+        covers = (span > offset) & (slot_idx + offset < len(TIME_SLOTS))
+        occupancy[room_idx[covers], day_idx[covers], slot_idx[covers] + offset] = True
+
+    return rooms, occupancy
+
+
+def longest_idle_stretch(occupancy):
+    """
+    Longest run of consecutive free teaching slots within a day, per room.
+
+    Args:
+        occupancy (numpy.ndarray): Bool tensor of shape rooms x days x slots
+
+    Returns:
+        numpy.ndarray: Run length (in teaching slots) per room
+    """
+    busy = occupancy[:, :, TEACHING_MASK]
+    positions = np.arange(busy.shape[2])
+    # Position of the most recent busy slot (or -1) at every slot of every day
+    last_busy = np.maximum.accumulate(np.where(busy, positions, -1), axis=2)
+    idle_run = positions - last_busy
+    return idle_run.max(axis=(1, 2)) if busy.size else np.zeros(len(occupancy), dtype=int)
+
+
+def compute_room_utilisation(sessions, extra_rooms=()):
+    """
+    Computes utilisation statistics for every room at once.
+
+    Args:
+        sessions (pandas.DataFrame): Session table of a CampusIndex
+        extra_rooms (list): Rooms that exist but are not used in the workbook,
+            e.g. the listed rooms of the room registry; they show 0% occupancy
+
+    Returns:
+        dict: 'summary' (per room), 'heatmap' (room x slot %), 'slot_load'
+            (rooms in use per day and slot) DataFrames
+    """
+    rooms, occupancy = build_occupancy_tensor(sessions, extra_rooms)
+    teaching = occupancy[:, :, TEACHING_MASK].astype(np.float64)
+
+    summary = pd.DataFrame({'Room': rooms})
+    summary['Busy_Slots'] = teaching.sum(axis=(1, 2)).astype(int)
+    summary['Occupancy_%'] = np.round(teaching.mean(axis=(1, 2)) * 100, 1)
+
+    per_day = teaching.mean(axis=2) * 100
+    for day_idx, day in enumerate(DAYS):
+        summary[f'{day}_%'] = np.round(per_day[:, day_idx], 1)
+
+    per_slot = teaching.mean(axis=1) * 100
+    peak_slot = per_slot.argmax(axis=1)
+    # A room that is never booked has no peak
+    summary['Peak_Slot'] = [TEACHING_SLOTS[idx] if busy else ''
+                            for idx, busy in zip(peak_slot, summary['Busy_Slots'])]
+    summary['Peak_Slot_%'] = np.round(per_slot[np.arange(len(rooms)), peak_slot], 1)
+    summary['Longest_Idle_Slots'] = longest_idle_stretch(occupancy).astype(int)
+    summary = summary.sort_values('Occupancy_%', kind='stable').reset_index(drop=True)
+
+    heatmap = pd.DataFrame(np.round(per_slot, 1), index=rooms, columns=TEACHING_SLOTS)
+
+    # Campus-wide load: how many rooms are in use at each day and slot
+    slot_load = pd.DataFrame(teaching.sum(axis=0).astype(int), index=DAYS, columns=TEACHING_SLOTS)
+
+    return {'summary': summary, 'heatmap': heatmap, 'slot_load': slot_load}
+
+
+def _style_header(worksheet):
+    # Highlight headers (first row and first column)
+    for cell in worksheet[1]:
+        cell.font = Font(bold=True)
+        cell.fill = PatternFill(start_color="E0E0E0", end_color="E0E0E0", fill_type="solid")
+        cell.alignment = Alignment(wrap_text=True, horizontal='center', vertical='center')
+    for cell in worksheet['A']:
+        cell.font = Font(bold=True)
+    worksheet.column_dimensions['A'].width = 12
+    for col_idx in range(2, worksheet.max_column + 1):
+        worksheet.column_dimensions[get_column_letter(col_idx)].width = 14
+    worksheet.row_dimensions[1].height = 30
+
+
+def _add_colour_scale(worksheet):
+    # Green (idle) -> yellow -> red (fully booked) over the numeric block
+    cell_range = f"B2:{get_column_letter(worksheet.max_column)}{worksheet.max_row}"
+    worksheet.conditional_formatting.add(cell_range, ColorScaleRule(
+        start_type='min', start_color='63BE7B',
+        mid_type='percentile', mid_value=50, mid_color='FFEB84',
+        end_type='max', end_color='F8696B'))
+
+
+def save_utilisation_report(report, output_file):
+    """
+    Writes the utilisation report: a summary sheet plus colour-scaled heatmaps.
+    """
+    try:
+        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+            report['summary'].to_excel(writer, sheet_name='Summary', index=False)
+            report['heatmap'].to_excel(writer, sheet_name='Heatmap', index_label='Room')
+            report['slot_load'].to_excel(writer, sheet_name='Slot_Load', index_label='Day')
+
+            _style_header(writer.sheets['Summary'])
+            for sheet_name in ('Heatmap', 'Slot_Load'):
+                worksheet = writer.sheets[sheet_name]
+                _style_header(worksheet)
+                _add_colour_scale(worksheet)
+
+    except Exception as e:
+        raise Exception(f"Error saving utilisation report: {str(e)}")
+
+
+def main():
+    input_sources = "D:\\Classwise 24 25 Sem I.xlsm"
+    output_file = "C:\\Users\\omkar\\Downloads\\timetable\\Room_Utilisation.xlsx"
+
+    try:
+        index = build_campus_index(input_sources)
+        # Listed rooms of the registry show up even when nothing is booked in them
+        report = compute_room_utilisation(index.sessions, extra_rooms=get_room_registry().rooms)
+        save_utilisation_report(report, output_file)
+
+        slot_load = report['slot_load']
+        if slot_load.size and len(report['summary']):
+            peak_day, peak_slot = np.unravel_index(slot_load.to_numpy().argmax(), slot_load.shape)
+            print(f"Peak load: {slot_load.iat[peak_day, peak_slot]} of {len(report['summary'])} rooms "
+                  f"on {slot_load.index[peak_day]} {slot_load.columns[peak_slot]}")
+
+        under_used = report['summary'].head(5)
+        print("Least used rooms:")
+        print(under_used[['Room', 'Occupancy_%', 'Longest_Idle_Slots']].to_string(index=False))
+        print(f"Room utilisation report saved to {output_file}")
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+
+if __name__ == "__main__":
+    main()
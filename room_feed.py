@@ -0,0 +1,290 @@
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from itertools import accumulate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import json
+import re
+import threading
+from campus_index import DAYS, TIME_SLOTS, build_campus_index, slot_bounds, source_stamps
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+WHITESPACE = re.compile(r'\s+')
+
+
+def week_minute(when):
+    """Minutes since Monday 00:00 of the week containing a datetime."""
+    return when.weekday() * MINUTES_PER_DAY + when.hour * 60 + when.minute
+
+
+def _clock_label(minute):
+    return f"{minute // 60 % 24:02d}:{minute % 60:02d}"
+
+
+def build_timelines(index):
+    """
+    Precomputes, per room, the week's sessions sorted by start time.
+
+    Args:
+        index (CampusIndex): Parsed index
+
+    Returns:
+        dict: room -> (starts, reach, entries); starts is the sorted list of
+            start week-minutes for bisect, reach the running maximum of the
+            end week-minutes, entries the matching
+            (start, end, session text, divisions) tuples
+    """
+    timelines = {}
+    for room, positions in index.room_index.items():
+        entries = {}
+        for session in index.sessions.iloc[positions].itertuples(index=False):
+            start = DAYS.index(session.Day) * MINUTES_PER_DAY + slot_bounds(TIME_SLOTS[session.Slot])[0]
+            last_slot = min(session.Slot + session.Span, len(TIME_SLOTS)) - 1
+            end = DAYS.index(session.Day) * MINUTES_PER_DAY + slot_bounds(TIME_SLOTS[last_slot])[1]
+            key = (start, end, WHITESPACE.sub(' ', session.Cell).strip())
+            entries.setdefault(key, set()).update(session.Divisions)
+        ordered = tuple(sorted((start, end, text, tuple(sorted(divisions)))
+                               for (start, end, text), divisions in entries.items()))
+        reach = tuple(accumulate((entry[1] for entry in ordered), max))
+        timelines[room] = (tuple(entry[0] for entry in ordered), reach, ordered)
+    return timelines
+
+
+def slot_boundaries(timelines):
+    """Sorted week-minutes at which some room's current or next session changes."""
+    return tuple(sorted({minute for _, _, entries in timelines.values()
+                         for start, end, _, _ in entries for minute in (start, end)}))
+
+
+def _describe(entry, **extra):
+    start, end, text, divisions = entry
+    return dict({'day': DAYS[start // MINUTES_PER_DAY], 'start': _clock_label(start),
+                 'end': _clock_label(end), 'session': text, 'divisions': list(divisions)}, **extra)
+
+
+def now_next(timeline, minute):
+    """
+    Current and next session of one room at a week-minute, by binary search.
+
+    A longer session that started earlier (a practical) can still be
+    running after a shorter one that started later has ended, so earlier
+    entries are checked as long as one of them could still reach `minute`.
+
+    Returns:
+        tuple: (current entry or None, next entry or None, minutes until next)
+    """
+    starts, reach, entries = timeline
+    if not entries:
+        return None, None, None
+    position = bisect_right(starts, minute)
+    current = None
+    index = position - 1
+    while index >= 0 and reach[index] > minute:
+        if entries[index][1] > minute:
+            current = entries[index]
+            break
+        index -= 1
+    if position < len(entries):
+        upcoming = entries[position]
+        return current, upcoming, upcoming[0] - minute
+    # Past the last session of the week: the first one of next week
+    return current, entries[0], entries[0][0] + MINUTES_PER_WEEK - minute
+
+
+class RoomFeed:
+    """
+    Now/next state of every room, with change notification.
+
+    The timelines are rebuilt only when a workbook changes on disk; a
+    lookup is a binary search. A ticker thread wakes at the next slot
+    boundary (or to poll the workbooks) and bumps the generation counter,
+    waking every client waiting in wait_for_change.
+    """
+
+    def __init__(self, sources, directory=None, poll_seconds=30, clock=datetime.now):
+        self.sources = sources
+        self.directory = directory
+        self.poll_seconds = poll_seconds
+        self.clock = clock
+        self.generation = 0
+        self._changed = threading.Condition()
+        self._stop = threading.Event()
+        self._stamps = None
+        self.reload()
+
+    def reload(self):
+        """Re-parses the workbooks and notifies every client."""
+        stamps = source_stamps(self.sources)
+        index = build_campus_index(self.sources, directory=self.directory, verbose=False)
+        timelines = build_timelines(index)
+        with self._changed:
+            # One tuple, swapped in a single assignment
+            self._state = (timelines, slot_boundaries(timelines))
+            self._stamps = stamps
+            self.generation += 1
+            self._changed.notify_all()
+
+    @property
+    def rooms(self):
+        return sorted(self._state[0])
+
+    def lookup(self, room, when=None):
+        """Current and next session of a room as a JSON-ready dict."""
+        timelines, _ = self._state
+        room = room.strip().upper()
+        if room not in timelines:
+            raise KeyError(f"Unknown room: {room}")
+        minute = week_minute(when or self.clock())
+        current, upcoming, wait = now_next(timelines[room], minute)
+        return {
+            'room': room,
+            'current': _describe(current, minutes_left=current[1] - minute) if current else None,
+            'next': _describe(upcoming, starts_in=wait) if upcoming else None,
+        }
+
+    def next_boundary(self, when):
+        """Datetime of the next slot boundary after `when`."""
+        _, boundaries = self._state
+        if not boundaries:
+            return when + timedelta(days=7)
+        minute = week_minute(when)
+        position = bisect_right(boundaries, minute)
+        target = boundaries[position] if position < len(boundaries) else boundaries[0] + MINUTES_PER_WEEK
+        base = when.replace(second=0, microsecond=0)
+        return base + timedelta(minutes=target - minute)
+
+    def wait_for_change(self, seen_generation, timeout):
+        """Blocks until the generation moves past seen_generation or timeout; returns it."""
+        with self._changed:
+            self._changed.wait_for(lambda: self.generation != seen_generation, timeout)
+            return self.generation
+
+    def _tick(self):
+        boundary = self.next_boundary(self.clock())
+        while not self._stop.is_set():
+            seconds = (boundary - self.clock()).total_seconds()
+            if self._stop.wait(max(0.0, min(seconds, self.poll_seconds))):
+                break
+            try:
+                changed = source_stamps(self.sources) != self._stamps
+            except OSError:
+                # A workbook is missing for a moment while it is being saved
+                changed = False
+            if changed:
+                try:
+                    self.reload()
+                except Exception as e:
+                    # Keep serving the last good timetable while the file is being saved
+                    print(f"Reload failed, keeping the previous timetable: {str(e)}")
+                boundary = self.next_boundary(self.clock())
+            elif self.clock() >= boundary:
+                with self._changed:
+                    self.generation += 1
+                    self._changed.notify_all()
+                boundary = self.next_boundary(self.clock())
+
+    def start(self):
+        threading.Thread(target=self._tick, name='room-feed-ticker', daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        with self._changed:
+            self.generation += 1
+            self._changed.notify_all()
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    """
+    GET /rooms              list of rooms
+    GET /now?room=H203      current and next session
+    GET /events?room=H203   Server-Sent Events stream of the same, pushed on change
+    """
+    feed = None
+    keepalive_seconds = 15
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        room = parse_qs(url.query).get('room', [''])[0]
+        try:
+            if url.path == '/rooms':
+                self._send_json(200, self.feed.rooms)
+            elif url.path == '/now':
+                self._send_json(200, self.feed.lookup(room))
+            elif url.path == '/events':
+                self.feed.lookup(room)
+                self._stream(room)
+            else:
+                self._send_json(404, {'error': 'Not found'})
+        except KeyError as e:
+            self._send_json(404, {'error': str(e.args[0])})
+
+    def _stream(self, room):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+
+        generation, last = None, None
+        try:
+            while not self.feed._stop.is_set():
+                if generation != self.feed.generation:
+                    generation = self.feed.generation
+                    state = self.feed.lookup(room)
+                    # Minutes-to-start changes every minute, push only when the sessions change
+                    shown = (state['current'] and state['current']['session'],
+                             state['next'] and (state['next']['session'], state['next']['start'], state['next']['day']))
+                    if shown != last:
+                        last = shown
+                        self.wfile.write(f"event: room\ndata: {json.dumps(state)}\n\n".encode('utf-8'))
+                        self.wfile.flush()
+                if self.feed.wait_for_change(generation, self.keepalive_seconds) == generation:
+                    self.wfile.write(b": keepalive\n\n")
+                    self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        except KeyError:
+            # The room disappeared from a reloaded workbook
+            self.wfile.write(b"event: gone\ndata: {}\n\n")
+
+
+def serve_feed(feed, host='127.0.0.1', port=8765):
+    """Starts the feed ticker and serves it over HTTP until interrupted."""
+    handler = type('BoundFeedHandler', (FeedHandler,), {'feed': feed})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    feed.start()
+    print(f"Room feed on http://{host}:{port}/events?room=<ROOM>")
+    try:
+        server.serve_forever()
+    finally:
+        feed.stop()
+        server.server_close()
+
+
+def main():
+    input_file = "D:\\Classwise 24 25 Sem I.xlsm"
+
+    try:
+        feed = RoomFeed(input_file)
+        print(f"Loaded timelines of {len(feed.rooms)} rooms")
+        serve_feed(feed)
+
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print(f"Error: {str(e)}")
+
+if __name__ == "__main__":
+    main()
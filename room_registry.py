@@ -0,0 +1,170 @@
+import pandas as pd
+import os
+import re
+
+# Room codes are delimited by anything that is not a letter or digit, so
+# "H20" never matches inside "H203" and "CH201" is not read as "H201"
+BOUNDARY_BEFORE = r'(?<![A-Z0-9])'
+BOUNDARY_AFTER = r'(?![A-Z0-9])'
+
+# What the timetables used so far: H-building rooms and labs (H203, H204B, HA12)
+DEFAULT_BUILDINGS = {'H': r'H[A-Z]?\d+[A-Z]?'}
+
+
+def trie_pattern(codes):
+    """
+    Compiles a list of literal codes into one trie-shaped regex.
+
+    Shared prefixes are matched once ("LAB1", "LAB2", "LIB" ->
+    "L(?:AB[12]|IB)"), so the regex engine never retries alternatives that
+    start with the same characters.
+
+    Args:
+        codes (iterable): Literal room codes
+
+    Returns:
+        str: Regex source, empty when there are no codes
+    """
+    trie = {}
+    for code in codes:
+        node = trie
+        for char in code:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def emit(node):
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        single_chars = all(len(branch) == 1 for branch in branches)
+        if len(branches) == 1:
+            body = branches[0]
+        elif single_chars:
+            body = '[' + ''.join(branches) + ']'
+        else:
+            body = '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            # A code ends here and longer codes continue: the rest is optional
+            body = body + '?' if single_chars else f'(?:{body})?'
+        return body
+
+    return emit(trie)
+
+
+class RoomRegistry:
+    """
+    Configured room codes of every building, compiled into one matcher.
+
+    Each building contributes a code pattern, listed rooms that follow no
+    pattern (e.g. "AUDI", "LIB2") are compiled into a trie, and everything
+    goes into one alternation with exact boundaries. Extracting the rooms
+    of a cell is a single left-to-right scan.
+    """
+
+    def __init__(self, buildings=None, rooms=None):
+        self.buildings = dict(DEFAULT_BUILDINGS if buildings is None else buildings)
+        # Listed room code -> building
+        self.rooms = {str(code).strip().upper(): building for code, building in (rooms or {}).items()}
+        self._compile()
+
+    def _compile(self):
+        alternatives = []
+        self.group_buildings = {}
+        # Listed rooms first, so "LAB10" is not cut short by a building pattern
+        if self.rooms:
+            alternatives.append(f"(?P<listed>{trie_pattern(self.rooms)})")
+        for number, (building, pattern) in enumerate(self.buildings.items()):
+            self.group_buildings[f"b{number}"] = building
+            alternatives.append(f"(?P<b{number}>{pattern})")
+        if not alternatives:
+            raise ValueError("Room registry needs at least one building or room")
+
+        self.source = BOUNDARY_BEFORE + '(?:' + '|'.join(alternatives) + ')' + BOUNDARY_AFTER
+        self.pattern = re.compile(self.source)
+        self.exact = re.compile('(?:' + '|'.join(alternatives) + ')')
+
+    def __getstate__(self):
+        # Only the configuration is pickled; worker processes recompile it
+        return {'buildings': self.buildings, 'rooms': self.rooms}
+
+    def __setstate__(self, state):
+        self.buildings, self.rooms = state['buildings'], state['rooms']
+        self._compile()
+
+    def add_building(self, building, pattern):
+        """Registers the code pattern of a building, e.g. ('M', r'M\\d{3}')."""
+        re.compile(pattern)
+        self.buildings[building] = pattern
+        self._compile()
+        return self
+
+    def add_rooms(self, building, codes):
+        """Registers room codes that follow no building pattern."""
+        for code in codes:
+            self.rooms[str(code).strip().upper()] = building
+        self._compile()
+        return self
+
+    def find_rooms(self, text):
+        """
+        All room codes in a text, in order, without duplicates.
+
+        Args:
+            text (str): Raw cell text (matched case-insensitively)
+
+        Returns:
+            tuple: Upper-case room codes
+        """
+        return tuple(dict.fromkeys(match.group(0) for match in self.pattern.finditer(str(text).upper())))
+
+    def is_room(self, code):
+        """True when the whole code is a registered room code."""
+        return self.exact.fullmatch(str(code).strip().upper()) is not None
+
+    def building_of(self, code):
+        """Building of a room code, or None when it is not a registered room."""
+        code = str(code).strip().upper()
+        if code in self.rooms:
+            return self.rooms[code]
+        match = self.exact.fullmatch(code)
+        return self.group_buildings.get(match.lastgroup) if match else None
+
+    @classmethod
+    def from_csv(cls, csv_path, include_default=True):
+        """
+        Loads a registry from a CSV with Building and Pattern or Room columns.
+
+        A row with a Pattern registers a building's code format, a row with a
+        Room registers one listed code. The H-building format is kept unless
+        include_default is False.
+
+        Args:
+            csv_path (str): Path to the registry CSV
+            include_default (bool): Keep the H-building pattern
+
+        Returns:
+            RoomRegistry: The compiled registry
+        """
+        if not os.path.exists(csv_path):
+            raise FileNotFoundError(f"Room registry not found: {csv_path}")
+        table = pd.read_csv(csv_path, dtype=str)
+        if 'Building' not in table.columns or not {'Pattern', 'Room'} & set(table.columns):
+            raise ValueError("Room registry CSV needs a Building column and a Pattern or Room column")
+
+        buildings = dict(DEFAULT_BUILDINGS) if include_default else {}
+        rooms = {}
+        for row in table.to_dict('records'):
+            building = str(row['Building']).strip()
+            pattern, room = row.get('Pattern'), row.get('Room')
+            if isinstance(pattern, str) and pattern.strip():
+                try:
+                    re.compile(pattern.strip())
+                except re.error as e:
+                    raise ValueError(f"Invalid room pattern for building {building}: {str(e)}")
+                buildings[building] = pattern.strip()
+            if isinstance(room, str) and room.strip():
+                rooms[room.strip().upper()] = building
+        return cls(buildings, rooms)
+
+
+DEFAULT_REGISTRY = RoomRegistry()
@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+import re
+from campus_index import build_campus_index, DAYS, TIME_SLOTS
+from cell_grammar import parse_cell, get_room_registry
+from room_analytics import build_occupancy_tensor
+
+ROOM_PARTS = re.compile(r'^([A-Z]+)(\d)')
+LAB_NUMBER = re.compile(r'(?:I{1,3}|IV|V|\d+)$')
+WHITESPACE = re.compile(r'\s+')
+
+
+def building_prefix(room):
+    """Building and floor digit of a room code ("H204B" -> ("H", "2"))."""
+    match = ROOM_PARTS.match(room)
+    building = get_room_registry().building_of(room)
+    if building is None:
+        building = match.group(1) if match else room
+    return building, match.group(2) if match else ''
+
+
+def lab_type(lab):
+    """Lab family without its number ("CNLII" -> "CNL", "CLIII" -> "CL")."""
+    return LAB_NUMBER.sub('', lab) if lab else ''
+
+
+def room_lab_types(sessions):
+    """Lab family of every room used for practicals, from the parsed cells."""
+    types = {}
+    for cell in sessions.loc[sessions['Kind'] == 'Practical', 'Cell']:
+        for entry in parse_cell(cell):
+            if entry.lab:
+                for room in entry.rooms:
+                    types.setdefault(room, lab_type(entry.lab))
+    return types
+
+
+def find_room_conflicts(sessions):
+    """
+    Finds rooms booked by different classes in overlapping slots.
+
+    Identical cells in several divisions (a joint lecture) count as one
+    class. The first class in sheet order keeps the room, the others are
+    listed to be moved.
+
+    Returns:
+        list: dicts with the room, day, slot, span and the session to move
+    """
+    booked = sessions.explode('Rooms').dropna(subset=['Rooms']).reset_index()
+    booked['Class'] = booked['Cell'].map(lambda cell: WHITESPACE.sub(' ', cell.upper()).strip())
+
+    # Each covered slot of a practical takes part in the comparison
+    covered = booked.loc[booked.index.repeat(booked['Span'])].copy()
+    covered['Covered'] = covered['Slot'] + covered.groupby(level=0).cumcount()
+
+    conflicts = []
+    seen = set()
+    for (room, day, _), group in covered.groupby(['Rooms', 'Day', 'Covered'], sort=False):
+        classes = list(dict.fromkeys(group.sort_values('index')['Class']))
+        if len(classes) < 2:
+            continue
+        for cls in classes[1:]:
+            for session in group[group['Class'] == cls].itertuples():
+                if (session.index, room) in seen:
+                    continue
+                seen.add((session.index, room))
+                conflicts.append({
+                    'Room': room,
+                    'Day': day,
+                    'Slot': session.Slot,
+                    'Span': session.Span,
+                    'Kind': session.Kind,
+                    'Division': ', '.join(session.Divisions),
+                    'Session': session.Cell,
+                    'Kept': ', '.join(sorted({division for divisions in group.loc[group['Class'] == classes[0], 'Divisions']
+                                              for division in divisions}))
+                })
+    return conflicts
+
+
+def suggest_room_reassignments(sessions, extra_rooms=(), alternatives=3):
+    """
+    Proposes free rooms for every room conflict in the workbook in one pass.
+
+    The occupancy tensor is built once; each conflict is a vectorized check
+    of its slot span across every room, and accepted suggestions are booked
+    into the tensor so two moves never land in the same room. Rooms in the
+    same building (then the same floor) rank first; practicals prefer rooms
+    of the same lab family, lectures prefer rooms that are not labs.
+
+    Args:
+        sessions (pandas.DataFrame): Session table of a CampusIndex
+        extra_rooms (list): Rooms that exist but are not used in the workbook
+        alternatives (int): Number of other free rooms listed per conflict
+
+    Returns:
+        pandas.DataFrame: One row per session to move with the suggested room
+    """
+    rooms, occupancy = build_occupancy_tensor(sessions, extra_rooms)
+    labs = room_lab_types(sessions)
+    parts = [building_prefix(room) for room in rooms]
+
+    suggestions = []
+    for conflict in find_room_conflicts(sessions):
+        day_idx = DAYS.index(conflict['Day'])
+        start, end = conflict['Slot'], min(conflict['Slot'] + conflict['Span'], len(TIME_SLOTS))
+        free = ~occupancy[:, day_idx, start:end].any(axis=1)
+
+        building, floor = building_prefix(conflict['Room'])
+        wanted_lab = labs.get(conflict['Room'], '')
+        ranked = []
+        for room_idx in np.flatnonzero(free):
+            room = rooms[room_idx]
+            if conflict['Kind'] == 'Practical':
+                lab_rank = 0 if wanted_lab and labs.get(room) == wanted_lab else 1
+            else:
+                lab_rank = 1 if room in labs else 0
+            ranked.append((parts[room_idx][0] != building, lab_rank, parts[room_idx][1] != floor, room, room_idx))
+        ranked.sort()
+
+        suggestion = ranked[0][3] if ranked else ''
+        if ranked:
+            occupancy[ranked[0][4], day_idx, start:end] = True
+
+        suggestions.append({
+            'Room': conflict['Room'],
+            'Day': conflict['Day'],
+            'Time_Slot': TIME_SLOTS[conflict['Slot']],
+            'Span': conflict['Span'],
+            'Kept_For': conflict['Kept'],
+            'Move_Division': conflict['Division'],
+            'Session': conflict['Session'],
+            'Suggested_Room': suggestion,
+            'Alternatives': ', '.join(item[3] for item in ranked[1:alternatives + 1])
+        })
+
+    columns = ['Room', 'Day', 'Time_Slot', 'Span', 'Kept_For', 'Move_Division',
+               'Session', 'Suggested_Room', 'Alternatives']
+    return pd.DataFrame(suggestions, columns=columns)
+
+
+def main():
+    input_file = "D:\\Classwise 24 25 Sem I.xlsm"
+    output_file = "C:\\Users\\omkar\\Downloads\\timetable\\Room_Repairs.xlsx"
+
+    try:
+        index = build_campus_index(input_file)
+        repairs = suggest_room_reassignments(index.sessions)
+        unresolved = (repairs['Suggested_Room'] == '').sum()
+        print(f"{len(repairs)} sessions need another room, {unresolved} without a free room")
+        repairs.to_excel(output_file, sheet_name='Room_Repairs', index=False)
+        print(f"Room reassignment suggestions saved to {output_file}")
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+
+EMPTY = -1
+SEPARATOR = "\n---\n"
+
+
+class SessionTable:
+    """
+    Interned display keys of sessions, addressed by dense integer IDs.
+
+    A key is whatever identifies the displayed text, e.g. (cell, division);
+    identical keys share one ID. Keys are turned into text only when a
+    schedule is rendered, through the formatter, and each text is built once.
+    """
+
+    def __init__(self, formatter=None):
+        self.keys = []
+        self.ids = {}
+        self.formatter = formatter
+        self._texts = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def intern(self, key):
+        session_id = self.ids.get(key)
+        if session_id is None:
+            session_id = self.ids[key] = len(self.keys)
+            self.keys.append(key)
+        return session_id
+
+    def text(self, session_id):
+        text = self._texts.get(session_id)
+        if text is None:
+            key = self.keys[session_id]
+            text = self.formatter(*key) if self.formatter else str(key)
+            self._texts[session_id] = text
+        return text
+
+
+class ScheduleGrid:
+    """
+    One schedule as an int32 array of days x slots x overlap depth.
+
+    Each entry is a session ID into a SessionTable, EMPTY where nothing is
+    scheduled; sessions sharing a slot are stacked along the last axis in
+    the order they were added. Hundreds of grids cost a few KB each, and
+    display strings only exist while rendering.
+    """
+
+    __slots__ = ('grid', 'table')
+
+    def __init__(self, grid, table):
+        self.grid = grid
+        self.table = table
+
+    @classmethod
+    def from_entries(cls, day_idx, slot_idx, session_ids, table, shape, max_depth=None):
+        """
+        Builds a grid from parallel arrays of day, slot and session ID.
+
+        Args:
+            day_idx, slot_idx, session_ids (array-like): One entry per session
+            table (SessionTable): Table the IDs point into
+            shape (tuple): (number of days, number of slots)
+            max_depth (int): Keep only the first sessions of each slot,
+                e.g. 1 for "first occurrence wins"
+
+        Returns:
+            ScheduleGrid: The grid
+        """
+        day_idx = np.asarray(day_idx, dtype=np.int64)
+        slot_idx = np.asarray(slot_idx, dtype=np.int64)
+        session_ids = np.asarray(session_ids, dtype=np.int32)
+        if len(session_ids) == 0:
+            return cls(np.full(shape + (1,), EMPTY, dtype=np.int32), table)
+
+        # Rank of each session within its slot, keeping insertion order
+        cell = day_idx * shape[1] + slot_idx
+        order = np.argsort(cell, kind='stable')
+        sorted_cells = cell[order]
+        starts = np.r_[0, np.flatnonzero(np.diff(sorted_cells)) + 1]
+        run_start = np.repeat(starts, np.diff(np.r_[starts, len(sorted_cells)]))
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order)) - run_start
+
+        keep = rank < max_depth if max_depth else np.ones(len(rank), dtype=bool)
+        depth = int(rank[keep].max()) + 1
+        grid = np.full(shape + (depth,), EMPTY, dtype=np.int32)
+        grid[day_idx[keep], slot_idx[keep], rank[keep]] = session_ids[keep]
+        return cls(grid, table)
+
+    @property
+    def depth(self):
+        return self.grid.shape[2]
+
+    def session_ids(self, day, slot):
+        ids = self.grid[day, slot]
+        return ids[ids != EMPTY]
+
+    def occupied(self):
+        """Boolean days x slots array of slots holding at least one session."""
+        return (self.grid != EMPTY).any(axis=2)
+
+    def render(self, days, time_slots):
+        """
+        Converts the grid to the days x time slots DataFrame of display strings.
+
+        Args:
+            days (list): Row labels, one per grid row
+            time_slots (list): Column labels, one per grid column
+
+        Returns:
+            pandas.DataFrame: Stacked session texts, '' for empty slots
+        """
+        schedule = np.full(self.grid.shape[:2], '', dtype=object)
+        for day, slot in zip(*np.nonzero(self.occupied())):
+            schedule[day, slot] = SEPARATOR.join(self.table.text(int(session_id))
+                                                 for session_id in self.session_ids(day, slot))
+        return pd.DataFrame(schedule, index=list(days), columns=list(time_slots))
+
+
+class ScheduleBuilder:
+    """Collects (day, slot, key) entries of one schedule and builds its grid."""
+
+    def __init__(self, days, time_slots, table=None):
+        self.days = list(days)
+        self.time_slots = list(time_slots)
+        self.table = table if table is not None else SessionTable()
+        self.entries = []
+
+    def add(self, day, time_slot, key):
+        self.entries.append((self.days.index(day), self.time_slots.index(time_slot), self.table.intern(key)))
+
+    def build(self, max_depth=None):
+        day_idx, slot_idx, session_ids = zip(*self.entries) if self.entries else ((), (), ())
+        return ScheduleGrid.from_entries(day_idx, slot_idx, session_ids, self.table,
+                                         (len(self.days), len(self.time_slots)), max_depth)
+
+    def render(self, max_depth=None):
+        return self.build(max_depth).render(self.days, self.time_slots)
@@ -0,0 +1,133 @@
+import pandas as pd
+from campus_index import build_campus_index, DAYS, TIME_SLOTS
+from cell_grammar import parse_cell
+from faculty_directory import FacultyDirectory, normalize_initials
+import meta
+
+SLOTS_PER_DAY = len(TIME_SLOTS)
+
+
+def slot_bit(day, slot):
+    """Bit of one (day, slot) cell in a weekly busy bitset."""
+    return 1 << (DAYS.index(day) * SLOTS_PER_DAY + slot)
+
+
+def day_mask(day):
+    """Bits of every slot of one day."""
+    return ((1 << SLOTS_PER_DAY) - 1) << (DAYS.index(day) * SLOTS_PER_DAY)
+
+
+def popcount(bits):
+    return bin(bits).count('1')
+
+
+class SubstituteFinder:
+    """
+    Finds teachers who can cover for an absent colleague.
+
+    Every faculty member of the meta table gets a busy bitset over
+    days x time slots (one bit per slot, practicals set both of theirs), so
+    "free in all of these slots" is a single AND per candidate.
+    """
+
+    def __init__(self, index, meta_df):
+        self.index = index
+        self.directory = index.directory or FacultyDirectory.from_meta(meta_df)
+
+        # Course codes each teacher teaches, and course short names -> codes
+        self.teacher_courses = {}
+        self.course_codes = {}
+        for row in meta_df.itertuples(index=False):
+            initials = self.directory.resolve(row.Teacher_Initials) if pd.notna(row.Teacher_Initials) else None
+            if initials:
+                self.teacher_courses.setdefault(initials, set()).add(str(row.Course_Code).strip())
+            if pd.notna(row.Course_Initials) and str(row.Course_Initials).strip():
+                self.course_codes.setdefault(normalize_initials(row.Course_Initials), set()).add(str(row.Course_Code).strip())
+
+        self.busy = {initials: 0 for initials in self.directory.table}
+        self.sessions_by_teacher = {}
+        for session in index.sessions.itertuples(index=False):
+            bits = 0
+            for offset in range(session.Span):
+                if session.Slot + offset < SLOTS_PER_DAY:
+                    bits |= slot_bit(session.Day, session.Slot + offset)
+            for entry in parse_cell(session.Cell):
+                for initials in self.directory.resolve_tokens(entry.teachers):
+                    self.busy[initials] = self.busy.get(initials, 0) | bits
+                    self.sessions_by_teacher.setdefault(initials, []).append(
+                        (session.Day, session.Slot, session.Span, entry.subject, ', '.join(session.Divisions), bits))
+
+    def absent_sessions(self, teacher, day):
+        """Sessions the absent teacher would have taught on that day."""
+        initials = self.directory.resolve(teacher) or normalize_initials(teacher)
+        return [session for session in self.sessions_by_teacher.get(initials, []) if session[0] == day]
+
+    def find_substitutes(self, teacher, day, limit=10):
+        """
+        Ranks teachers free in every slot the absent teacher has on a day.
+
+        Candidates teaching one of the same courses come first, then those
+        with the lightest load that day.
+
+        Args:
+            teacher (str): Initials or alias of the absent teacher
+            day (str): Day of the absence, e.g. 'MON'
+            limit (int): Maximum number of candidates returned
+
+        Returns:
+            pandas.DataFrame: Ranked candidates with the courses they share
+        """
+        if day not in DAYS:
+            raise ValueError(f"Unknown day: {day}")
+        absent = self.directory.resolve(teacher) or normalize_initials(teacher)
+        sessions = self.absent_sessions(absent, day)
+        needed = 0
+        courses = set()
+        for _, _, _, subject, _, bits in sessions:
+            needed |= bits
+            # Subject short names resolve to course codes through the meta table
+            courses |= self.course_codes.get(subject, set()) & self.teacher_courses.get(absent, set())
+
+        candidates = []
+        today = day_mask(day)
+        for initials, busy in self.busy.items():
+            if initials == absent or busy & needed:
+                continue
+            shared = sorted(courses & self.teacher_courses.get(initials, set()))
+            candidates.append({
+                'Teacher_Initials': initials,
+                'Teacher_Name': self.directory.name_of(initials),
+                'Same_Course': bool(shared),
+                'Shared_Courses': ', '.join(shared),
+                'Slots_Busy_That_Day': popcount(busy & today),
+                'Slots_Busy_Week': popcount(busy)
+            })
+
+        columns = ['Teacher_Initials', 'Teacher_Name', 'Same_Course', 'Shared_Courses',
+                   'Slots_Busy_That_Day', 'Slots_Busy_Week']
+        ranked = pd.DataFrame(candidates, columns=columns)
+        ranked = ranked.sort_values(['Same_Course', 'Slots_Busy_That_Day', 'Slots_Busy_Week', 'Teacher_Initials'],
+                                    ascending=[False, True, True, True])
+        print(f"{absent} has {len(sessions)} sessions on {day}; {len(ranked)} teachers are free for all of them")
+        return ranked.head(limit).reset_index(drop=True)
+
+
+def main():
+    input_file = "D:\\Classwise 24 25 Sem I.xlsm"
+    absent_teacher = "PVS"
+    day = "MON"
+
+    try:
+        meta_df = meta.extract_course_teacher_data(input_file)
+        index = build_campus_index(input_file, directory=FacultyDirectory.from_meta(meta_df))
+        finder = SubstituteFinder(index, meta_df)
+
+        for day_name, slot, span, subject, division, _ in finder.absent_sessions(absent_teacher, day):
+            print(f"  {day_name} {TIME_SLOTS[slot]} {subject} ({division})")
+        print(finder.find_substitutes(absent_teacher, day).to_string(index=False))
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,10 @@ from openpyxl import load_workbook
 from openpyxl.styles import Alignment, Font, PatternFill
 from openpyxl.utils import get_column_letter
 import os
+from features.mul import LazySheetMapping
+from campus_index import format_session, joint_session_key
+from cell_grammar import find_rooms
+from schedule_grid import ScheduleBuilder, SessionTable
 
 class TimetableGenerator:
     def __init__(self):
@@ -70,77 +74,67 @@ class TimetableGenerator:
             raise FileNotFoundError(f"Input file not found: {input_file}")
 
         try:
-            # Create Excel file object and get list of all sheet names
-            excel_file = pd.ExcelFile(input_file)
-            sheet_names = excel_file.sheet_names
-            print(f"Found {len(sheet_names)} sheets in the workbook")
+            # Sheets are parsed lazily, one at a time
+            # Skip first 6 rows (header information)
+            # Read only 25 rows (timetable content)
+            with LazySheetMapping(input_file, max_cached=1, skiprows=6, nrows=25) as excel_file:
+                sheet_names = excel_file.sheet_names
+                print(f"Found {len(sheet_names)} sheets in the workbook")
 
-            # Create empty schedule DataFrame to store combined results
-            combined_schedule = self.create_timetable_structure()
+                # Load the workbook once, read-only, for the division cells
+                workbook = load_workbook(input_file, read_only=True, data_only=True)
+                try:
+                    # Matches by slot and class: a lecture held jointly for several
+                    # divisions (same subject, teacher and room) is kept once with
+                    # every division, instead of one "---" block per division
+                    joint_sessions = {}
 
-            # Process each sheet in the workbook
-            for sheet_name in sheet_names:
-                print(f"Processing sheet: {sheet_name}")
-                
-                # Load the current sheet from the workbook
-                workbook = load_workbook(input_file, data_only=True)
-                sheet = workbook[sheet_name]
+                    # Process each sheet in the workbook
+                    for sheet_name, raw_timetable in excel_file.items():
+                        print(f"Processing sheet: {sheet_name}")
+                        sheet = workbook[sheet_name]
                
-                # Get division information from cell N3
-                # If N3 is empty, use sheet name as division identifier
-                division = sheet['N3'].value if sheet['N3'].value else f"Division ({sheet_name})"
-
-                # Read timetable data from current sheet
-                # Skip first 6 rows (header information)
-                # Read only 25 rows (timetable content)
-                raw_timetable = pd.read_excel(input_file, 
-                                            sheet_name=sheet_name,
-                                            skiprows=6, 
-                                            nrows=25)
+                        # Get division information from cell N3
+                        # If N3 is empty, use sheet name as division identifier
+                        division = sheet['N3'].value if sheet['N3'].value else f"Division ({sheet_name})"
 
-                # Process each row (day) in the timetable
-                for index, row in raw_timetable.iterrows():
-                    day = row.iloc[0]  # First column contains day information
+                        # Process each row (day) in the timetable
+                        for index, row in raw_timetable.iterrows():
+                            day = row.iloc[0]  # First column contains day information
                     
-                    # Skip if day is not valid
-                    if not isinstance(day, str) or day.strip() not in self.days:
-                        continue
+                            # Skip if day is not valid
+                            if not isinstance(day, str) or day.strip() not in self.days:
+                                continue
                     
-                    day = day.strip()
+                            day = day.strip()
                     
-                    # Process each time slot in the current day
-                    for col_idx, time_slot in enumerate(self.time_slots):
-                        # Get cell content (add 1 to col_idx because first column is day)
-                        current_cell = row.iloc[col_idx + 1]
+                            # Process each time slot in the current day
+                            for col_idx, time_slot in enumerate(self.time_slots):
+                                # Get cell content (add 1 to col_idx because first column is day)
+                                current_cell = row.iloc[col_idx + 1]
                          
-                        # Skip empty or non-string cells
-                        if pd.isna(current_cell) or not isinstance(current_cell, str):
-                            continue
+                                # Skip empty or non-string cells
+                                if pd.isna(current_cell) or not isinstance(current_cell, str):
+                                    continue
                         
-                        # Check if this time slot involves the classroom we're interested in
-                        if classroom in current_cell:
-                            # Split cell content into components
-                            components = current_cell.strip().split()
-                            
-                            # Format cell content in three lines:
-                            # 1. Subject code
-                            # 2. Faculty and other information
-                            # 3. Division information
-                            cell_content = "\n".join([
-                                " ".join(components[:2]),     # First two components are subject code
-                                " ".join(components[2:]),     # Remaining components are faculty info
-                                f"({division})"              # Division information in parentheses
-                            ])
-                            
-                            # If this time slot already has content, append new content
-                            # Use "---" as a separator between different classes
-                            existing_content = combined_schedule.at[day, time_slot]
-                            if existing_content:
-                                cell_content = f"{existing_content}\n---\n{cell_content}"
-                            
-                            # Update the schedule with the new content
-                            combined_schedule.at[day, time_slot] = cell_content
-            
+                                # Check if this time slot involves the classroom we're interested in
+                                # (exact room codes, a substring test would match H20 in H203)
+                                if classroom.strip().upper() in find_rooms(current_cell):
+                                    key = joint_session_key(current_cell) or (sheet_name, index)
+                                    cell, divisions = joint_sessions.setdefault((day, time_slot, key), (current_cell, []))
+                                    if division not in divisions:
+                                        divisions.append(division)
+                finally:
+                    workbook.close()
+
+            # Rendered in three lines: subject code, faculty and other
+            # information, divisions in parentheses. Classes sharing a
+            # slot are separated by "---"
+            combined_schedule = ScheduleBuilder(self.days, self.time_slots, SessionTable(format_session))
+            for (day, time_slot, _), (cell, divisions) in joint_sessions.items():
+                combined_schedule.add(day, time_slot, (cell, ', '.join(map(str, divisions))))
+            combined_schedule = combined_schedule.render()
+
             # Save to CSV for debugging if needed
             combined_schedule.to_csv('output.csv', index=False)
 
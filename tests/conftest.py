@@ -0,0 +1,42 @@
+import os
+import sys
+import pytest
+
+# The modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def make_workbook(tmp_path):
+    """
+    Writes a "Classwise" workbook: {sheet: {day: {slot: cell}}}, with the
+    division in N3, the header row at row 7 and days from row 8. Cells given
+    as (text, span) are merged over span slots.
+    """
+    from openpyxl import Workbook
+    from campus_index import DAYS, FIRST_ROW, TIME_SLOTS
+
+    def write(sheets, name='Classwise.xlsx'):
+        workbook = Workbook()
+        workbook.remove(workbook.active)
+        for sheet_name, days in sheets.items():
+            sheet = workbook.create_sheet(sheet_name)
+            sheet['N3'] = sheet_name
+            sheet.cell(row=FIRST_ROW - 1, column=1, value='Day')
+            for col_idx, time_slot in enumerate(TIME_SLOTS):
+                sheet.cell(row=FIRST_ROW - 1, column=col_idx + 2, value=time_slot)
+            for day_idx, day in enumerate(DAYS):
+                sheet.cell(row=FIRST_ROW + day_idx, column=1, value=day)
+            for day, cells in days.items():
+                row = FIRST_ROW + DAYS.index(day)
+                for slot, cell in cells.items():
+                    text, span = cell if isinstance(cell, tuple) else (cell, 1)
+                    sheet.cell(row=row, column=slot + 2, value=text)
+                    if span > 1:
+                        sheet.merge_cells(start_row=row, start_column=slot + 2,
+                                          end_row=row, end_column=slot + span + 1)
+        path = tmp_path / name
+        workbook.save(path)
+        return str(path)
+
+    return write
@@ -0,0 +1,42 @@
+import pandas as pd
+from campus_index import CampusIndex, SESSION_COLUMNS, TIME_SLOTS, FIRST_ROW, parse_sheet_grid
+
+
+def sheet(division, cells, spans=None):
+    """Raw grid of one division sheet holding a MON row with {slot: cell}."""
+    row = ['MON'] + [cells.get(slot) for slot in range(len(TIME_SLOTS))]
+    # Practical cells are merged over two columns
+    merged = {(FIRST_ROW, slot + 2): span for slot, span in (spans or {}).items()}
+    return {'sheet': division, 'division': division, 'rows': [tuple(row)], 'spans': merged}
+
+
+def campus_index(*grids):
+    records = [record for grid in grids for record in parse_sheet_grid(grid, 'CSE')]
+    return CampusIndex(pd.DataFrame(records, columns=SESSION_COLUMNS))
+
+
+def test_practical_clashing_in_its_second_slot():
+    index = campus_index(sheet('A', {0: "A1-DS(MNV)-H202"}, spans={0: 2}),
+                         sheet('B', {1: "OS PVS H202"}))
+    clashes = index.find_clashes()
+    assert clashes[['Room', 'Day', 'Time_Slot', 'Divisions']].values.tolist() == [
+        ['H202', 'MON', TIME_SLOTS[1], 'CSE/A, CSE/B']]
+
+
+def test_same_slot_clash():
+    index = campus_index(sheet('A', {3: "DS MNV H203"}), sheet('B', {3: "OS PVS H203"}))
+    assert index.find_clashes()['Time_Slot'].tolist() == [TIME_SLOTS[3]]
+
+
+def test_joint_lecture_is_not_a_clash():
+    index = campus_index(sheet('A', {3: "DS MNV H203"}), sheet('B', {3: "DS MNV H203"}))
+    assert index.find_clashes().empty
+    assert index.find_faculty_clashes().empty
+    assert index.room_schedule('H203').at['MON', TIME_SLOTS[3]] == "DS MNV\nH203\n(CSE/A, CSE/B)"
+
+
+def test_faculty_in_two_rooms_during_a_practical():
+    index = campus_index(sheet('A', {6: "A1-DS(MNV)-H202"}, spans={6: 2}),
+                         sheet('B', {7: "DS MNV H303"}))
+    clashes = index.find_faculty_clashes()
+    assert clashes[['Faculty', 'Time_Slot', 'Rooms']].values.tolist() == [['MNV', TIME_SLOTS[7], 'H202, H303']]
@@ -0,0 +1,42 @@
+import pytest
+from campus_index import build_campus_index
+from campus_shards import map_shard, merge_shards, plan_shards, read_partial, reduce_partials, write_partial
+
+SHEETS = {
+    'A': {'MON': {0: "DS MNV H202", 3: ("A1-DS(MNV)-H201", 2)}},
+    'B': {'MON': {0: "DS MNV H202"}, 'TUE': {1: "OS PVS H203"}},
+    'C': {'WED': {5: "CN ABC H204"}},
+}
+
+
+def comparable(index):
+    return index.sessions.to_dict('records')
+
+
+@pytest.mark.parametrize('shard_count', [1, 2, 3, 5])
+def test_sharded_map_reduce_matches_campus_index(make_workbook, tmp_path, shard_count):
+    first = make_workbook({'A': SHEETS['A'], 'B': SHEETS['B']}, 'First.xlsx')
+    second = make_workbook({'C': SHEETS['C']}, 'Second.xlsx')
+    expected = build_campus_index([first, second], max_workers=1, verbose=False)
+
+    shards = plan_shards([first, second], shard_count)
+    assert len(shards) == shard_count
+    assert sorted(name for shard in shards for _, names in shard for name in names) == ['A', 'B', 'C']
+
+    # Partials go through files and arrive in reverse order
+    partial_files = [write_partial(map_shard(assignments, shard_id), str(tmp_path / f"shard_{shard_id}.json.gz"))
+                     for shard_id, assignments in enumerate(shards)]
+    index, _ = merge_shards(partial_files[::-1])
+
+    assert comparable(index) == comparable(expected)
+    assert index.rooms == expected.rooms
+
+
+def test_sheet_in_two_partials_is_rejected(make_workbook, tmp_path):
+    path = make_workbook({'A': SHEETS['A']})
+    partial = map_shard([(path, ['A'])], 0)
+    assert read_partial(write_partial(partial, str(tmp_path / 'p.json.gz')))['sheets'] == partial['sheets']
+    with pytest.raises(ValueError):
+        reduce_partials([partial, dict(partial, shard=1)])
+    with pytest.raises(ValueError):
+        plan_shards([path], 0)
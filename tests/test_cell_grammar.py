@@ -0,0 +1,67 @@
+from cell_grammar import parse_cell, cell_rooms, cell_teachers, find_rooms, set_room_registry
+from room_registry import DEFAULT_REGISTRY, RoomRegistry
+
+
+def test_theory_cell():
+    (entry,) = parse_cell("DS MNV H303")
+    assert (entry.kind, entry.subject, entry.teachers, entry.rooms) == ('Theory', 'DS', ('MNV',), ('H303',))
+
+
+def test_theory_cell_without_subject_reads_initials_as_subject():
+    (entry,) = parse_cell("MNV H303")
+    assert (entry.subject, entry.teachers, entry.rooms) == ('MNV', (), ('H303',))
+
+
+def test_bracketed_room_in_theory_cell_keeps_the_teacher():
+    (entry,) = parse_cell("DS MNV (H303)")
+    assert (entry.kind, entry.subject, entry.teachers, entry.rooms, entry.lab) == \
+        ('Theory', 'DS', ('MNV',), ('H303',), '')
+
+
+def test_room_before_spaced_dash_is_not_a_batch():
+    cell = "A1-DS(MNV)-H202 - A2-OS(PVS)-H203"
+    entries = parse_cell(cell)
+    assert [entry.batches for entry in entries] == [('A1',), ('A2',)]
+    assert [entry.rooms for entry in entries] == [('H202',), ('H203',)]
+    assert cell_rooms(entries) == find_rooms(cell) == ('H202', 'H203')
+
+
+def test_room_before_lab_name_is_not_a_batch():
+    (entry,) = parse_cell("B1-PS(VPM)-H202-CLIII")
+    assert (entry.batches, entry.subject, entry.teachers) == (('B1',), 'PS', ('VPM',))
+    assert (entry.rooms, entry.lab) == (('H202',), 'CLIII')
+
+
+def test_multi_batch_practical():
+    entries = parse_cell("B1,B2-UHV(SS)-AK-H202\nB3,B4-UHV(APT)-TP-H203")
+    assert [entry.batches for entry in entries] == [('B1', 'B2'), ('B3', 'B4')]
+    assert cell_rooms(entries) == ('H202', 'H203')
+    assert cell_teachers(entries) == ('SS', 'AK', 'APT', 'TP')
+
+
+def test_bracketed_lab_room():
+    entries = parse_cell("A1-COA(SDP)-CNLII(H204B)\nA2-ES(AM)-H202")
+    assert [(entry.rooms, entry.lab) for entry in entries] == [(('H204B',), 'CNLII'), (('H202',), '')]
+
+
+def test_registry_swap_is_not_served_from_the_cache():
+    cell = "DS MNV M101"
+    assert cell_rooms(parse_cell(cell)) == ()
+    try:
+        set_room_registry(RoomRegistry({'H': r'H[A-Z]?\d+[A-Z]?', 'M': r'M\d{3}'}))
+        assert cell_rooms(parse_cell(cell)) == ('M101',)
+    finally:
+        set_room_registry(DEFAULT_REGISTRY)
+    assert cell_rooms(parse_cell(cell)) == ()
+
+
+def test_rooms_added_to_the_active_registry_are_used():
+    registry = RoomRegistry()
+    cell = "SEMINAR PVS AUDI"
+    try:
+        set_room_registry(registry)
+        assert cell_rooms(parse_cell(cell)) == ()
+        registry.add_rooms('Main', ['AUDI'])
+        assert cell_rooms(parse_cell(cell)) == ('AUDI',)
+    finally:
+        set_room_registry(DEFAULT_REGISTRY)
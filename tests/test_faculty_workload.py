@@ -0,0 +1,39 @@
+import pandas as pd
+from faculty_workload import compute_faculty_workload
+
+META = pd.DataFrame({'Teacher_Initials': ['PV', 'MNV', 'AM'],
+                     'Teacher_Name': ['Priya Patil', 'Manoj Vyas', 'Anil More']})
+
+
+def sessions(*rows):
+    return pd.DataFrame([{'Day': day, 'Slot': slot, 'Span': span, 'Kind': kind, 'Teachers': (teacher,)}
+                         for teacher, day, slot, span, kind in rows])
+
+
+def workload(*rows):
+    report = compute_faculty_workload(sessions(*rows), META)
+    return report.set_index('Teacher_Initials')
+
+
+def test_two_slot_practical_is_not_back_to_back():
+    report = workload(('PV', 'MON', 0, 2, 'Practical'), ('MNV', 'TUE', 3, 2, 'Practical'))
+    assert report.loc['PV', 'Back_To_Back'] == 0
+    assert report.loc['MNV', 'Back_To_Back'] == 0
+
+
+def test_consecutive_sessions_are_back_to_back():
+    report = workload(('PV', 'MON', 0, 1, 'Theory'), ('PV', 'MON', 1, 1, 'Theory'),
+                      ('PV', 'MON', 5, 1, 'Theory'))
+    assert report.loc['PV', 'Back_To_Back'] == 1
+
+
+def test_sessions_either_side_of_a_short_break_are_back_to_back():
+    # Slot 2 is the 10:20 short break
+    report = workload(('AM', 'WED', 1, 1, 'Theory'), ('AM', 'WED', 3, 2, 'Practical'))
+    assert report.loc['AM', 'Back_To_Back'] == 1
+
+
+def test_practical_followed_by_lecture_counts_once():
+    # 13:15 to 15:05 practical, short break, lecture at 15:10
+    report = workload(('MNV', 'FRI', 6, 2, 'Practical'), ('MNV', 'FRI', 9, 1, 'Theory'))
+    assert report.loc['MNV', 'Back_To_Back'] == 1
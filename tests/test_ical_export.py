@@ -0,0 +1,55 @@
+import pandas as pd
+from campus_index import CampusIndex, SESSION_COLUMNS, TIME_SLOTS, FIRST_ROW, parse_sheet_grid
+from ical_export import export_calendars, fold_line
+
+
+def campus_index(*sheets):
+    records = []
+    for division, cells, spans in sheets:
+        row = ['MON'] + [cells.get(slot) for slot in range(len(TIME_SLOTS))]
+        grid = {'sheet': division, 'division': division, 'rows': [tuple(row)],
+                'spans': {(FIRST_ROW, slot + 2): span for slot, span in spans.items()}}
+        records.extend(parse_sheet_grid(grid, 'CSE'))
+    return CampusIndex(pd.DataFrame(records, columns=SESSION_COLUMNS))
+
+
+def events(path):
+    # Unfold continuation lines, then split into one dict per VEVENT
+    lines = open(path, encoding='utf-8', newline='').read().replace('\r\n ', '').split('\r\n')
+    found, current = [], None
+    for line in lines:
+        if line == 'BEGIN:VEVENT':
+            current = {}
+        elif line == 'END:VEVENT':
+            found.append(current)
+            current = None
+        elif current is not None:
+            key, value = line.split(':', 1)
+            current[key] = value
+    return found
+
+
+def test_weekly_events_with_holidays_and_joint_lectures(tmp_path):
+    index = campus_index(('A', {0: "DS MNV H202", 6: "A1-CG(PV)-H202"}, {6: 2}),
+                         ('B', {0: "DS MNV H202"}, {}))
+    written = export_calendars(index, str(tmp_path), '2024-07-22', '2024-08-31',
+                               holidays=['2024-08-05', '2024-08-06'], rooms=['H202'], faculty=[])
+    assert [path.split('/')[-1] for path in written] == ['Classroom_H202.ics']
+
+    lecture, practical = events(written[0])
+    assert lecture['DTSTART;TZID=Asia/Kolkata'] == '20240722T083000'
+    assert lecture['DTEND;TZID=Asia/Kolkata'] == '20240722T092500'
+    # Last day 09:25 local is 03:55 UTC
+    assert lecture['RRULE'] == 'FREQ=WEEKLY;UNTIL=20240831T035500Z'
+    assert lecture['EXDATE;TZID=Asia/Kolkata'] == '20240805T083000'
+    assert lecture['SUMMARY'] == 'DS'
+    assert lecture['DESCRIPTION'] == 'DS MNV H202\\nDivisions: CSE/A\\, CSE/B'
+    assert practical['DTEND;TZID=Asia/Kolkata'] == '20240722T150500'
+
+
+def test_long_lines_are_folded_without_splitting_characters():
+    line = 'DESCRIPTION:' + 'é' * 60
+    folded = fold_line(line)
+    chunks = folded[:-2].split('\r\n ')
+    assert ''.join(chunks) == line
+    assert all(len(chunk.encode('utf-8')) <= 75 for chunk in chunks)
@@ -0,0 +1,64 @@
+import pytest
+from openpyxl import load_workbook as open_workbook
+import test_class2
+import time2
+from features.mul import LazySheetMapping
+
+SHEETS = {'A': {'MON': {0: "DS MNV H202"}}, 'B': {'MON': {1: "OS PVS H202"}}, 'C': {}}
+
+
+class ClosingSpy(LazySheetMapping):
+    closed = []
+
+    def close(self):
+        ClosingSpy.closed.append(self)
+        super().close()
+
+
+def failing(*args):
+    raise RuntimeError("unreadable cell")
+
+
+def test_only_the_most_recent_sheets_stay_parsed(make_workbook):
+    with LazySheetMapping(make_workbook(SHEETS), max_cached=2, skiprows=6, nrows=25) as sheets:
+        assert len(sheets) == 3 and 'B' in sheets
+        first = sheets['A']
+        assert sheets['A'] is first
+        sheets['B'], sheets['C']
+        assert list(sheets._cache) == ['B', 'C']
+        assert sheets['A'] is not first
+    with pytest.raises(ValueError):
+        LazySheetMapping(make_workbook(SHEETS), max_cached=0)
+
+
+@pytest.mark.parametrize('method, patched', [('process_all_sheets', 'is_classroom_in_cell'),
+                                             ('process_faculty_timetable', 'cell_faculty')])
+def test_time2_closes_the_workbook_when_parsing_fails(make_workbook, monkeypatch, method, patched):
+    monkeypatch.setattr(time2, 'LazySheetMapping', ClosingSpy)
+    ClosingSpy.closed.clear()
+    generator = time2.TimetableGenerator()
+    monkeypatch.setattr(generator, patched, failing)
+
+    with pytest.raises(Exception, match="unreadable cell"):
+        getattr(generator, method)(make_workbook(SHEETS), 'H202')
+    assert len(ClosingSpy.closed) == 1
+
+
+def test_test_class2_closes_both_workbooks_when_parsing_fails(make_workbook, monkeypatch):
+    opened = []
+
+    def load_workbook(*args, **kwargs):
+        workbook = open_workbook(*args, **kwargs)
+        opened.append(workbook)
+        monkeypatch.setattr(workbook, 'close', lambda: opened.remove(workbook))
+        return workbook
+
+    monkeypatch.setattr(test_class2, 'load_workbook', load_workbook)
+    monkeypatch.setattr(test_class2, 'LazySheetMapping', ClosingSpy)
+    monkeypatch.setattr(test_class2, 'find_rooms', failing)
+    ClosingSpy.closed.clear()
+
+    with pytest.raises(Exception, match="unreadable cell"):
+        test_class2.TimetableGenerator().process_all_sheets(make_workbook(SHEETS), 'H202')
+    assert opened == []
+    assert len(ClosingSpy.closed) == 1
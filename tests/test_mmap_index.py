@@ -0,0 +1,60 @@
+import os
+import pytest
+import mmap_index
+from campus_index import build_campus_index
+from mmap_index import MappedIndex, resolve_index_file, write_mapped_index
+
+
+@pytest.fixture
+def campus(make_workbook):
+    return build_campus_index(make_workbook({
+        'A': {'MON': {0: "DS MNV H202", 3: ("A1-DS(MNV)-H201", 2)}, 'TUE': {1: "OS PVS H203"}},
+        'B': {'MON': {0: "DS MNV H202"}},
+    }), verbose=False)
+
+
+def test_write_open_query_round_trip(campus, tmp_path):
+    index_file = str(tmp_path / 'timetable.ttix')
+    data_file = write_mapped_index(campus, index_file)
+    assert resolve_index_file(index_file) == data_file
+
+    with MappedIndex(index_file) as mapped:
+        assert mapped.data_file == data_file
+        assert mapped.rooms == campus.rooms
+        assert mapped.divisions == campus.divisions
+        for room in campus.rooms:
+            assert mapped.room_schedule(room.lower()).equals(campus.room_schedule(room))
+        assert mapped.faculty_schedule('mnv').equals(campus.faculty_schedule('MNV'))
+        assert mapped.division_schedule('Classwise/B').equals(campus.division_schedule('Classwise/B'))
+        assert [mapped.session(p) for p in range(len(campus.sessions))] == campus.sessions.to_dict('records')
+        assert len(mapped.positions('room', 'H999')) == 0
+
+
+def test_rewrite_keeps_only_the_current_version(campus, tmp_path):
+    (tmp_path / 'index').mkdir()
+    index_file = str(tmp_path / 'index' / 'timetable.ttix')
+    first = write_mapped_index(campus, index_file)
+    second = write_mapped_index(campus, index_file)
+    assert not os.path.exists(first)
+    assert sorted(os.listdir(tmp_path / 'index')) == sorted(['timetable.ttix', os.path.basename(second)])
+
+
+def test_open_after_version_removed_resolves_pointer_again(campus, tmp_path, monkeypatch):
+    index_file = str(tmp_path / 'timetable.ttix')
+    stale = write_mapped_index(campus, index_file)
+    current = write_mapped_index(campus, index_file)
+
+    # A reader that resolved the pointer just before the rewrite removed its target
+    answers = [stale]
+    monkeypatch.setattr(mmap_index, 'resolve_index_file',
+                        lambda path: answers.pop() if answers else resolve_index_file(path))
+    with MappedIndex(index_file) as mapped:
+        assert mapped.data_file == current
+        assert mapped.rooms == campus.rooms
+
+
+def test_missing_version_is_an_error_when_pointer_does_not_move(campus, tmp_path):
+    index_file = str(tmp_path / 'timetable.ttix')
+    os.remove(write_mapped_index(campus, index_file))
+    with pytest.raises(FileNotFoundError):
+        MappedIndex(index_file)
@@ -0,0 +1,52 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from campus_index import TIME_SLOTS
+from query_engine import QueryEngine, Snapshot, UnknownEntityError
+
+
+def test_snapshot_from_workbooks_is_quiet_and_immutable(make_workbook, capsys):
+    snapshot = Snapshot.from_workbooks(make_workbook({'A': {'MON': {0: "DS MNV H202"}}}))
+    assert capsys.readouterr().out == ''
+    with pytest.raises(AttributeError):
+        snapshot.sessions = ()
+    with pytest.raises(TypeError):
+        snapshot.rooms['H203'] = (0,)
+
+
+def test_queries_and_unknown_entities(make_workbook):
+    engine = QueryEngine(Snapshot.from_workbooks(make_workbook(
+        {'A': {'MON': {0: "DS MNV H202"}, 'TUE': {3: "OS PVS H203"}}, 'B': {'MON': {0: "DS MNV H202"}}})))
+    assert engine.rooms() == ['H202', 'H203']
+    assert [session.divisions for session in engine.faculty_sessions('mnv')] == [('Classwise/A', 'Classwise/B')]
+    assert engine.room_sessions('h203', day='mon') == []
+
+    grid = engine.room_schedule('H202')
+    assert grid['MON'][TIME_SLOTS[0]] == ["DS MNV\nH202\n(Classwise/A, Classwise/B)"]
+    # Results are the caller's to change
+    grid['MON'][TIME_SLOTS[0]].clear()
+    assert engine.room_schedule('H202')['MON'][TIME_SLOTS[0]]
+
+    with pytest.raises(UnknownEntityError):
+        engine.room_sessions('H999')
+    with pytest.raises(ValueError):
+        engine.room_sessions('H202', day='SUN')
+    with pytest.raises(LookupError):
+        QueryEngine().rooms()
+
+
+def test_readers_see_one_snapshot_or_the_other_during_swaps(make_workbook):
+    old = Snapshot.from_workbooks(make_workbook({'A': {'MON': {0: "DS MNV H202"}}}, 'old.xlsx'))
+    new = Snapshot.from_workbooks(make_workbook({'A': {'MON': {0: "DS MNV H202", 1: "OS MNV H203"}}}, 'new.xlsx'))
+    engine = QueryEngine(old)
+
+    def query(_):
+        sessions = engine.faculty_sessions('MNV')
+        return tuple(session.cell for session in sessions)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = executor.map(query, range(2000))
+        for _ in range(50):
+            engine.swap(new)
+            engine.swap(old)
+        seen = set(results)
+    assert seen <= {("DS MNV H202",), ("DS MNV H202", "OS MNV H203")}
@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+import quick_query
+from campus_index import build_campus_index, format_session
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_cached_lookup_never_imports_pandas(make_workbook, tmp_path):
+    workbook = make_workbook({'A': {'MON': {0: "DS MNV H202"}}, 'B': {'MON': {0: "DS MNV H202"}}})
+    index_file = str(tmp_path / 'index.json')
+    quick_query.open_index(workbook, index_file)
+
+    script = ("import sys, quick_query\n"
+              f"index = quick_query.open_index({workbook!r}, {index_file!r})\n"
+              "print(quick_query.query(index, 'faculty', 'm.n.v', 'MON'))\n"
+              "print(sorted(name for name in ('pandas', 'openpyxl', 'numpy') if name in sys.modules))\n")
+    output = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True,
+                            check=True).stdout.splitlines()
+    assert output == ["[('MON', '8:30 to 9:25', 1, 'Classwise/A, Classwise/B', 'DS MNV H202')]", '[]']
+
+
+def test_changed_workbook_rebuilds_the_index(make_workbook, tmp_path):
+    index_file = str(tmp_path / 'index.json')
+    workbook = make_workbook({'A': {'MON': {0: "DS MNV H202"}}})
+    assert quick_query.query(quick_query.open_index(workbook, index_file), 'room', 'H203') == []
+    make_workbook({'A': {'MON': {0: "DS MNV H202", 3: "OS PVS H203"}, 'TUE': {1: "CG RRB H303"}}})
+    index = quick_query.open_index(workbook, index_file)
+    assert [session[1] for session in quick_query.query(index, 'room', 'h203')] == ['10:30 to 11:25']
+
+
+def test_xlsx_output_matches_the_campus_layout(make_workbook, tmp_path):
+    from openpyxl import load_workbook
+
+    workbook = make_workbook({'A': {'MON': {0: "DS MNV H202"}}, 'B': {'MON': {0: "DS MNV H202"}}})
+    index = quick_query.open_index(workbook, str(tmp_path / 'index.json'))
+    output_file = str(tmp_path / 'H202.xlsx')
+    quick_query.render_xlsx(index, 'room', 'H202', output_file)
+
+    expected = build_campus_index(workbook, verbose=False).room_schedule('H202').at['MON', '8:30 to 9:25']
+    assert expected == format_session("DS MNV H202", "Classwise/A, Classwise/B")
+    assert load_workbook(output_file).active['B3'].value == expected
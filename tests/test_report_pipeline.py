@@ -0,0 +1,56 @@
+import os
+import pandas as pd
+from openpyxl import load_workbook
+import report_pipeline
+from report_pipeline import generate_reports, report_file_name
+from time2 import TimetableGenerator
+
+META = pd.DataFrame({
+    'Division': ['A', 'B', 'A'],
+    'Teacher_Initials': ['MNV', 'MNV', 'PVS'],
+    'Course_Initials': ['DS', 'DS', 'OS'],
+    'Course_Code': ['CS201', 'CS201', 'CS202'],
+    'Course_Name': ['Data Structures', 'Data Structures', 'Operating Systems'],
+    'Teacher_Name': ['Manoj Vyas', 'Manoj Vyas', 'Pooja Shah'],
+    'Classroom': ['H202', 'H202', 'H203'],
+})
+
+
+def column_values(path, column):
+    worksheet = load_workbook(path).active
+    return [cell.value for cell in worksheet[column] if cell.value is not None]
+
+
+def test_colliding_names_get_their_own_files():
+    taken = {}
+    assert report_file_name('Division', 'CSE/A', taken) == 'Division_CSE_A.xlsx'
+    assert report_file_name('Division', 'CSE_A', taken) == 'Division_CSE_A_2.xlsx'
+    assert report_file_name('Division', 'CSE/A', taken) == 'Division_CSE_A.xlsx'
+    assert report_file_name('Division', 'cse/a', taken) == 'Division_cse_a_3.xlsx'
+    assert report_file_name('Classroom', 'CSE/A', taken) == 'Classroom_CSE_A.xlsx'
+
+
+def test_reports_have_the_time2_metadata_section(make_workbook, tmp_path, monkeypatch):
+    meta_file = tmp_path / 'meta.csv'
+    META.to_csv(meta_file, index=False)
+    generator = TimetableGenerator()
+    generator.meta_files = [str(meta_file)]
+    monkeypatch.setattr(report_pipeline, 'REPORT_GENERATOR', generator)
+
+    workbook = make_workbook({'A': {'MON': {0: "DS MNV H202", 3: "OS PVS H203"}},
+                              'B': {'MON': {0: "DS MNV H202"}}})
+    output_dir = tmp_path / 'reports'
+    saved = generate_reports(workbook, str(output_dir), use_processes=False)
+
+    names = sorted(os.path.basename(path) for path in saved)
+    assert names == ['Classroom_H202.xlsx', 'Classroom_H203.xlsx', 'Division_Classwise_A.xlsx',
+                     'Division_Classwise_B.xlsx', 'Faculty_MNV.xlsx', 'Faculty_PVS.xlsx']
+
+    room = output_dir / 'Classroom_H202.xlsx'
+    assert column_values(room, 'B')[0] == "Classroom Schedule - H202"
+    assert column_values(room, 'A')[-2:] == ['Course Code', 'CS201']
+    assert column_values(room, 'D')[-2:] == ['Divisions', 'A, B']
+
+    division = column_values(output_dir / 'Division_Classwise_A.xlsx', 'A')
+    assert division[-3:] == ['Course Code', 'CS201', 'CS202']
+    assert column_values(output_dir / 'Faculty_PVS.xlsx', 'C')[-1] == 'Pooja Shah (PVS)'
@@ -0,0 +1,47 @@
+import pandas as pd
+from campus_index import SESSION_COLUMNS, TIME_SLOTS
+from revision_diff import diff_revisions
+
+
+def sessions(*rows):
+    return pd.DataFrame([{'Source': 'Sem I', 'Sheet': division, 'Division': division, 'Day': day,
+                          'Time_Slot': TIME_SLOTS[slot], 'Slot': slot, 'Span': 1, 'Row': 8,
+                          'Kind': 'Theory', 'Cell': cell, 'Rooms': rooms, 'Teachers': teachers}
+                         for division, day, slot, cell, rooms, teachers in rows], columns=SESSION_COLUMNS)
+
+
+def test_identical_revisions_have_no_changes():
+    old = sessions(('A', 'MON', 0, "DS MNV H203", ('H203',), ('MNV',)))
+    # Re-wrapped text is the same session
+    new = sessions(('A', 'MON', 0, "DS\nMNV  H203", ('H203',), ('MNV',)))
+    assert diff_revisions(old, new).empty
+
+
+def test_moved_session():
+    old = sessions(('A', 'MON', 0, "DS MNV H203", ('H203',), ('MNV',)))
+    new = sessions(('A', 'TUE', 3, "DS MNV H203", ('H203',), ('MNV',)))
+    changes = diff_revisions(old, new)
+    assert set(changes['Change']) == {'Moved'}
+    assert set(changes['Entity']) == {'H203', 'MNV', 'A'}
+    assert changes.iloc[0][['Old_Slot', 'New_Slot']].tolist() == [f"MON {TIME_SLOTS[0]}", f"TUE {TIME_SLOTS[3]}"]
+
+
+def test_added_and_removed_sessions_only_touch_their_entities():
+    old = sessions(('A', 'MON', 0, "DS MNV H203", ('H203',), ('MNV',)),
+                   ('B', 'MON', 1, "OS PVS H202", ('H202',), ('PVS',)))
+    new = sessions(('A', 'MON', 0, "DS MNV H203", ('H203',), ('MNV',)),
+                   ('B', 'WED', 4, "CN SDP H204", ('H204',), ('SDP',)))
+    changes = diff_revisions(old, new)
+    assert 'MNV' not in set(changes['Entity']) and 'H203' not in set(changes['Entity'])
+    assert set(changes.loc[changes['Entity'] == 'H202', 'Change']) == {'Removed'}
+    assert set(changes.loc[changes['Entity'] == 'H204', 'Change']) == {'Added'}
+
+
+def test_separator_characters_in_names_survive():
+    old = sessions(('CSE|A', 'MON', 0, "DS MNV H203", ('H203',), ('MNV',)))
+    new = sessions(('CSE|A', 'FRI', 9, "DS | MNV H203", ('H203',), ('MNV',)))
+    changes = diff_revisions(old, new)
+    division = changes[changes['Entity_Type'] == 'Division']
+    assert division[['Entity', 'Change', 'Division']].values.tolist() == [
+        ['CSE|A', 'Removed', 'CSE|A'], ['CSE|A', 'Added', 'CSE|A']]
+    assert division['Session'].tolist() == ["DS MNV H203", "DS | MNV H203"]
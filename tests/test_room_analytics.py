@@ -0,0 +1,33 @@
+import pandas as pd
+from campus_index import TIME_SLOTS
+from room_analytics import TEACHING_SLOTS, compute_room_utilisation
+
+
+def sessions(*rows):
+    return pd.DataFrame([{'Day': day, 'Slot': slot, 'Span': span, 'Rooms': (room,)}
+                         for room, day, slot, span in rows])
+
+
+def test_room_without_bookings_shows_zero_occupancy():
+    report = compute_room_utilisation(sessions(('H202', 'MON', 0, 1)), extra_rooms=['H305', 'h202'])
+    summary = report['summary'].set_index('Room')
+    assert summary.index.tolist() == ['H305', 'H202']
+    assert summary.loc['H305', 'Busy_Slots'] == 0
+    assert summary.loc['H305', 'Occupancy_%'] == 0.0
+    assert summary.loc['H305', 'Peak_Slot'] == ''
+    assert summary.loc['H305', 'Longest_Idle_Slots'] == len(TEACHING_SLOTS)
+    assert report['heatmap'].loc['H305'].sum() == 0
+
+
+def test_practical_books_both_slots():
+    report = compute_room_utilisation(sessions(('H204B', 'TUE', 3, 2)))
+    summary = report['summary'].set_index('Room')
+    assert summary.loc['H204B', 'Busy_Slots'] == 2
+    assert report['slot_load'].loc['TUE', TIME_SLOTS[4]] == 1
+
+
+def test_only_extra_rooms():
+    report = compute_room_utilisation(sessions().reindex(columns=['Day', 'Slot', 'Span', 'Rooms']),
+                                      extra_rooms=['H101'])
+    assert report['summary']['Room'].tolist() == ['H101']
+    assert report['slot_load'].to_numpy().sum() == 0
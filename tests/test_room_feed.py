@@ -0,0 +1,53 @@
+from datetime import datetime
+import pandas as pd
+from campus_index import CampusIndex, SESSION_COLUMNS, TIME_SLOTS, FIRST_ROW, parse_sheet_grid
+from room_feed import MINUTES_PER_DAY, RoomFeed, build_timelines, now_next
+
+MONDAY = datetime(2024, 7, 22)
+
+
+def timeline(*sheets):
+    records = []
+    for division, cells, spans in sheets:
+        row = ['MON'] + [cells.get(slot) for slot in range(len(TIME_SLOTS))]
+        grid = {'sheet': division, 'division': division, 'rows': [tuple(row)],
+                'spans': {(FIRST_ROW, slot + 2): span for slot, span in spans.items()}}
+        records.extend(parse_sheet_grid(grid, 'CSE'))
+    return build_timelines(CampusIndex(pd.DataFrame(records, columns=SESSION_COLUMNS)))['H204B']
+
+
+def minute(hour, minute_of_hour, day=0):
+    return day * MINUTES_PER_DAY + hour * 60 + minute_of_hour
+
+
+def test_longer_session_is_current_after_a_shorter_one_inside_it_ends():
+    # A 3-hour lab block from 8:30, with a lecture from 9:25 to 10:20 inside it
+    rooms = timeline(('A', {0: "A1-DS(MNV)-H204B"}, {0: 4}), ('B', {1: "OS PVS H204B"}, {}))
+    current, upcoming, wait = now_next(rooms, minute(10, 25))
+    assert current[2] == "A1-DS(MNV)-H204B"
+    assert (current[0], current[1]) == (minute(8, 30), minute(11, 25))
+    # Nothing else this week: the next session is next Monday's first
+    assert upcoming[2] == "A1-DS(MNV)-H204B"
+    assert wait == 7 * MINUTES_PER_DAY - minute(10, 25) + minute(8, 30)
+
+    current, upcoming, _ = now_next(rooms, minute(9, 30))
+    assert current[2] == "OS PVS H204B"
+
+
+def test_free_room_reports_the_next_session():
+    rooms = timeline(('A', {3: "DS MNV H204B"}, {}))
+    current, upcoming, wait = now_next(rooms, minute(9, 0))
+    assert current is None
+    assert (upcoming[2], wait) == ("DS MNV H204B", 90)
+    assert now_next(rooms, minute(11, 25))[0] is None
+
+
+def test_feed_lookup(make_workbook):
+    feed = RoomFeed(make_workbook({'A': {'MON': {0: ("A1-DS(MNV)-H204B", 2)}},
+                                   'B': {'MON': {0: ("B1-DS(MNV)-H204B", 2)}, 'TUE': {3: "OS PVS H204B"}}}),
+                    clock=lambda: MONDAY.replace(hour=9, minute=40))
+    state = feed.lookup('h204b')
+    assert state['current']['end'] == '10:20' and state['current']['minutes_left'] == 40
+    assert state['next'] == {'day': 'TUE', 'start': '10:30', 'end': '11:25', 'session': 'OS PVS H204B',
+                             'divisions': ['Classwise/B'], 'starts_in': MINUTES_PER_DAY + 50}
+    assert feed.next_boundary(MONDAY.replace(hour=9, minute=40)) == MONDAY.replace(hour=10, minute=20)
@@ -0,0 +1,43 @@
+import pandas as pd
+from campus_index import CampusIndex, SESSION_COLUMNS, TIME_SLOTS, FIRST_ROW, parse_sheet_grid
+from room_repair import suggest_room_reassignments
+
+
+def sessions(*sheets):
+    records = []
+    for division, days in sheets:
+        rows, spans = [], {}
+        for row_number, (day, cells) in enumerate(days.items(), start=FIRST_ROW):
+            row = [day] + [None] * len(TIME_SLOTS)
+            for slot, cell in cells.items():
+                text, span = cell if isinstance(cell, tuple) else (cell, 1)
+                row[slot + 1] = text
+                spans[(row_number, slot + 2)] = span
+            rows.append(tuple(row))
+        grid = {'sheet': division, 'division': division, 'rows': rows, 'spans': spans}
+        records.extend(parse_sheet_grid(grid, 'CSE'))
+    return CampusIndex(pd.DataFrame(records, columns=SESSION_COLUMNS)).sessions
+
+
+def test_lecture_moves_to_a_free_room_on_the_same_floor():
+    repairs = suggest_room_reassignments(
+        sessions(('A', {'MON': {0: "DS MNV H202"}}), ('B', {'MON': {0: "OS PVS H202"}}),
+                 ('C', {'MON': {0: "CG RRB H203"}})),
+        extra_rooms=['H301', 'H205'])
+    assert repairs[['Room', 'Kept_For', 'Move_Division', 'Suggested_Room', 'Alternatives']].values.tolist() == [
+        ['H202', 'CSE/A', 'CSE/B', 'H205', 'H301']]
+
+
+def test_practical_prefers_a_lab_of_the_same_family():
+    repairs = suggest_room_reassignments(
+        sessions(('A', {'MON': {6: ("A1-DS(MNV)-CNLII(H204B)", 2)}}),
+                 ('B', {'MON': {6: ("B1-CG(RRB)-CNLII(H204B)", 2)}, 'TUE': {0: ("B2-OS(PV)-CNLI(H306B)", 2)}})),
+        extra_rooms=['H205'])
+    assert repairs[['Time_Slot', 'Span', 'Suggested_Room', 'Alternatives']].values.tolist() == [
+        [TIME_SLOTS[6], 2, 'H306B', 'H205']]
+
+
+def test_joint_lecture_needs_no_repair():
+    repairs = suggest_room_reassignments(
+        sessions(('A', {'MON': {0: "DS MNV H202"}}), ('B', {'MON': {0: "DS MNV H202"}})))
+    assert repairs.empty
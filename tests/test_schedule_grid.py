@@ -0,0 +1,37 @@
+import numpy as np
+from schedule_grid import EMPTY, SEPARATOR, ScheduleBuilder, ScheduleGrid, SessionTable
+
+DAYS = ['MON', 'TUE']
+SLOTS = ['8:30', '9:25', '10:30']
+
+
+def test_identical_keys_share_one_id_and_text_is_built_once():
+    calls = []
+    table = SessionTable(lambda cell, division: calls.append(cell) or f"{cell} ({division})")
+    assert table.intern(('DS', 'A')) == table.intern(('DS', 'A')) == 0
+    assert table.intern(('OS', 'A')) == 1
+    assert table.text(0) == table.text(0) == "DS (A)"
+    assert calls == ['DS'] and len(table) == 2
+
+
+def test_sessions_in_one_slot_stack_in_insertion_order():
+    builder = ScheduleBuilder(DAYS, SLOTS)
+    builder.add('MON', '9:25', 'DS')
+    builder.add('TUE', '8:30', 'CG')
+    builder.add('MON', '9:25', 'OS')
+    grid = builder.build()
+    assert grid.grid.dtype == np.int32 and grid.depth == 2
+    assert grid.occupied().tolist() == [[False, True, False], [True, False, False]]
+
+    schedule = builder.render()
+    assert schedule.at['MON', '9:25'] == f"DS{SEPARATOR}OS"
+    assert schedule.at['TUE', '8:30'] == "CG"
+    assert schedule.at['TUE', '10:30'] == ''
+    # First occurrence wins
+    assert builder.render(max_depth=1).at['MON', '9:25'] == "DS"
+
+
+def test_empty_grid():
+    grid = ScheduleGrid.from_entries([], [], [], SessionTable(), (2, 3))
+    assert (grid.grid == EMPTY).all()
+    assert grid.render(DAYS, SLOTS).to_numpy().tolist() == [[''] * 3] * 2
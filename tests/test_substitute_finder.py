@@ -0,0 +1,39 @@
+import pandas as pd
+from campus_index import CampusIndex, SESSION_COLUMNS, TIME_SLOTS, FIRST_ROW, parse_sheet_grid
+from faculty_directory import FacultyDirectory
+from substitute_finder import SubstituteFinder
+
+META = pd.DataFrame({
+    'Division': ['A', 'B', 'A', 'B'],
+    'Teacher_Initials': ['MNV', 'PV', 'AM', 'RRB'],
+    'Course_Initials': ['DS', 'DS', 'OS', 'CG'],
+    'Course_Code': ['CS201', 'CS201', 'CS202', 'CS203'],
+    'Course_Name': ['Data Structures', 'Data Structures', 'Operating Systems', 'Computer Graphics'],
+    'Teacher_Name': ['Manoj Vyas', 'Priya Patil', 'Anil More', 'Ravi R Bhat'],
+})
+
+
+def finder(*sheets):
+    records = []
+    for division, cells, spans in sheets:
+        row = ['MON'] + [cells.get(slot) for slot in range(len(TIME_SLOTS))]
+        grid = {'sheet': division, 'division': division, 'rows': [tuple(row)],
+                'spans': {(FIRST_ROW, slot + 2): span for slot, span in spans.items()}}
+        records.extend(parse_sheet_grid(grid, 'CSE'))
+    directory = FacultyDirectory.from_meta(META)
+    return SubstituteFinder(CampusIndex(pd.DataFrame(records, columns=SESSION_COLUMNS), directory), META)
+
+
+def test_free_teachers_of_the_same_course_rank_first():
+    substitutes = finder(('A', {0: "DS MNV H202", 6: "A1-DS(MNV)-H204B", 3: "OS AM H203"}, {6: 2}),
+                         ('B', {3: "DS PV H202", 7: "CG RRB H303"}, {})).find_substitutes('MNV', 'MON')
+    # RRB teaches in the practical's second slot
+    assert substitutes['Teacher_Initials'].tolist() == ['PV', 'AM']
+    assert substitutes.loc[0, 'Shared_Courses'] == 'CS201'
+    assert substitutes['Slots_Busy_That_Day'].tolist() == [1, 1]
+
+
+def test_absent_teacher_without_sessions_leaves_everyone_free():
+    substitutes = finder(('A', {0: "OS AM H203"}, {})).find_substitutes('MNV', 'TUE')
+    assert sorted(substitutes['Teacher_Initials']) == ['AM', 'PV', 'RRB']
+    assert not substitutes['Same_Course'].any()
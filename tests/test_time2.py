@@ -0,0 +1,28 @@
+import pytest
+from campus_index import TIME_SLOTS, format_session
+from time2 import TimetableGenerator
+
+SHEETS = {
+    'A': {'MON': {0: "DS MNV H202", 3: ("A1-DS(MNV)-H201", 2)}},
+    'B': {'MON': {0: "DS MNV H202", 3: ("B1-DS(MNV)-H201", 2)}},
+}
+
+
+@pytest.mark.parametrize('method, key', [('process_all_sheets', 'H202'),
+                                         ('process_faculty_timetable', 'MNV')])
+def test_single_file_lists_a_joint_lecture_once(make_workbook, method, key):
+    schedule = getattr(TimetableGenerator(), method)(make_workbook(SHEETS), key)
+    assert schedule.at['MON', TIME_SLOTS[0]] == "DS MNV\nH202\n(A, B)"
+
+
+@pytest.mark.parametrize('method, key', [('process_all_sheets', 'H202'),
+                                         ('process_faculty_timetable', 'MNV')])
+def test_campus_source_lists_a_joint_lecture_once(make_workbook, method, key):
+    schedule = getattr(TimetableGenerator(), method)([make_workbook(SHEETS)], key)
+    assert schedule.at['MON', TIME_SLOTS[0]] == "DS MNV\nH202\n(Classwise/A, Classwise/B)"
+
+
+def test_batch_cells_are_not_merged(make_workbook):
+    # Different batches of two divisions in one lab: the first one is shown
+    schedule = TimetableGenerator().process_all_sheets(make_workbook(SHEETS), 'H201')
+    assert schedule.at['MON', TIME_SLOTS[3]] == format_session("A1-DS(MNV)-H201", "A")
@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+from campus_index import build_campus_index
+from cell_grammar import parse_cell
+from timetable_solver import division_batches, format_generated_cell, save_generated_timetable, solve_timetable
+
+META = pd.DataFrame({
+    'Division': ['A', 'A', 'A', 'B'],
+    'Teacher_Initials': ['MNV', 'PV', 'AM', 'PV'],
+    'Course_Initials': ['DS', 'DS', 'OS', 'DS'],
+    'Course_Code': ['CS201', 'CS201', 'CS202', 'CS201'],
+    'Course_Name': ['Data Structures', 'Data Structures', 'Operating Systems', 'Data Structures'],
+    'Teacher_Name': ['Manoj Vyas', 'Priya Patil', 'Anil More', 'Priya Patil'],
+    'Classroom': ['H201', 'H201', 'CNLII(H204B)', 'H202'],
+})
+REQUIREMENTS = pd.DataFrame({'Course_Code': ['CS201', 'CS202'],
+                             'Lecture_Hours': [3, 1], 'Practical_Sessions': [2, 1]})
+
+
+def test_generated_workbook_reads_back(tmp_path):
+    schedule = solve_timetable(META, REQUIREMENTS, restarts=1, max_workers=1)
+    assert schedule.attrs['clashes'] == 0
+    output_file = tmp_path / 'Generated.xlsx'
+    save_generated_timetable(schedule, META, str(output_file))
+
+    sessions = build_campus_index(str(output_file), verbose=False).sessions
+    read_back = {(division.split('/')[-1], day, slot): row
+                 for division, day, slot, row in zip(sessions['Division'], sessions['Day'],
+                                                     sessions['Slot'], sessions.itertuples())}
+    assert len(read_back) == len(schedule)
+
+    for session in schedule.itertuples():
+        row = read_back[(session.Division, session.Day, session.Slot)]
+        kind = 'Practical' if session.Span > 1 else 'Theory'
+        assert (row.Kind, row.Span) == (kind, session.Span)
+        assert row.Teachers == (session.Teacher_Initials,)
+        assert row.Rooms == (session.Room,)
+        entries = parse_cell(row.Cell)
+        assert [entry.subject for entry in entries] == [session.Course_Initials]
+        if kind == 'Practical':
+            assert entries[0].batches == (f"{session.Division}1",)
+
+
+def test_practical_is_written_for_every_batch():
+    session = pd.Series({'Division': 'A', 'Course_Initials': 'DS', 'Course_Code': 'CS201',
+                         'Teacher_Initials': 'MNV', 'Room': 'H201', 'Span': 2})
+    cell = format_generated_cell(session, batches=2)
+    assert cell == "A1,A2-DS(MNV)-H201"
+    assert parse_cell(cell)[0].batches == ('A1', 'A2')
+
+
+def test_division_that_reads_as_a_room_is_rejected():
+    with pytest.raises(ValueError):
+        division_batches('H')
+    with pytest.raises(ValueError):
+        division_batches('2')
@@ -1,9 +1,15 @@
 import pandas as pd
-from openpyxl import load_workbook
 from openpyxl.styles import Alignment, Font, PatternFill
 from openpyxl.utils import get_column_letter
 import os
 import re
+from campus_index import build_campus_index, format_session, joint_session_key
+from cell_grammar import parse_cell, cell_teachers, find_rooms, set_room_registry
+from faculty_directory import FacultyDirectory, normalize_initials, cell_faculty_tokens
+from features.mul import LazySheetMapping
+from meta import combine_divisions
+from room_registry import RoomRegistry
+from schedule_grid import ScheduleBuilder, SessionTable
 
 class TimetableGenerator:
     def __init__(self):
@@ -14,53 +20,73 @@ class TimetableGenerator:
             '16:55 to 17:45', '17:45 to 18:25'
         ]
         self.days = ['MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT']
+        self.faculty_directory = None
+        self.meta_files = [
+            "C:/Users/omkar/Downloads/timetable/meta_info_Theory_section.csv",
+            "C:/Users/omkar/Downloads/timetable/meta_info_Practical_section.csv"
+        ]
+        self.combined_meta = {}
+
+    def load_faculty_directory(self, meta_data, extra_aliases=None):
+        """
+        Loads the initials -> (name, aliases) table used for exact faculty matching.
+        `meta_data` is the meta.extract_course_teacher_data DataFrame or its CSV.
+        """
+        self.faculty_directory = FacultyDirectory.from_meta(meta_data, extra_aliases)
+        return self.faculty_directory
+
+    def cell_faculty(self, cell_content):
+        # Faculty named in a cell, as canonical initials when a directory is loaded
+        teachers = cell_teachers(parse_cell(cell_content))
+        if self.faculty_directory is not None:
+            return self.faculty_directory.resolve_tokens(teachers)
+        return cell_faculty_tokens(teachers)
+
+    def resolve_faculty(self, faculty_name):
+        if self.faculty_directory is not None:
+            return self.faculty_directory.resolve(faculty_name) or normalize_initials(faculty_name)
+        return normalize_initials(faculty_name)
 
     def create_timetable_structure(self):
         df = pd.DataFrame(index=self.days, columns=self.time_slots)
         return df.fillna('')
 
+    def is_campus_source(self, input_file):
+        # A directory, glob pattern or list of workbooks goes through the merged campus index
+        return not isinstance(input_file, str) or os.path.isdir(input_file) or any(ch in input_file for ch in '*?[')
+
     def process_all_sheets(self, input_file, classroom):
+        if self.is_campus_source(input_file):
+            return build_campus_index(input_file).room_schedule(classroom)
+
         if not os.path.exists(input_file):
             raise FileNotFoundError(f"Input file not found: {input_file}")
 
         try:
-            excel_file = pd.ExcelFile(input_file)
-            print(f"Found {len(excel_file.sheet_names)} sheets in the workbook")
-            combined_schedule = self.create_timetable_structure()
-
-            for sheet_name in excel_file.sheet_names:
-                print(f"Processing sheet: {sheet_name}")
-                workbook = load_workbook(input_file, data_only=True)
-                sheet = workbook[sheet_name]
-                division = sheet_name
-
-                raw_timetable = pd.read_excel(input_file, 
-                                           sheet_name=sheet_name,
-                                           skiprows=6, 
-                                           nrows=25)
-                
-                print(raw_timetable)
-                for index, row in raw_timetable.iterrows():
-                    day = str(row.iloc[0]).strip()
-                    if day not in self.days:
-                        continue
-
-                    for col_idx, time_slot in enumerate(self.time_slots):
-                        current_cell = str(row.iloc[col_idx + 1])
-                        if self.is_classroom_in_cell(current_cell, classroom):
-                            components = current_cell.strip().split()
-                            cell_content = "\n".join([
-                                " ".join(components[:2]),
-                                " ".join(components[2:]),
-                                f"({division})"
-                            ])
-                            
-                            # Only save if the cell is empty (first occurrence)
-                            existing_content = combined_schedule.at[day, time_slot]
-                            if not existing_content:
-                                combined_schedule.at[day, time_slot] = cell_content
-
-            return combined_schedule
+            # Sheets are parsed one at a time as the loop reaches them
+            with LazySheetMapping(input_file, max_cached=1, skiprows=6, nrows=25) as excel_file:
+                print(f"Found {len(excel_file.sheet_names)} sheets in the workbook")
+                # (day, time_slot, lecture) -> (cell, divisions); a joint lecture
+                # appears once in every division's sheet and is listed once
+                joint_sessions = {}
+
+                for sheet_name, raw_timetable in excel_file.items():
+                    print(f"Processing sheet: {sheet_name}")
+                    division = sheet_name
+
+                    print(raw_timetable)
+                    for index, row in raw_timetable.iterrows():
+                        day = str(row.iloc[0]).strip()
+                        if day not in self.days:
+                            continue
+
+                        for col_idx, time_slot in enumerate(self.time_slots):
+                            current_cell = str(row.iloc[col_idx + 1])
+                            if self.is_classroom_in_cell(current_cell, classroom):
+                                self.add_joint_session(joint_sessions, day, time_slot, current_cell,
+                                                       division, (sheet_name, index))
+
+            return self.render_joint_sessions(joint_sessions)
 
         except Exception as e:
             raise Exception(f"Error processing sheets: {str(e)}")
@@ -69,74 +95,108 @@ class TimetableGenerator:
         """
         Processes the input file to generate a timetable for a specific faculty member.
         """
+        if self.is_campus_source(input_file):
+            return build_campus_index(input_file, directory=self.faculty_directory).faculty_schedule(faculty_name)
+
         if not os.path.exists(input_file):
             raise FileNotFoundError(f"Input file not found: {input_file}")
 
         try:
-            excel_file = pd.ExcelFile(input_file)
-            print(f"Found {len(excel_file.sheet_names)} sheets in the workbook")
-            faculty_schedule = self.create_timetable_structure()
-
-            for sheet_name in excel_file.sheet_names:
-                print(f"Processing sheet: {sheet_name}")
-                workbook = load_workbook(input_file, data_only=True)
-                sheet = workbook[sheet_name]
-                division =sheet_name
-
-                raw_timetable = pd.read_excel(input_file, 
-                                              sheet_name=sheet_name,
-                                              skiprows=6, 
-                                              nrows=25)
-
-                print(raw_timetable)
-                for index, row in raw_timetable.iterrows():
-                    day = str(row.iloc[0]).strip()
-                    if day not in self.days:
-                        continue
-
-                    for col_idx, time_slot in enumerate(self.time_slots):
-                        current_cell = str(row.iloc[col_idx + 1])
-                        if faculty_name.upper() in current_cell.upper():
-                            components = current_cell.strip().split()
-                            cell_content = "\n".join([
-                                " ".join(components[:2]),
-                                " ".join(components[2:]),
-                                f"({division})"
-                            ])
-                            
-                            # Only save if the cell is empty (first occurrence)
-                            existing_content = faculty_schedule.at[day, time_slot]
-                            if not existing_content:
-                                faculty_schedule.at[day, time_slot] = cell_content
-
-            return faculty_schedule
+            # Sheets are parsed one at a time as the loop reaches them
+            with LazySheetMapping(input_file, max_cached=1, skiprows=6, nrows=25) as excel_file:
+                print(f"Found {len(excel_file.sheet_names)} sheets in the workbook")
+                # (day, time_slot, lecture) -> (cell, divisions); a joint lecture
+                # appears once in every division's sheet and is listed once
+                joint_sessions = {}
+                target_faculty = self.resolve_faculty(faculty_name)
+
+                for sheet_name, raw_timetable in excel_file.items():
+                    print(f"Processing sheet: {sheet_name}")
+                    division = sheet_name
+
+                    print(raw_timetable)
+                    for index, row in raw_timetable.iterrows():
+                        day = str(row.iloc[0]).strip()
+                        if day not in self.days:
+                            continue
+
+                        for col_idx, time_slot in enumerate(self.time_slots):
+                            current_cell = str(row.iloc[col_idx + 1])
+                            # Exact token match, so "PV" does not match "PVS" or a subject code
+                            if target_faculty in self.cell_faculty(current_cell):
+                                self.add_joint_session(joint_sessions, day, time_slot, current_cell,
+                                                       division, (sheet_name, index))
+
+            return self.render_joint_sessions(joint_sessions)
 
         except Exception as e:
             raise Exception(f"Error processing sheets for faculty: {str(e)}")
 
+    def add_joint_session(self, joint_sessions, day, time_slot, cell, division, fallback_key):
+        # Cells of the same lecture share a key; cells without one stay separate
+        key = joint_session_key(cell) or fallback_key
+        _, divisions = joint_sessions.setdefault((day, time_slot, key), (cell, []))
+        if division not in divisions:
+            divisions.append(division)
+
+    def render_joint_sessions(self, joint_sessions):
+        """
+        Renders the grouped sessions of a single workbook, one entry per
+        lecture with every division attending it, e.g. "(A, B)".
+        """
+        schedule = ScheduleBuilder(self.days, self.time_slots, SessionTable(format_session))
+        for (day, time_slot, _), (cell, divisions) in joint_sessions.items():
+            schedule.add(day, time_slot, (cell, ', '.join(map(str, divisions))))
+        # Only the first lecture in each slot is kept
+        return schedule.render(max_depth=1)
+
     def is_classroom_in_cell(self, cell_content, target_classroom):
-        classrooms = re.findall(r'H[A-Z]?\d+[A-Z]?', cell_content.upper())
-        return any(target_classroom.upper() == cls for cls in classrooms)
+        # Exact codes from the room registry, so "H20" does not match "H203"
+        return target_classroom.strip().upper() in find_rooms(cell_content)
+
+    def load_room_registry(self, registry_csv_path):
+        """
+        Loads the room codes of every building from a registry CSV and uses
+        them for all room matching (see room_registry.RoomRegistry.from_csv).
+
+        Args:
+            registry_csv_path (str): CSV with Building and Pattern or Room columns
 
-    def save_classroom_schedule(self, schedule_df, output_file, filter_value, is_faculty=False, workbook=None, worksheet=None):
+        Returns:
+            RoomRegistry: The loaded registry
+        """
+        try:
+            registry = RoomRegistry.from_csv(registry_csv_path)
+            set_room_registry(registry)
+            print(f"Loaded room codes of {len(registry.buildings)} buildings and {len(registry.rooms)} listed rooms")
+            return registry
+
+        except Exception as e:
+            raise Exception(f"Error loading room registry: {str(e)}")
+
+    def save_classroom_schedule(self, schedule_df, output_file, filter_value, is_faculty=False, workbook=None, worksheet=None,
+                                kind=None):
         """
         Saves the processed schedule to an Excel file with proper formatting.
         Includes styling, cell alignment, and automatic size adjustments.
         Adds metadata section below the timetable.
+        `kind` ('Classroom', 'Faculty' or 'Division') overrides `is_faculty`.
         """
+        kind = kind or ('Faculty' if is_faculty else 'Classroom')
         try:
             if workbook is None or worksheet is None:
+                # Sheet names cannot hold "/" (namespaced divisions) and are cut at 31 characters
+                sheet_name = re.sub(r'[\\/*?:\[\]]', '_', f'Schedule_{filter_value}')[:31]
                 with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
                     # Save the DataFrame to Excel
-                    schedule_df.to_excel(writer, sheet_name=f'Schedule_{filter_value}')
+                    schedule_df.to_excel(writer, sheet_name=sheet_name)
                     workbook = writer.book
-                    worksheet = writer.sheets[f'Schedule_{filter_value}']
+                    worksheet = writer.sheets[sheet_name]
 
             # Add a title row at the top
             worksheet.insert_rows(1)
             title_cell = worksheet['B1']
-            title_text = "Faculty Schedule - " if is_faculty else "Classroom Schedule - "
-            title_cell.value = f"{title_text}{filter_value}"
+            title_cell.value = f"{kind} Schedule - {filter_value}"
             title_cell.font = Font(bold=True, size=14)
 
             # Format all cells in the worksheet
@@ -172,8 +232,9 @@ class TimetableGenerator:
 
             # Handle merged cells
             # Read batch information from meta file
-            meta_df = pd.read_csv("C:/Users/omkar/Downloads/timetable/meta_info_Practical_section.csv")
-            batch_list = meta_df['Batch'].tolist()
+            practical_file = self.meta_files[-1]
+            practical_meta = pd.read_csv(practical_file) if os.path.exists(practical_file) else pd.DataFrame()
+            batch_list = practical_meta['Batch'].dropna().astype(str).tolist() if 'Batch' in practical_meta else []
 
             for col_idx, column in enumerate(worksheet.iter_cols(), start=1):
                 for row_idx in range(2, worksheet.max_row + 1):
@@ -222,7 +283,7 @@ class TimetableGenerator:
                     print(f"Warning: Could not merge column '{slot}' - {merge_err}")
 
             # Add metadata section below the timetable
-            self._add_metadata_section(worksheet, filter_value, is_faculty)
+            self._add_metadata_section(worksheet, filter_value, kind=kind)
 
             # Save the final workbook if we created it
             if workbook is not None and worksheet is not None:
@@ -231,11 +292,30 @@ class TimetableGenerator:
         except Exception as e:
             raise Exception(f"Error saving schedule: {str(e)}")
 
-    def _add_metadata_section(self, worksheet, filter_value, is_faculty=False):
+    def load_combined_meta(self, is_faculty=False):
+        """
+        Reads the theory and practical meta files once and merges each course
+        taught jointly to several divisions into one row (meta.combine_divisions).
+        Room reports keep one row per classroom, faculty reports merge across
+        rooms; every report's metadata section is then a filter of this table.
+        """
+        if is_faculty not in self.combined_meta:
+            columns = ['Division', 'Teacher_Initials', 'Course_Initials', 'Course_Code',
+                       'Course_Name', 'Teacher_Name', 'Classroom']
+            frames = [pd.read_csv(file).reindex(columns=columns) for file in self.meta_files if os.path.exists(file)]
+            meta_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+            keys = ['Course_Code', 'Course_Name', 'Teacher_Name', 'Teacher_Initials', 'Course_Initials']
+            combined = combine_divisions(meta_df, keys if is_faculty else keys + ['Classroom'])
+            self.combined_meta[is_faculty] = combined.sort_values(keys[:4], kind='stable').reset_index(drop=True)
+        return self.combined_meta[is_faculty]
+
+    def _add_metadata_section(self, worksheet, filter_value, is_faculty=False, kind=None):
         """
         Adds metadata section with merged cells and combined divisions.
-        If `is_faculty` is True, filters metadata by Teacher Name instead of Classroom.
+        If `is_faculty` is True, filters metadata by Teacher Name instead of Classroom;
+        with kind='Division' it keeps the courses taught to that division.
         """
+        kind = kind or ('Faculty' if is_faculty else 'Classroom')
         try:
             # Find the last row of the timetable
             last_row = worksheet.max_row
@@ -255,52 +335,25 @@ class TimetableGenerator:
             # Set double height for header row
             worksheet.row_dimensions[metadata_start_row].height = 30
             
-            # Try to load metadata files
-            meta_files = [
-                "C:/Users/omkar/Downloads/timetable/meta_info_Theory_section.csv",
-                "C:/Users/omkar/Downloads/timetable/meta_info_Practical_section.csv"
-            ]
-            
-            metadata_entries = []
-            
-            for file in meta_files:
-                if os.path.exists(file):
-                    df = pd.read_csv(file)
-                    
-                    # Filter for current classroom or faculty
-                    if is_faculty:
-                        filter_column = 'Teacher_Initials'
-                    else:
-                        filter_column = 'Classroom'
-                    
-                    filter_condition = df[filter_column].str.contains(filter_value, na=False, case=False)
-                    filtered_df = df[filter_condition]
-                    
-                    # Collect all metadata entries
-                    for _, row in filtered_df.iterrows():
-                        metadata_entries.append({
-                            'Course_Code': row.get('Course_Code', ''),
-                            'Course_Name': row.get('Course_Name', ''),
-                            'Initials': row.get('Course_Initials', ''),
-                            'Teacher_Name': row['Teacher_Name'],
-                            'Teacher_Initials': row.get('Teacher_Initials', ''),
-                            'Division': row.get('Division', '')
-                        })
-            
-            if not metadata_entries:
+            # Meta records with joint courses already merged across divisions,
+            # filtered for the current classroom or faculty by exact codes, so
+            # "PV" does not pick up PVS's courses nor "H20" those of H203
+            combined_meta = self.load_combined_meta(kind != 'Classroom')
+            if kind == 'Faculty':
+                target = self.resolve_faculty(filter_value)
+                matches = combined_meta['Teacher_Initials'].astype(str).map(self.resolve_faculty) == target
+            elif kind == 'Division':
+                # Campus divisions are namespaced ("CSE/A"), the meta table has the sheet's "A"
+                target = str(filter_value).split('/')[-1].strip()
+                matches = combined_meta['Division'].map(
+                    lambda divisions: target in [division.strip() for division in str(divisions).split(',')])
+            else:
+                target = str(filter_value).strip().upper()
+                matches = combined_meta['Classroom'].map(lambda classroom: target in find_rooms(classroom))
+            combined_meta = combined_meta[matches.astype(bool)]
+
+            if combined_meta.empty:
                 return
-                
-            # Convert to DataFrame for grouping
-            meta_df = pd.DataFrame(metadata_entries)
-            
-            # Group by course code, name, and teacher
-            grouped = meta_df.groupby(['Course_Code', 'Course_Name', 'Teacher_Name', 'Teacher_Initials'])
-            
-            # Combine divisions for each group
-            combined_meta = grouped.agg({
-                'Division': lambda x: ', '.join(sorted(set(x))),
-                'Initials': 'first'
-            }).reset_index()
             
             current_row = metadata_start_row + 1
             
@@ -312,7 +365,7 @@ class TimetableGenerator:
                 
                 # Write course code and name (will be merged vertically)
                 worksheet.cell(row=current_row, column=1, value=course_code)
-                worksheet.cell(row=current_row, column=2, value=f"{course_name} ({course_group.iloc[0]['Initials']})")
+                worksheet.cell(row=current_row, column=2, value=f"{course_name} ({course_group.iloc[0]['Course_Initials']})")
                 
                 # Merge course code and name cells vertically if multiple teachers
                 if row_span > 1:
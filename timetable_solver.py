@@ -0,0 +1,401 @@
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.styles import Alignment, Font
+from concurrent.futures import ProcessPoolExecutor
+from collections import defaultdict, namedtuple
+import os
+import random
+import re
+from campus_index import DAYS, TIME_SLOTS, BREAK_SLOTS, FIRST_ROW
+from cell_grammar import find_rooms, get_room_registry
+
+# One schedulable session: a lecture (length 1) or a practical (length 2)
+Task = namedtuple('Task', ['division', 'course_code', 'course_initials', 'course_name',
+                           'teacher', 'room', 'length'])
+
+# Cost weights: any double booking outweighs every soft preference
+HARD_WEIGHT = 1000
+SAME_DAY_WEIGHT = 1
+
+# Batch names the cell grammar reads as batches ("A1", "SE2B3")
+BATCH_NAME = re.compile(r'[A-Z]+\d+')
+
+TEACHING_SLOT_INDICES = [idx for idx, slot in enumerate(TIME_SLOTS) if slot not in BREAK_SLOTS]
+
+
+def candidate_positions(length):
+    """
+    Lists every (day, start slot) a session of the given length may occupy.
+
+    Practicals need two adjacent teaching slots, so they never straddle a break.
+    """
+    teaching = set(TEACHING_SLOT_INDICES)
+    starts = [slot for slot in TEACHING_SLOT_INDICES
+              if all(slot + offset in teaching for offset in range(length))]
+    return [(day, slot) for day in range(len(DAYS)) for slot in starts]
+
+
+def load_requirements(requirements):
+    """
+    Loads weekly hour requirements.
+
+    Args:
+        requirements (str or pandas.DataFrame): CSV path or DataFrame with
+            Course_Code, Lecture_Hours and Practical_Sessions columns and an
+            optional Division column for per-division overrides
+
+    Returns:
+        pandas.DataFrame: Requirements with missing counts filled as 0
+    """
+    if isinstance(requirements, str):
+        if not os.path.exists(requirements):
+            raise FileNotFoundError(f"Requirements file not found: {requirements}")
+        requirements = pd.read_csv(requirements)
+
+    missing = {'Course_Code', 'Lecture_Hours', 'Practical_Sessions'} - set(requirements.columns)
+    if missing:
+        raise ValueError(f"Requirements must have columns: {', '.join(sorted(missing))}")
+
+    requirements = requirements.copy()
+    requirements['Course_Code'] = requirements['Course_Code'].astype(str).str.strip()
+    for column in ('Lecture_Hours', 'Practical_Sessions'):
+        requirements[column] = requirements[column].fillna(0).astype(int)
+    return requirements
+
+
+def build_tasks(meta_df, requirements):
+    """
+    Expands the course/teacher table into individual sessions to place.
+
+    Lectures go to the first teacher listed for a division's course;
+    practical sessions rotate over all of its teachers.
+
+    Args:
+        meta_df (pandas.DataFrame): Output of meta.extract_course_teacher_data
+        requirements (pandas.DataFrame): Output of load_requirements
+
+    Returns:
+        list: Task tuples
+    """
+    general = requirements[requirements['Division'].isna()] if 'Division' in requirements else requirements
+    hours = {row.Course_Code: (row.Lecture_Hours, row.Practical_Sessions) for row in general.itertuples()}
+    overrides = {}
+    if 'Division' in requirements:
+        for row in requirements[requirements['Division'].notna()].itertuples():
+            overrides[(str(row.Division), row.Course_Code)] = (row.Lecture_Hours, row.Practical_Sessions)
+
+    tasks = []
+    for (division, course_code), group in meta_df.groupby(['Division', 'Course_Code'], sort=True):
+        division, course_code = str(division), str(course_code).strip()
+        lectures, practicals = overrides.get((division, course_code), hours.get(course_code, (0, 0)))
+        teachers = list(dict.fromkeys(group['Teacher_Initials'].fillna('')))
+        first = group.iloc[0]
+
+        # The timetable grids only know room codes, so keep the registered code of a lab
+        classroom = str(first['Classroom']).strip()
+        rooms = find_rooms(classroom)
+        room = rooms[-1] if rooms else classroom
+
+        for _ in range(lectures):
+            tasks.append(Task(division, course_code, first['Course_Initials'], first['Course_Name'],
+                              teachers[0], room, 1))
+        for session in range(practicals):
+            tasks.append(Task(division, course_code, first['Course_Initials'], first['Course_Name'],
+                              teachers[session % len(teachers)], room, 2))
+
+    return tasks
+
+
+class _Search:
+    """
+    Constraint propagation followed by min-conflicts local search, for one seed.
+
+    Usage counters are keyed by (resource, day, slot), where a resource is a
+    division, a teacher or a room, so every exclusivity check is a dict probe.
+    """
+
+    def __init__(self, tasks, seed):
+        self.tasks = tasks
+        self.random = random.Random(seed)
+        self.domains = {length: candidate_positions(length) for length in {task.length for task in tasks}}
+        self.usage = defaultdict(int)
+        self.course_days = defaultdict(int)
+        self.assignment = [None] * len(tasks)
+
+        # Tasks that share a division, teacher or room constrain each other
+        by_resource = defaultdict(list)
+        for idx, task in enumerate(tasks):
+            for resource in self.resources(task):
+                by_resource[resource].append(idx)
+        self.neighbours = [set() for _ in tasks]
+        for members in by_resource.values():
+            for idx in members:
+                self.neighbours[idx].update(members)
+        for idx in range(len(tasks)):
+            self.neighbours[idx].discard(idx)
+
+    @staticmethod
+    def resources(task):
+        resources = [('D', task.division), ('R', task.room)]
+        if task.teacher:
+            resources.append(('T', task.teacher))
+        return resources
+
+    @staticmethod
+    def cells(position, length):
+        day, slot = position
+        return [(day, slot + offset) for offset in range(length)]
+
+    def place(self, idx, position, sign=1):
+        task = self.tasks[idx]
+        for day, slot in self.cells(position, task.length):
+            for resource in self.resources(task):
+                self.usage[(resource, day, slot)] += sign
+        self.course_days[(task.division, task.course_code, position[0])] += sign
+        self.assignment[idx] = position if sign > 0 else None
+
+    def cost_at(self, idx, position):
+        """Cost of putting a currently unplaced task at a position."""
+        task = self.tasks[idx]
+        clashes = sum(self.usage[(resource, day, slot)]
+                      for day, slot in self.cells(position, task.length)
+                      for resource in self.resources(task))
+        same_day = self.course_days[(task.division, task.course_code, position[0])]
+        return clashes * HARD_WEIGHT + same_day * SAME_DAY_WEIGHT
+
+    def construct(self):
+        """Most-constrained-first placement with forward checking on neighbours."""
+        feasible = [set(self.domains[task.length]) for task in self.tasks]
+        unplaced = set(range(len(self.tasks)))
+
+        while unplaced:
+            # Fewest remaining positions first, practicals before lectures on ties
+            fewest = min((len(feasible[idx]), -self.tasks[idx].length) for idx in unplaced)
+            candidates = [idx for idx in unplaced
+                          if (len(feasible[idx]), -self.tasks[idx].length) == fewest]
+            idx = self.random.choice(candidates)
+            task = self.tasks[idx]
+
+            options = feasible[idx] or self.domains[task.length]
+            scored = [(self.cost_at(idx, position), self.random.random(), position) for position in options]
+            position = min(scored)[2]
+            self.place(idx, position)
+            unplaced.discard(idx)
+
+            # Propagate: neighbours can no longer use any overlapping position
+            taken = set(self.cells(position, task.length))
+            for other in self.neighbours[idx]:
+                if other in unplaced:
+                    length = self.tasks[other].length
+                    feasible[other] = {pos for pos in feasible[other]
+                                       if taken.isdisjoint(self.cells(pos, length))}
+
+    def conflicted(self):
+        return [idx for idx, position in enumerate(self.assignment)
+                if any(self.usage[(resource, day, slot)] > 1
+                       for day, slot in self.cells(position, self.tasks[idx].length)
+                       for resource in self.resources(self.tasks[idx]))]
+
+    def total_cost(self):
+        hard = sum(count - 1 for count in self.usage.values() if count > 1)
+        soft = sum(count - 1 for count in self.course_days.values() if count > 1)
+        return hard, soft
+
+    def improve(self, max_steps, noise=0.05):
+        """Min-conflicts local search, keeping the best assignment seen."""
+        best_cost, best = self.total_cost(), list(self.assignment)
+
+        for _ in range(max_steps):
+            conflicted = self.conflicted()
+            if conflicted:
+                idx = self.random.choice(conflicted)
+            elif best_cost[1] == 0:
+                break
+            else:
+                # No hard clashes left: polish soft cost with a random session
+                idx = self.random.randrange(len(self.tasks))
+
+            self.place(idx, self.assignment[idx], sign=-1)
+            options = self.domains[self.tasks[idx].length]
+            if self.random.random() < noise:
+                position = self.random.choice(options)
+            else:
+                position = min((self.cost_at(idx, pos), self.random.random(), pos) for pos in options)[2]
+            self.place(idx, position)
+
+            cost = self.total_cost()
+            if cost < best_cost:
+                best_cost, best = cost, list(self.assignment)
+
+        return best_cost, best
+
+
+def _solve_once(args):
+    tasks, seed, max_steps = args
+    search = _Search(tasks, seed)
+    search.construct()
+    cost, assignment = search.improve(max_steps)
+    return cost, seed, assignment
+
+
+def solve_timetable(meta_df, requirements, restarts=8, max_workers=None, max_steps=2000, seed=0):
+    """
+    Generates a timetable for every division in the course/teacher table.
+
+    Each restart runs propagation plus local search from a different seed in
+    its own process; the restart with the fewest clashes (then the fewest
+    repeated same-day lectures) wins.
+
+    Args:
+        meta_df (pandas.DataFrame): Output of meta.extract_course_teacher_data
+        requirements (str or pandas.DataFrame): Weekly hour requirements
+        restarts (int): Number of independent restarts
+        max_workers (int): Worker processes (default: CPU count)
+        max_steps (int): Local search steps per restart
+        seed (int): Base random seed
+
+    Returns:
+        pandas.DataFrame: One row per placed session
+    """
+    try:
+        tasks = build_tasks(meta_df, load_requirements(requirements))
+        if not tasks:
+            raise ValueError("No sessions to schedule, check the requirements table")
+        print(f"Scheduling {len(tasks)} sessions over {restarts} restarts")
+
+        jobs = [(tasks, seed + restart, max_steps) for restart in range(restarts)]
+        if restarts == 1 or max_workers == 1:
+            results = [_solve_once(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_solve_once, jobs))
+
+        (hard, soft), best_seed, assignment = min(results, key=lambda result: (result[0], result[1]))
+        print(f"Best restart (seed {best_seed}): {hard} clashes, {soft} repeated same-day sessions")
+
+    except Exception as e:
+        raise Exception(f"Error generating timetable: {str(e)}")
+
+    rows = []
+    for task, (day, slot) in zip(tasks, assignment):
+        rows.append({
+            'Division': task.division,
+            'Day': DAYS[day],
+            'Time_Slot': TIME_SLOTS[slot],
+            'Slot': slot,
+            'Span': task.length,
+            'Course_Code': task.course_code,
+            'Course_Initials': task.course_initials,
+            'Course_Name': task.course_name,
+            'Teacher_Initials': task.teacher,
+            'Room': task.room
+        })
+    result = pd.DataFrame(rows)
+    result.attrs['clashes'] = hard
+    return result
+
+
+def division_batches(division, batches=1):
+    """
+    Batch names of a whole division ("A" -> "A1", "A2", ...).
+
+    Raises:
+        ValueError: If the names would not read back as batches, e.g. a
+            division without letters or one whose batch name is a room code
+    """
+    prefix = re.sub(r'[^A-Z0-9]', '', str(division).upper())
+    names = [f"{prefix}{number}" for number in range(1, batches + 1)]
+    registry = get_room_registry()
+    if not names or any(not BATCH_NAME.fullmatch(name) or registry.is_room(name) for name in names):
+        raise ValueError(f"Division '{division}' cannot be written as batch names: {', '.join(names)}")
+    return names
+
+
+def format_generated_cell(session, batches=1):
+    """
+    Cell text in the formats the extraction scripts read back.
+
+    A generated practical is held for the whole division, so it is written
+    for every batch of the division ("A1,A2-DS(MNV)-H201").
+    """
+    subject = session.Course_Initials or session.Course_Code
+    if session.Span > 1:
+        names = ",".join(division_batches(session.Division, batches))
+        return f"{names}-{subject}({session.Teacher_Initials})-{session.Room}"
+    return f"{subject} {session.Teacher_Initials} {session.Room}"
+
+
+def save_generated_timetable(schedule, meta_df, output_file, batches=1):
+    """
+    Writes the generated timetable in the "Classwise" workbook layout.
+
+    One sheet per division with the division in N3, the header row at row 7,
+    one row per day from row 8, practicals merged over two slots, and the
+    course/teacher table from row 34 so meta.extract_course_teacher_data and
+    process_all_sheets read the file like any other input workbook.
+
+    Args:
+        schedule (pandas.DataFrame): Output of solve_timetable
+        meta_df (pandas.DataFrame): Course/teacher table the schedule was made from
+        output_file (str): Path of the workbook to write
+        batches (int): Practical batches per division
+    """
+    try:
+        workbook = Workbook()
+        workbook.remove(workbook.active)
+
+        for division, sessions in schedule.groupby('Division', sort=True):
+            sheet = workbook.create_sheet(re.sub(r'[\\/*?:\[\]]', '_', str(division))[:31])
+            sheet['N3'] = division
+            sheet.cell(row=FIRST_ROW - 1, column=1, value='Day').font = Font(bold=True)
+            for col_idx, time_slot in enumerate(TIME_SLOTS):
+                sheet.cell(row=FIRST_ROW - 1, column=col_idx + 2, value=time_slot).font = Font(bold=True)
+            for day_idx, day in enumerate(DAYS):
+                sheet.cell(row=FIRST_ROW + day_idx, column=1, value=day)
+
+            for session in sessions.itertuples(index=False):
+                row = FIRST_ROW + DAYS.index(session.Day)
+                column = session.Slot + 2
+                cell = sheet.cell(row=row, column=column, value=format_generated_cell(session, batches))
+                cell.alignment = Alignment(wrap_text=True, horizontal='center', vertical='center')
+                if session.Span > 1:
+                    sheet.merge_cells(start_row=row, start_column=column,
+                                      end_row=row, end_column=column + session.Span - 1)
+
+            # Course/teacher table read back by meta.extract_course_teacher_data
+            sheet.cell(row=34, column=1, value='Course Code')
+            sheet.cell(row=34, column=2, value='Course Name')
+            sheet.cell(row=34, column=4, value='Faculty')
+            sheet.cell(row=34, column=6, value='Venue')
+            division_meta = meta_df[meta_df['Division'].astype(str) == str(division)]
+            for row, (course_code, group) in enumerate(division_meta.groupby('Course_Code', sort=True), start=35):
+                first = group.iloc[0]
+                teachers = ", ".join(f"{name} ({initials})" if initials else name
+                                     for name, initials in zip(group['Teacher_Name'], group['Teacher_Initials'].fillna('')))
+                sheet.cell(row=row, column=1, value=course_code)
+                sheet.cell(row=row, column=2, value=f"{first['Course_Name']} ({first['Course_Initials']})")
+                sheet.cell(row=row, column=4, value=teachers)
+                sheet.cell(row=row, column=6, value=first['Classroom'])
+
+        workbook.save(output_file)
+
+    except Exception as e:
+        raise Exception(f"Error saving generated timetable: {str(e)}")
+
+
+def main():
+    meta_file = "C:\\Users\\omkar\\Downloads\\timetable\\meta_info_5.csv"
+    requirements_file = "C:\\Users\\omkar\\Downloads\\timetable\\weekly_hours.csv"
+    output_file = "C:\\Users\\omkar\\Downloads\\timetable\\Generated_Timetable.xlsx"
+
+    try:
+        meta_df = pd.read_csv(meta_file)
+        schedule = solve_timetable(meta_df, requirements_file)
+        save_generated_timetable(schedule, meta_df, output_file)
+        print(f"Generated timetable saved to {output_file}")
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+
+if __name__ == "__main__":
+    main()
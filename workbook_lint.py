@@ -0,0 +1,235 @@
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.utils import get_column_letter
+import re
+import time
+from campus_index import DAYS, FIRST_ROW, resolve_workbooks, source_label, read_sheet_grid
+from cell_grammar import parse_cell, cell_teachers, find_rooms, get_room_registry
+from faculty_directory import FacultyDirectory, cell_faculty_tokens
+from meta import read_sheet_meta
+
+ISSUE_COLUMNS = ['Source', 'Sheet', 'Cell', 'Severity', 'Check', 'Reason', 'Value']
+
+# Anything that looks like it was meant to be a room code: an H, an optional
+# letter, an optional separator and digits ("H203", "h-203", "H2O3", "HA12XY")
+ROOM_LIKE = r'(?<![A-Za-z0-9])([Hh][A-Za-z]?[-_. ]?\d[A-Za-z0-9]*)'
+
+
+def read_workbook_grids(input_file, source=None):
+    """
+    Loads a workbook once and returns its raw grids and metadata records.
+
+    Returns:
+        tuple: (list of (source, grid) pairs, list of meta.read_sheet_meta records)
+    """
+    source = source or source_label(input_file)
+    workbook = load_workbook(input_file, data_only=True)
+    grids, teachers = [], []
+    try:
+        for sheet in workbook.worksheets:
+            grids.append((source, read_sheet_grid(sheet)))
+            teachers.extend(read_sheet_meta(sheet))
+    finally:
+        workbook.close()
+    return grids, teachers
+
+
+def grid_frame(grids):
+    """
+    Flattens raw grids into one DataFrame, one row per grid cell.
+
+    Returns:
+        pandas.DataFrame: Source, Sheet, Row, Col (1 = day column), Value, Span
+    """
+    records = []
+    for source, grid in grids:
+        for row_number, row in enumerate(grid['rows'], start=FIRST_ROW):
+            for col, value in enumerate(row, start=1):
+                if value is None or (isinstance(value, str) and not value.strip()):
+                    continue
+                records.append((source, grid['sheet'], row_number, col, value,
+                                grid['spans'].get((row_number, col), 1)))
+    return pd.DataFrame(records, columns=['Source', 'Sheet', 'Row', 'Col', 'Value', 'Span'])
+
+
+def _issues(cells, severity, check, reason, value=None):
+    """Issue rows for the flagged cells; reason may be a string or a Series."""
+    if cells.empty:
+        return pd.DataFrame(columns=ISSUE_COLUMNS)
+    return pd.DataFrame({
+        'Source': cells['Source'],
+        'Sheet': cells['Sheet'],
+        'Cell': cells['Col'].map(get_column_letter) + cells['Row'].astype(str),
+        'Severity': severity,
+        'Check': check,
+        'Reason': reason,
+        'Value': (cells['Value'] if value is None else value).astype(str)
+    })
+
+
+def lint_grids(grids, directory=None):
+    """
+    Checks raw sheet grids and reports every cell the parser would skip or misread.
+
+    All sheets are flattened into one table and each check is a column
+    operation over it, so a full semester workbook is checked in one pass.
+
+    Args:
+        grids (list): (source, grid) pairs from read_workbook_grids
+        directory (FacultyDirectory): Known faculty; without one the
+            faculty check is skipped
+
+    Returns:
+        pandas.DataFrame: One row per issue with sheet, cell address and reason
+    """
+    issues = []
+
+    # Division cell N3, the parser falls back to the sheet name
+    empty_n3 = [(source, grid['sheet']) for source, grid in grids
+                if grid['division'] is None or not str(grid['division']).strip()]
+    if empty_n3:
+        missing = pd.DataFrame(empty_n3, columns=['Source', 'Sheet']).assign(Row=3, Col=14, Value='')
+        issues.append(_issues(missing, 'Warning', 'Division',
+                              'Division cell N3 is empty, the sheet name is used instead'))
+
+    cells = grid_frame(grids)
+    if cells.empty:
+        return pd.concat(issues, ignore_index=True) if issues else pd.DataFrame(columns=ISSUE_COLUMNS)
+
+    # Day column: every row holding sessions needs one of DAYS in column A,
+    # matched exactly like parse_sheet_grid does ("Mon" is skipped there)
+    days = cells[cells['Col'] == 1].set_index(['Source', 'Sheet', 'Row'])['Value']
+    slots = cells[cells['Col'] > 1]
+    row_keys = pd.MultiIndex.from_frame(slots[['Source', 'Sheet', 'Row']])
+    row_day = pd.Series(days.reindex(row_keys).to_numpy(), index=slots.index)
+    is_text_day = row_day.map(lambda value: isinstance(value, str))
+    known_day = is_text_day & row_day.map(lambda value: str(value).strip() in DAYS)
+    bad_rows = slots[~known_day].drop_duplicates(['Source', 'Sheet', 'Row'])
+    if not bad_rows.empty:
+        day_value = row_day[bad_rows.index]
+        reason = pd.Series('Unknown day, the row is skipped', index=bad_rows.index)
+        wrong_case = is_text_day[bad_rows.index] & day_value.map(lambda value: str(value).strip().upper() in DAYS)
+        reason[wrong_case] = f"Day must be written as one of {', '.join(DAYS)}, the row is skipped"
+        reason[day_value.isna()] = 'Row has sessions but no day in column A, the row is skipped'
+        reason[day_value.notna() & ~is_text_day[bad_rows.index]] = 'Day in column A is not text, the row is skipped'
+        issues.append(_issues(bad_rows.assign(Col=1), 'Error', 'Day', reason, day_value.fillna('')))
+    in_day_rows = slots[known_day]
+
+    # Timetable cells must be text
+    is_text = in_day_rows['Value'].map(lambda value: isinstance(value, str))
+    issues.append(_issues(in_day_rows[~is_text], 'Error', 'Cell', 'Cell is not text, it is skipped'))
+    text_cells = in_day_rows[is_text]
+    text = text_cells['Value'].str.strip()
+
+    # Room codes: anything room-like that is not a code of the room registry
+    candidates = text.str.extractall(ROOM_LIKE)[0]
+    bad_codes = candidates[~candidates.map(get_room_registry().is_room).astype(bool)]
+    if not bad_codes.empty:
+        flagged = text_cells.loc[bad_codes.index.get_level_values(0)]
+        reason = "Room code '" + bad_codes.to_numpy() + "' is not a registered room code"
+        issues.append(_issues(flagged, 'Error', 'Room', pd.Series(reason, index=flagged.index)))
+    has_room = text.map(lambda value: bool(find_rooms(value))).astype(bool)
+    no_room = ~has_room & ~text.index.isin(bad_codes.index.get_level_values(0))
+    issues.append(_issues(text_cells[no_room], 'Warning', 'Room', 'No room code in cell'))
+
+    # Practicals occupy two slots, merged over two columns
+    entries = text.map(parse_cell)
+    practical = entries.map(lambda parsed: any(entry.kind == 'Practical' for entry in parsed))
+    single = text_cells[practical & (text_cells['Span'] == 1)]
+    issues.append(_issues(single, 'Error', 'Span', 'Practical spans only one slot, merge it over two columns'))
+    wide = text_cells[text_cells['Span'] > 2]
+    issues.append(_issues(wide, 'Warning', 'Span', 'Cell is merged over ' + wide['Span'].astype(str) + ' slots'))
+
+    # Faculty initials must be in the meta table; cells with a malformed
+    # room code are skipped, the broken code would read as initials
+    if directory is not None and len(directory):
+        checked = entries[~entries.index.isin(bad_codes.index.get_level_values(0))]
+        unknown = checked.map(lambda parsed: [token for token in cell_faculty_tokens(cell_teachers(parsed))
+                                              if directory.resolve(token) is None])
+        unknown = unknown[unknown.map(bool)]
+        if not unknown.empty:
+            flagged = text_cells.loc[unknown.index]
+            reason = 'Faculty not in the meta table: ' + unknown.map(', '.join)
+            issues.append(_issues(flagged, 'Warning', 'Faculty', reason))
+
+    issues = [frame for frame in issues if not frame.empty]
+    if not issues:
+        return pd.DataFrame(columns=ISSUE_COLUMNS)
+    return pd.concat(issues, ignore_index=True)
+
+
+def validate_workbooks(sources, directory=None):
+    """
+    Validates every sheet of the given workbooks.
+
+    Args:
+        sources (str or list): Workbook paths, directories or glob patterns
+        directory (FacultyDirectory): Known faculty, defaults to the
+            metadata blocks of the workbooks themselves
+
+    Returns:
+        pandas.DataFrame: Issues sorted by source, sheet and cell
+    """
+    paths = resolve_workbooks(sources)
+    if not paths:
+        raise FileNotFoundError(f"No workbooks found in: {sources}")
+
+    grids, teachers = [], []
+    for path in paths:
+        try:
+            workbook_grids, workbook_teachers = read_workbook_grids(path)
+        except Exception as e:
+            raise Exception(f"Error reading {path}: {str(e)}")
+        grids.extend(workbook_grids)
+        teachers.extend(workbook_teachers)
+
+    if directory is None and teachers:
+        directory = FacultyDirectory.from_meta(pd.DataFrame(teachers))
+
+    issues = lint_grids(grids, directory)
+    order = issues['Cell'].str.extract(r'([A-Z]+)(\d+)')
+    issues = issues.assign(_row=order[1].astype(int), _col=order[0].str.len().astype(str) + order[0])
+    return (issues.sort_values(['Source', 'Sheet', '_row', '_col'], kind='stable')
+            .drop(columns=['_row', '_col']).reset_index(drop=True))
+
+
+def save_lint_report(issues, output_file):
+    """Saves the issues with a per-check summary sheet."""
+    try:
+        summary = (issues.groupby(['Severity', 'Check']).size().rename('Issues').reset_index())
+        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+            summary.to_excel(writer, sheet_name='Summary', index=False)
+            issues.to_excel(writer, sheet_name='Issues', index=False)
+            for worksheet in writer.sheets.values():
+                worksheet.auto_filter.ref = worksheet.dimensions
+                worksheet.freeze_panes = 'A2'
+                for column in worksheet.columns:
+                    worksheet.column_dimensions[column[0].column_letter].width = 18
+            writer.sheets['Issues'].column_dimensions['F'].width = 60
+
+    except Exception as e:
+        raise Exception(f"Error saving lint report: {str(e)}")
+
+
+def main():
+    input_file = "D:\\Classwise 24 25 Sem I.xlsm"
+    output_file = "C:\\Users\\omkar\\Downloads\\timetable\\Workbook_Lint.xlsx"
+
+    try:
+        start = time.perf_counter()
+        issues = validate_workbooks(input_file)
+        elapsed = time.perf_counter() - start
+
+        errors = (issues['Severity'] == 'Error').sum()
+        print(f"{len(issues)} issues ({errors} errors) found in {elapsed:.2f}s")
+        for row in issues.head(20).itertuples(index=False):
+            print(f"  {row.Sheet}!{row.Cell} [{row.Check}] {row.Reason}")
+
+        save_lint_report(issues, output_file)
+        print(f"Lint report saved to {output_file}")
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+
+if __name__ == "__main__":
+    main()